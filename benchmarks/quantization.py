@@ -0,0 +1,141 @@
+"""Recall and latency of the local index with quantized codes.
+
+Indexes transcripts once per quantization mode and compares every mode's
+top-k against exact full-precision search. Queries are word windows drawn
+from the indexed chunks, so the report works on any transcript.
+
+Usage:
+    python -m benchmarks.quantization --transcripts data/transcription.txt --embedder model
+    python -m benchmarks.quantization --words 200000 --rescore_factors 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def parse_args():
+    """Parse command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Recall and latency of quantized local search")
+    parser.add_argument("--transcripts", type=str, nargs="*", default=[],
+                        help="Transcription files to index; a synthetic transcript when omitted")
+    parser.add_argument("--words", type=int, default=100000, help="Size of the synthetic transcript")
+    parser.add_argument("--embedder", choices=["fake", "model"], default="fake",
+                        help="Hashed bag-of-words stand-in, or the configured embedding model")
+    parser.add_argument("--queries", type=int, default=200, help="Queries drawn from the chunks")
+    parser.add_argument("--query_words", type=int, default=12, help="Words per query")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--rescore_factors", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Candidates re-scored at full precision per result")
+    parser.add_argument("--save", type=str, default=None, help="Write the report to this JSON file")
+    return parser.parse_args()
+
+
+def draw_queries(texts: List[str], count: int, words: int, seed: int = 0) -> List[str]:
+    """Draw word windows from random chunks to use as queries."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        tokens = rng.choice(texts).split()
+        start = rng.randrange(max(1, len(tokens) - words + 1))
+        queries.append(" ".join(tokens[start:start + words]))
+    return queries
+
+
+def measure(index, embeddings: List[List[float]], exact: List[List[int]], k: int) -> Dict[str, float]:
+    """Search every query embedding and compare the results with exact search.
+
+    Args:
+        index: The ``LocalVectorIndex`` to search.
+        embeddings: Query embeddings.
+        exact: Rows of the exact top-k of each query.
+        k: Results per query.
+
+    Returns:
+        Recall@k, latency percentiles and the size of the scanned codes.
+    """
+    from src.models.instrumentation import percentile
+
+    durations, hits = [], 0
+    for embedding, expected in zip(embeddings, exact):
+        started = time.perf_counter()
+        rows = [row for row, _ in index.search_vector(embedding, k)]
+        durations.append((time.perf_counter() - started) * 1000)
+        hits += len(set(rows) & set(expected))
+
+    scanned = index._codes.nbytes if index._codes is not None else index.vectors.nbytes
+    return {
+        f"recall@{k}": hits / max(1, sum(len(rows) for rows in exact)),
+        "p50_ms": percentile(durations, 50),
+        "p95_ms": percentile(durations, 95),
+        "scanned_mb": scanned / (1024 * 1024),
+    }
+
+
+def main():
+    """Run the report."""
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="video_qa_quantization_") as workdir:
+        from src.models.stub import install_fakes, prepare_environment
+
+        prepare_environment(workdir)
+        if args.embedder == "fake":
+            install_fakes()
+
+        from src.models import local_index
+        from src.models.vectorstore import TranscriptionVectorStore
+
+        paths = list(args.transcripts)
+        if not paths:
+            from benchmarks.synthetic import generate_transcript
+
+            paths = [os.path.join(workdir, "transcript.txt")]
+            with open(paths[0], "w", encoding="utf-8") as file:
+                file.write(generate_transcript(args.words))
+
+        store = TranscriptionVectorStore()
+        texts = [doc.page_content for path in paths for doc in store.iter_transcription(path)]
+        print(f"Embedding {len(texts)} chunks from {len(paths)} transcripts")
+        vectors = store.embeddings.embed_documents(texts)
+        queries = draw_queries(texts, args.queries, args.query_words)
+        query_vectors = [store.embeddings.embed_query(query) for query in queries]
+
+        indexes = {}
+        for mode in local_index.QUANTIZATION_MODES:
+            indexes[mode] = local_index.LocalVectorIndex(store.embeddings, quantization=mode)
+            indexes[mode].add_embeddings(texts, vectors)
+        exact = [[row for row, _ in indexes["none"].search_vector(vector, args.k)] for vector in query_vectors]
+
+        report = {"chunks": len(texts), "queries": len(queries), "k": args.k, "modes": {}}
+        report["modes"]["none"] = measure(indexes["none"], query_vectors, exact, args.k)
+        for mode in ("int8", "binary"):
+            for factor in args.rescore_factors:
+                local_index.LOCAL_INDEX_RESCORE_FACTOR = factor
+                report["modes"][f"{mode} x{factor}"] = measure(indexes[mode], query_vectors, exact, args.k)
+
+    print(f"\n{'mode':<12} {'recall@' + str(args.k):>10} {'p50_ms':>9} {'p95_ms':>9} {'scanned_mb':>11}")
+    for mode, metrics in report["modes"].items():
+        print(f"{mode:<12} {metrics[f'recall@{args.k}']:>10.3f} {metrics['p50_ms']:>9.3f} "
+              f"{metrics['p95_ms']:>9.3f} {metrics['scanned_mb']:>11.2f}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved report to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Offline benchmark of transcript ingestion and question answering.
+
+Every external service is replaced by a local stand-in from ``src.models.fakes``,
+so results measure the pipeline itself and are comparable between commits.
+
+Usage:
+    python -m benchmarks.run --sizes 10000 100000 1000000 --save benchmarks/baselines/local.json
+    python -m benchmarks.run --compare benchmarks/baselines/local.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.stub import install_fakes, prepare_environment
+
+
+def parse_args():
+    """Parse command line arguments.
+    
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Offline benchmark of the video QA pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="Transcript sizes in words")
+    parser.add_argument("--questions", type=int, default=50, help="Questions per transcript size")
+    parser.add_argument("--searches", type=int, default=200, help="similarity_search calls per size")
+    parser.add_argument("--llm_latency_ms", type=float, default=0.0, help="Simulated Groq latency")
+    parser.add_argument("--web_latency_ms", type=float, default=0.0, help="Simulated Tavily latency")
+    parser.add_argument("--translation_latency_ms", type=float, default=0.0, help="Simulated MyMemory latency")
+    parser.add_argument("--embedding_latency_ms", type=float, default=0.0, help="Simulated embedding time per chunk")
+    parser.add_argument("--routing", choices=["parallel", "adaptive"], default="parallel",
+                        help="ROUTING_MODE of the measured workflow")
+    parser.add_argument("--digest", action="store_true", help="Precompute digests (DIGEST_ENABLED) at ingest")
+    parser.add_argument("--save", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON file to compare against")
+    return parser.parse_args()
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(durations: List[float], items: int) -> Dict[str, float]:
+    """Summarize a list of call durations.
+
+    Args:
+        durations: Wall time of each call in seconds.
+        items: Number of items (words, chunks, questions) processed in total.
+
+    Returns:
+        Call count, throughput in items per second and latency percentiles.
+    """
+    from src.models.instrumentation import percentile
+
+    milliseconds = [duration * 1000 for duration in durations]
+    total = sum(durations)
+    return {
+        "calls": len(durations),
+        "items": items,
+        "total_s": total,
+        "throughput_per_s": items / total if total else 0.0,
+        "p50_ms": percentile(milliseconds, 50),
+        "p95_ms": percentile(milliseconds, 95),
+        "p99_ms": percentile(milliseconds, 99),
+    }
+
+
+def timed(func: Callable, repeat: int = 1) -> List[float]:
+    """Call ``func`` ``repeat`` times and return each wall time in seconds."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def benchmark_size(words: int, args, workdir: str) -> Dict[str, Dict[str, float]]:
+    """Benchmark ingestion and question answering on one transcript size.
+
+    Args:
+        words: Transcript size in words.
+        args: Parsed command line arguments.
+        workdir: Scratch directory.
+
+    Returns:
+        Summary per benchmarked stage.
+    """
+    from benchmarks.synthetic import generate_questions, generate_transcript
+    from src.pipeline import VideoQAPipeline
+
+    path = os.path.join(workdir, f"transcript_{words}.txt")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(generate_transcript(words))
+
+    pipeline = VideoQAPipeline()
+    pipeline.answer_cache = None  # measure the graph, not the answer cache
+    store = pipeline.vector_store
+    results = {}
+
+    documents = []
+    durations = timed(lambda: documents.append(store.load_transcription(path)), repeat=3)
+    results["load_transcription"] = summarize(durations, words * len(durations))
+    chunks = documents[-1]
+
+    results["index_documents_cold"] = summarize(timed(lambda: store.sync_documents(chunks)), len(chunks))
+    results["index_documents_unchanged"] = summarize(timed(lambda: store.sync_documents(chunks)), len(chunks))
+
+    questions = generate_questions(args.questions, seed=words)
+    searches = (questions * (args.searches // max(len(questions), 1) + 1))[:args.searches]
+    durations = [timed(lambda: store.vector_store.similarity_search(query, k=3))[0] for query in searches]
+    results["similarity_search"] = summarize(durations, len(durations))
+
+    pipeline.load_transcription(path)
+    durations = [timed(lambda: pipeline.ask_question(question))[0] for question in questions]
+    results["ask_question"] = summarize(durations, len(durations))
+
+    results["peak_rss_mb"] = {"value": peak_rss_mb()}
+    return results
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the change of each metric relative to a baseline run."""
+    print(f"\n{'size':>8}  {'stage':<26} {'metric':<18} {'baseline':>12} {'current':>12} {'change':>8}")
+    for size, stages in results["results"].items():
+        for stage, metrics in stages.items():
+            for metric in ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "value"):
+                if metric not in metrics:
+                    continue
+                old = baseline.get("results", {}).get(size, {}).get(stage, {}).get(metric)
+                if old is None:
+                    continue
+                change = (metrics[metric] - old) / old * 100 if old else 0.0
+                print(f"{size:>8}  {stage:<26} {metric:<18} {old:>12.3f} {metrics[metric]:>12.3f} {change:>+7.1f}%")
+
+
+def git_revision() -> str:
+    """Return the current commit hash, or "unknown" outside a git checkout."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="video_qa_bench_") as workdir:
+        prepare_environment(workdir, args.routing, args.digest)
+        install_fakes(args.embedding_latency_ms, args.llm_latency_ms, args.web_latency_ms, args.translation_latency_ms)
+        from src import config
+
+        results = {
+            "meta": {
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "args": vars(args),
+                "routing_mode": config.ROUTING_MODE,
+                "digest_enabled": config.DIGEST_ENABLED,
+            },
+            "results": {},
+        }
+        for words in args.sizes:
+            print(f"\n=== Benchmarking transcript of {words} words ===")
+            results["results"][str(words)] = benchmark_size(words, args, workdir)
+
+    print(json.dumps(results["results"], indent=2))
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
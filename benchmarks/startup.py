@@ -0,0 +1,139 @@
+"""Cold-start benchmark of the CLI and the pipeline.
+
+Each measurement runs in a fresh interpreter, so import time, client creation
+and workflow compilation are all included, exactly as a user would see them.
+
+Usage:
+    python -m benchmarks.startup --repeat 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def parse_args():
+    """Parse command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of the video QA pipeline")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--words", type=int, default=10000, help="Transcript size for time-to-first-answer")
+    parser.add_argument("--llm_latency_ms", type=float, default=0.0, help="Simulated Groq latency")
+    parser.add_argument("--web_latency_ms", type=float, default=0.0, help="Simulated Tavily latency")
+    parser.add_argument("--translation_latency_ms", type=float, default=0.0, help="Simulated MyMemory latency")
+    parser.add_argument("--embedding_latency_ms", type=float, default=0.0, help="Simulated embedding time per chunk")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def first_answer(args) -> Dict[str, float]:
+    """Time the path from a fresh interpreter to the first answer.
+
+    Runs inside the child process.
+
+    Returns:
+        Seconds spent importing, constructing, indexing and answering.
+    """
+    from src.models.stub import install_fakes, prepare_environment
+    from benchmarks.synthetic import generate_questions, generate_transcript
+
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix="video_qa_startup_") as workdir:
+        prepare_environment(workdir)
+        path = os.path.join(workdir, "transcript.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(generate_transcript(args.words))
+        question = generate_questions(1)[0]
+
+        started = time.perf_counter()
+        from src.pipeline import VideoQAPipeline
+        install_fakes(args.embedding_latency_ms, args.llm_latency_ms, args.web_latency_ms, args.translation_latency_ms)
+        timings["import_s"] = time.perf_counter() - started
+
+        mark = time.perf_counter()
+        pipeline = VideoQAPipeline()
+        pipeline.answer_cache = None
+        timings["construct_s"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        pipeline.load_transcription(path)
+        timings["load_transcription_s"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        pipeline.ask_question(question)
+        timings["first_question_s"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        pipeline.ask_question(question)
+        timings["second_question_s"] = time.perf_counter() - mark
+
+        timings["time_to_first_answer_s"] = time.perf_counter() - started
+    return timings
+
+
+def run_child(args) -> Dict[str, float]:
+    """Run ``first_answer`` in a fresh interpreter and return its timings."""
+    command = [
+        sys.executable, "-m", "benchmarks.startup", "--child",
+        "--words", str(args.words),
+        "--llm_latency_ms", str(args.llm_latency_ms),
+        "--web_latency_ms", str(args.web_latency_ms),
+        "--translation_latency_ms", str(args.translation_latency_ms),
+        "--embedding_latency_ms", str(args.embedding_latency_ms),
+    ]
+    output = subprocess.check_output(command, cwd=ROOT, text=True)
+    # The pipeline prints progress; the timings are the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def time_help() -> float:
+    """Return the wall time of ``python -m src.main --help`` in seconds."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "src.main", "--help"], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def describe(values: List[float]) -> Dict[str, float]:
+    """Summarize repeated measurements in milliseconds."""
+    from src.models.instrumentation import percentile
+
+    milliseconds = [value * 1000 for value in values]
+    return {
+        "runs": len(values),
+        "min_ms": min(milliseconds),
+        "p50_ms": percentile(milliseconds, 50),
+        "max_ms": max(milliseconds),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    args = parse_args()
+
+    if args.child:
+        print(json.dumps(first_answer(args)))
+        return
+
+    results = {"cli_help": describe([time_help() for _ in range(args.repeat)])}
+
+    runs = [run_child(args) for _ in range(args.repeat)]
+    for key in runs[0]:
+        results[key[:-2]] = describe([run[key] for run in runs])
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
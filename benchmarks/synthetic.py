@@ -0,0 +1,56 @@
+"""Synthetic lecture transcripts and questions for benchmarking."""
+
+import random
+from typing import List
+
+TOPICS = [
+    "gradient descent", "backpropagation", "attention heads", "convolution kernels",
+    "learning rate schedules", "batch normalization", "dropout regularization",
+    "transformer encoders", "recurrent networks", "loss landscapes", "tokenization",
+    "embedding tables", "beam search", "overfitting", "weight decay", "optimizers",
+]
+FILLER = (
+    "so the idea here is that we can see how the model behaves when we change "
+    "this value and then we look at what happens to the output in practice you "
+    "will notice that it converges faster because the update is smaller right"
+).split()
+
+
+def generate_transcript(words: int, seed: int = 0) -> str:
+    """Generate a transcript-like text of roughly ``words`` words.
+
+    Args:
+        words: Number of words to generate.
+        seed: Random seed, so runs are reproducible.
+
+    Returns:
+        The transcript text.
+    """
+    rng = random.Random(seed)
+    output: List[str] = []
+    while len(output) < words:
+        sentence = rng.sample(FILLER, rng.randint(8, 20))
+        sentence.insert(rng.randrange(len(sentence)), rng.choice(TOPICS))
+        output.extend(sentence)
+        output[-1] += "."
+    return " ".join(output[:words])
+
+
+def generate_questions(count: int, seed: int = 0) -> List[str]:
+    """Generate distinct questions, a few of them non-English.
+
+    Args:
+        count: Number of questions.
+        seed: Random seed.
+
+    Returns:
+        The questions.
+    """
+    rng = random.Random(seed)
+    templates = [
+        "What does the lecturer say about {topic}? ({n})",
+        "How is {topic} explained in this video? ({n})",
+        "Why does {topic} matter here? ({n})",
+        "ما هو {topic}؟ ({n})",
+    ]
+    return [rng.choice(templates).format(topic=rng.choice(TOPICS), n=n) for n in range(count)]
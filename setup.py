@@ -20,6 +20,8 @@ setup(
         "langchain-community",
         "pydantic",
         "python-dotenv",
+        "numpy",
+        "httpx",
     ],
     python_requires=">=3.8",
 )
\ No newline at end of file
@@ -16,14 +16,148 @@ LLM_MODEL = "llama-3.1-8b-instant"
 EMBEDDING_MODEL = "all-MiniLM-L6-v2.gguf2.f16.gguf"
 EMBEDDING_DIMENSION = 384
 
+# Retrieval Configuration
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense")  # "dense" or "hybrid" (BM25 + vectors fused by RRF)
+RETRIEVAL_DENSE_K = 10  # candidates taken from the vector index in hybrid mode
+RETRIEVAL_LEXICAL_K = 10  # candidates taken from the BM25 index in hybrid mode
+RRF_K = 60  # rank offset of reciprocal-rank fusion
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_MAX_DF = 0.5  # query terms in more than this share of a video's chunks are skipped, unless all are
+RAG_RETRIEVAL_K = 6  # transcript chunks retrieved per question, before re-ranking
+
+# Routing Configuration ("parallel" always searches the web alongside the transcript,
+# "adaptive" searches it only when the transcript matches are weak)
+ROUTING_MODE = os.getenv("ROUTING_MODE", "parallel")
+ROUTING_SIMILARITY_THRESHOLD = 0.5  # cosine similarity of a strong transcript match
+ROUTING_MIN_CONFIDENT_DOCS = 2  # strong matches needed to answer without web retrieval
+
+# Context Assembly Configuration
+CONTEXT_TOKEN_BUDGET = 1500  # maximum tokens of retrieved context in the answer prompt
+CONTEXT_CHARS_PER_TOKEN = 4  # rough token estimate for English text
+CONTEXT_MIN_PASSAGE_TOKENS = 50  # shortest truncated passage worth including
+RERANK_RANK_WEIGHT = 0.3  # weight of the retrieval rank next to the lexical re-ranker score
+
+# Embedding Cache Configuration
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join("data", "embedding_cache"))
+EMBEDDING_CACHE_DTYPE = "float16"  # "float16" or "float32"
+EMBEDDING_CACHE_MAX_ENTRIES = 100000
+EMBEDDING_QUERY_CACHE_ENTRIES = 1024  # question embeddings, kept in memory apart from the chunk cache
+
+# Embedding Engine Configuration
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+
+# Vector Store Backend Configuration ("pinecone" or "local")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone")
+
 # Pinecone Configuration
 PINECONE_INDEX_NAME = "meta"
 PINECONE_CLOUD = "aws"
 PINECONE_REGION = "us-east-1"
 
+# Local Index Configuration
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", os.path.join("data", "index"))
+LOCAL_INDEX_ANN = "none"  # "none" for exact search, "ivf" for approximate search
+LOCAL_INDEX_IVF_MIN_SIZE = 50000
+LOCAL_INDEX_IVF_NLIST = 256
+LOCAL_INDEX_IVF_NPROBE = 8
+LOCAL_INDEX_SEARCH_BLOCK = 65536
+# "none" scans full-precision vectors; "int8" or "binary" scan compact codes, then re-score exactly
+LOCAL_INDEX_QUANTIZATION = os.getenv("LOCAL_INDEX_QUANTIZATION", "none")
+LOCAL_INDEX_RESCORE_FACTOR = 4  # candidates re-scored at full precision per requested result
+
+# Directory for the manifests of chunk IDs stored in remote indexes
+INDEX_MANIFEST_DIR = os.getenv("INDEX_MANIFEST_DIR", os.path.join("data", "manifests"))
+
+# Query Processing Configuration
+LANGUAGE_DETECTION_MODE = "rules"  # "rules" for the local detector, "llm" to ask the model
+QUERY_ENHANCEMENT_MODE = "separate"  # "separate", "skip", or "merged" with answer generation
+
+# Retrieval Timeouts (seconds, None to wait indefinitely)
+RAG_RETRIEVAL_TIMEOUT = 10.0
+WEB_RETRIEVAL_TIMEOUT = 5.0
+WEB_RETRIEVAL_WORKERS = 4  # threads running web searches, separate from RAG retrieval
+
+# Maximum pooled HTTP connections per client
+HTTP_MAX_CONNECTIONS = 100
+
+# External Service Configuration (Groq, Tavily and MyMemory)
+SERVICE_TIMEOUTS = {  # seconds per request
+    "groq": 30.0,
+    "tavily": 4.0,
+    "mymemory": 5.0,
+}
+SERVICE_MAX_RETRIES = {  # retries of timeouts, connection errors, 429s and 5xx responses
+    "groq": 2,
+    "tavily": 1,
+    "mymemory": 2,
+}
+SERVICE_BACKOFF_BASE = 0.25  # seconds, doubled on every retry
+SERVICE_BACKOFF_MAX = 2.0  # seconds
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failures that open a service's circuit
+CIRCUIT_RESET_TIMEOUT = 30.0  # seconds before an open circuit lets a probe call through
+
+# Answer Cache Configuration
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_MAX_ENTRIES = 1000
+ANSWER_CACHE_TTL = 24 * 60 * 60  # seconds, None for no expiry
+ANSWER_CACHE_SIMILARITY_THRESHOLD = 0.95
+
+# Stage Cache Configuration (translation, query enhancement and web search results)
+STAGE_CACHE_ENABLED = True
+STAGE_CACHE_MAX_ENTRIES = 1024
+STAGE_CACHE_TTLS = {  # seconds, None for no expiry
+    "translation": 7 * 24 * 60 * 60,
+    "query_enhancement": 24 * 60 * 60,
+    "web_results": 60 * 60,
+}
+STAGE_CACHE_DB = os.getenv("STAGE_CACHE_DB")  # SQLite path for a shared on-disk cache
+
+# Batch Question Answering Configuration
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))  # workflow runs in flight at once
+ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "16"))  # questions in flight at once in ask_many_async
+RATE_LIMIT_MAX_RETRIES = 5
+RATE_LIMIT_BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+RATE_LIMIT_BACKOFF_MAX = 30.0  # seconds
+
+# Server Configuration
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_MAX_CONCURRENCY = int(os.getenv("SERVER_MAX_CONCURRENCY", "8"))  # questions answered at once
+SERVER_MAX_QUEUE = int(os.getenv("SERVER_MAX_QUEUE", "32"))  # questions waiting; more are rejected with 503
+SERVER_QUEUE_TIMEOUT = 30.0  # seconds a question may wait for a slot
+SERVER_LATENCY_WINDOW = 1000  # recent requests kept for latency percentiles
+
+# Tracing Configuration
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACE_PATH = os.getenv("TRACE_PATH")  # JSON lines file each span is appended to
+TRACE_MAX_RECORDS = 100000
+
+# Transcription Configuration
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+TRANSCRIPTION_SEGMENTED = os.getenv("TRANSCRIPTION_SEGMENTED", "0") == "1"  # parallel segmented mode
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", str(os.cpu_count() or 1)))  # worker processes
+TRANSCRIPTION_SEGMENT_SECONDS = 60.0  # target audio length per segment
+TRANSCRIPTION_SILENCE_WINDOW_SECONDS = 10.0  # how far a cut may move to land on silence
+
+# Artifact Store Configuration (downloaded audio and transcripts, per video)
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join("data", "artifacts"))
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(5 * 1024 ** 3)))  # least recently used are evicted
+
+# Digest Configuration (summary tree and FAQ precomputed per video after indexing)
+DIGEST_ENABLED = os.getenv("DIGEST_ENABLED", "0") == "1"
+DIGEST_FANOUT = 8  # chunks (or summaries) condensed into each parent summary
+DIGEST_FAQ_QUESTIONS = 10  # likely questions answered at ingest time
+DIGEST_FAQ_SIMILARITY_THRESHOLD = 0.9  # cosine similarity for a question to be served from the FAQ
+DIGEST_SUMMARY_NODES = 8  # summary-tree nodes used as context for overview questions
+DIGEST_CONCURRENCY = 4  # summarization calls in flight at once
+
 # Text Splitting Configuration
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 20
+TRANSCRIPT_WINDOW_CHARS = 1 << 20  # characters read per window when streaming a transcript
 
 # Device Configuration
 USE_CUDA = True
\ No newline at end of file
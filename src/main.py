@@ -1,12 +1,13 @@
 """Main entry point for the video QA system."""
 
 import argparse
+import csv
+import json
 import os
 import sys
+import threading
+from typing import List
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from data.transcription import VideoTranscriber
-from src.models.vectorstore import TranscriptionVectorStore
-from src.pipeline import VideoQAPipeline
 
 
 def parse_args():
@@ -33,36 +34,226 @@ def parse_args():
         default=None,
         help="Question to ask about the video"
     )
+    parser.add_argument(
+        "--video_id",
+        type=str,
+        default=None,
+        help="ID to index the transcription under (defaults to the YouTube ID or file name)"
+    )
+    parser.add_argument(
+        "--playlist",
+        type=str,
+        action="append",
+        default=None,
+        help="Playlist the video belongs to (repeatable)"
+    )
+    parser.add_argument(
+        "--scope",
+        type=str,
+        default=None,
+        help="Videos to answer from: 'video:<id>', 'playlist:<name>' or 'all' (defaults to the loaded video)"
+    )
+    parser.add_argument(
+        "--questions_file",
+        type=str,
+        default=None,
+        help="JSONL or CSV file of questions to answer in one batch"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="JSONL file the batch answers are written to (defaults to <questions_file>.answers.jsonl)"
+    )
+    parser.add_argument(
+        "--segmented",
+        action="store_true",
+        help="Transcribe the video in parallel segments; interactive questions start after the first one"
+    )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="Precompute a summary tree and FAQ of the video after indexing, for fast overview answers"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of batch questions answered at once"
+    )
     
     return parser.parse_args()
 
 
+def read_questions(path: str) -> List[dict]:
+    """Read a batch of questions.
+    
+    JSONL lines are either strings or objects with a "question" and an
+    optional "id" field. CSV files use the "question" and "id" columns, or
+    the first column when there is no "question" header.
+    
+    Args:
+        path: Path to a .jsonl or .csv file.
+        
+    Returns:
+        Records with "id" and "question" keys.
+    """
+    records = []
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.reader(file))
+            header = [column.strip().lower() for column in rows[0]] if rows else []
+            if "question" in header:
+                question_column = header.index("question")
+                id_column = header.index("id") if "id" in header else None
+                rows = rows[1:]
+            else:
+                question_column, id_column = 0, None
+            for row in rows:
+                if len(row) > question_column and row[question_column].strip():
+                    records.append({
+                        "id": row[id_column] if id_column is not None else len(records),
+                        "question": row[question_column].strip(),
+                    })
+        else:
+            for line in file:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if isinstance(item, str):
+                    item = {"question": item}
+                records.append({"id": item.get("id", len(records)), "question": item["question"]})
+    return records
+
+
+def print_streamed_answer(pipeline, question: str, scope) -> str:
+    """Print progress and the answer to a question as the pipeline produces them.
+    
+    Args:
+        pipeline: Pipeline with the videos loaded.
+        question: The question to ask.
+        scope: Scope of the question, or None for the default.
+        
+    Returns:
+        The complete answer.
+    """
+    answer = ""
+    started = False
+    for kind, payload in pipeline.stream_answer(question, scope):
+        if kind == "status":
+            print(f"[{payload}]")
+        elif kind == "token":
+            if not started:
+                print("\nAnswer: ", end="", flush=True)
+                started = True
+            print(payload, end="", flush=True)
+        else:
+            answer = payload
+    print()
+    return answer
+
+
+def start_segmented_processing(pipeline, args) -> threading.Thread:
+    """Transcribe and index the video in the background, returning once its first segment is queryable.
+    
+    Args:
+        pipeline: The pipeline to process the video with.
+        args: Parsed command line arguments.
+        
+    Returns:
+        The thread processing the rest of the video.
+    """
+    first_segment = threading.Event()
+    
+    def run():
+        try:
+            pipeline.process_video(
+                args.video_url,
+                playlists=args.playlist,
+                segmented=True,
+                on_segment=lambda segment, summary: first_segment.set(),
+            )
+            print("\nFinished transcribing the video")
+        except Exception as e:
+            print(f"\nTranscription failed: {e}")
+        finally:
+            first_segment.set()
+    
+    thread = threading.Thread(target=run, name="transcription", daemon=True)
+    thread.start()
+    first_segment.wait()
+    print("Answering from the part transcribed so far while the rest is transcribed")
+    return thread
+
+
+def answer_questions_file(pipeline, args) -> None:
+    """Answer every question of ``--questions_file``, streaming answers to ``--output``.
+    
+    Args:
+        pipeline: Pipeline with the videos loaded.
+        args: Parsed command line arguments.
+    """
+    records = read_questions(args.questions_file)
+    output_path = args.output or f"{os.path.splitext(args.questions_file)[0]}.answers.jsonl"
+    print(f"\nAnswering {len(records)} questions from {args.questions_file} into {output_path}")
+    
+    with open(output_path, "w", encoding="utf-8") as output:
+        def write(index: int, question: str, answer: str) -> None:
+            record = {"id": records[index]["id"], "question": question, "answer": answer}
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+        
+        kwargs = {"concurrency": args.concurrency} if args.concurrency else {}
+        pipeline.ask_many(
+            [record["question"] for record in records],
+            scope=args.scope,
+            on_answer=write,
+            **kwargs,
+        )
+    
+    print(f"Wrote {len(records)} answers to {output_path}")
+
+
 def main():
     """Main entry point for the application."""
     args = parse_args()
     
-    # Initialize the pipeline
+    # Import the pipeline only after parsing, so --help and argument errors stay fast
+    from src.models.instrumentation import tracer
+    from src.models.workflow import route_stats
+    from src.pipeline import VideoQAPipeline
+    
+    # Initialize the pipeline and build its clients while the video is processed
     pipeline = VideoQAPipeline()
+    pipeline.digest_enabled = pipeline.digest_enabled or args.digest
+    pipeline.warm_up()
     
     # Process video or use existing transcription
     if args.video_url:
         print(f"Processing video: {args.video_url}")
-        pipeline.process_video(args.video_url)
+        if args.segmented and not (args.question or args.questions_file):
+            start_segmented_processing(pipeline, args)
+        else:
+            kwargs = {"segmented": True} if args.segmented else {}
+            pipeline.process_video(args.video_url, playlists=args.playlist, **kwargs)
     elif args.transcription_path:
         if not os.path.exists(args.transcription_path):
             print(f"Transcription file not found: {args.transcription_path}")
             return
         print(f"Using existing transcription: {args.transcription_path}")
-        pipeline.load_transcription(args.transcription_path)
+        pipeline.load_transcription(args.transcription_path, args.video_id, args.playlist)
+    elif args.scope:
+        print(f"Using indexed videos in scope: {args.scope}")
     else:
-        print("Please provide either a video URL or path to an existing transcription file.")
+        print("Please provide a video URL, a path to an existing transcription file or a --scope of indexed videos.")
         return
     
     # Ask question if provided
-    if args.question:
+    if args.questions_file:
+        answer_questions_file(pipeline, args)
+    elif args.question:
         print(f"\nQuestion: {args.question}")
-        answer = pipeline.ask_question(args.question)
-        print(f"\nAnswer: {answer}")
+        print_streamed_answer(pipeline, args.question, args.scope)
     else:
         # Interactive mode
         print("\nEnter your questions about the video (type 'exit' to quit):")
@@ -71,8 +262,18 @@ def main():
             if question.lower() in ["exit", "quit", "q"]:
                 break
             
-            answer = pipeline.ask_question(question)
-            print(f"\nAnswer: {answer}")
+            print_streamed_answer(pipeline, question, args.scope)
+    
+    # Print per-node latency percentiles when tracing is enabled
+    if tracer.enabled:
+        print(f"\nLatency summary:\n{json.dumps(tracer.summary(), indent=2)}")
+    
+    # Report how often adaptive routing skipped the web search
+    routes = route_stats()
+    if routes:
+        print(f"\nRetrieval routes: {json.dumps(routes)}")
+    
+    pipeline.close()
 
 
 if __name__ == "__main__":
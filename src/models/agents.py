@@ -1,36 +1,117 @@
 """Agent definitions for the video QA system."""
 
+import contextvars
 import json
-import requests
 import urllib.parse
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from langchain.prompts import PromptTemplate, ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from langchain.schema.runnable import RunnablePassthrough
-from langchain_community.retrievers import TavilySearchAPIRetriever
 from langchain.schema.document import Document
 
-from src.config import TAVILY_API_KEY
+from src.config import (
+    TAVILY_API_KEY,
+    LLM_MODEL,
+    LANGUAGE_DETECTION_MODE,
+    QUERY_ENHANCEMENT_MODE,
+    RAG_RETRIEVAL_TIMEOUT,
+    WEB_RETRIEVAL_TIMEOUT,
+    WEB_RETRIEVAL_WORKERS,
+    RAG_RETRIEVAL_K,
+    CONTEXT_TOKEN_BUDGET,
+)
+from src.models import clients
+from src.models.clients import raise_for_transient_status
+from src.models.cache import MISSING, get_stage_cache, memoized
+from src.models.context import build_context, estimate_tokens
+from src.models.digest import is_summary_question
+from src.models.instrumentation import record
+from src.models.language import detect_language
+from src.models.lazy import Lazy
 from src.models.llm import get_llm
+from src.models.web_search import TavilySearch
 
 
-# Get the LLM
-llm = get_llm()
+# Tavily retriever, created on first use
+_web_retriever = Lazy(lambda: TavilySearch(k=2, api_key=TAVILY_API_KEY))
 
-# Initialize Tavily retriever
-web_retriever = TavilySearchAPIRetriever(k=2, api_key=TAVILY_API_KEY)
 
+def get_web_retriever():
+    """Get the shared Tavily retriever, creating it on first use."""
+    return _web_retriever.get()
 
-def language_detection_chain(state):
-    """Create a chain to detect if text is in English or another language.
+
+def set_web_retriever(retriever) -> None:
+    """Replace the shared web retriever, e.g. with a local stand-in."""
+    _web_retriever.set(retriever)
+
+
+# Callback receiving answer tokens as they are generated, if the caller streams
+_token_sink: contextvars.ContextVar = contextvars.ContextVar("token_sink", default=None)
+
+
+@contextmanager
+def streaming_tokens(on_token: Callable[[str], None]) -> Iterator[None]:
+    """Send the answer tokens of workflows run in this context to ``on_token``.
     
     Args:
-        state: The current state of the graph.
+        on_token: Called with each chunk of the answer as it is generated.
+    """
+    reset = _token_sink.set(on_token)
+    try:
+        yield
+    finally:
+        _token_sink.reset(reset)
+
+
+def token_sink() -> Optional[Callable[[str], None]]:
+    """Return the token callback of the current context, if any."""
+    return _token_sink.get()
+
+
+# Threads that run retrievals so they can be abandoned after a timeout. Web
+# searches get their own pool, so a slow Tavily cannot hold up RAG retrieval.
+retrieval_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval")
+web_executor = ThreadPoolExecutor(max_workers=WEB_RETRIEVAL_WORKERS, thread_name_prefix="web")
+
+
+def run_with_timeout(func, timeout, default, name, service=None, executor=None):
+    """Run a blocking call, giving up after a timeout.
+    
+    A call that has started keeps running in the background when it times
+    out, but the graph no longer waits for it; one still queued is cancelled.
+    
+    Args:
+        func: Zero-argument callable to run.
+        timeout: Seconds to wait, or None to wait indefinitely.
+        default: Value returned on timeout or error.
+        name: Name used in log messages.
+        service: External service called by ``func``, whose circuit
+            breaker counts the timeout as a failure.
+        executor: Pool running ``func``, ``retrieval_executor`` by default.
         
     Returns:
-        A language detection chain.
+        The result of ``func``, or ``default``.
     """
-    prompt = PromptTemplate(
-        template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You are a Language Detection Agent. Your task is to determine if the given text is in English or not.
+    # Carry the caller's context so tracing records land in the node's span
+    future = (executor or retrieval_executor).submit(contextvars.copy_context().run, func)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        print(f"{name} timed out after {timeout}s, continuing without it")
+        if service is not None:
+            clients.breaker(service).record_failure()
+    except clients.CircuitOpenError:
+        print(f"{name} skipped, {service or 'the service'} is unavailable")
+    except Exception as e:
+        print(f"{name} failed: {e}")
+    return default
+
+
+LANGUAGE_DETECTION_PROMPT = PromptTemplate(
+    template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You are a Language Detection Agent. Your task is to determine if the given text is in English or not.
 
 <|eot_id|><|start_header_id|>user<|end_header_id|> Analyze the following text and 
 determine if it's in English or not. If it's in English, respond with the string "english". 
@@ -41,66 +122,226 @@ Only respond with either "english" or "another", nothing else.
 Text to analyze: {initial_query}
 
 <|eot_id|> <|start_header_id|>assistant<|end_header_id|> """,
-        input_variables=["initial_query"],
-    )
+    input_variables=["initial_query"],
+)
 
-    return prompt | llm | StrOutputParser()
+QUERY_ENHANCEMENT_PROMPT = ChatPromptTemplate.from_template(
+    """You are a helpful assistant that improve search queries based on a single input query.
 
+Generate a single improved search query related to: {question}
 
-def translation_agent(state):
-    """Translate non-English text to English.
+Only respond with the generated query nothing else.
+Output (single query):"""
+)
+
+ANSWER_GENERATION_PROMPT = PromptTemplate(
+    template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You are an assistant for question-answering tasks. 
+        Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. 
+        Use three sentences maximum and keep the answer concise <|eot_id|><|start_header_id|>user<|end_header_id|>
+        Question: {question} 
+        Context: {context} 
+        Answer: <|eot_id|><|start_header_id|>assistant<|end_header_id|>""",
+    input_variables=["question", "context"],
+)
+
+MERGED_ANSWER_PROMPT = PromptTemplate(
+    template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You are an assistant for question-answering tasks. 
+        First rewrite the question as a single clear, self-contained query. Then use the following pieces of retrieved context 
+        to answer it. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
+        Respond with a JSON object with the keys "improved_query" and "answer" and nothing else <|eot_id|><|start_header_id|>user<|end_header_id|>
+        Question: {question} 
+        Context: {context} 
+        JSON: <|eot_id|><|start_header_id|>assistant<|end_header_id|>""",
+    input_variables=["question", "context"],
+)
+
+
+def language_detection_chain(state):
+    """Create a chain to detect if text is in English or another language.
     
     Args:
         state: The current state of the graph.
         
     Returns:
-        Updated state with translated query.
+        A language detection chain.
+    """
+    return LANGUAGE_DETECTION_PROMPT | get_llm() | StrOutputParser()
+
+
+def language_detection_agent(state, mode: str = LANGUAGE_DETECTION_MODE):
+    """Detect the query language and set the query to process.
+    
+    Args:
+        state: The current state of the graph.
+        mode: "rules" for the local detector, "llm" to ask the model.
+        
+    Returns:
+        Updated state with query language, and the final query for English input.
+    """
+    query_language = None
+    if mode == "llm":
+        try:
+            query_language = clients.call(
+                "groq", lambda: language_detection_chain(state).invoke({"initial_query": state["initial_query"]})
+            )
+        except Exception as e:
+            print(f"Language detection failed: {e}, using the local detector")
+    if query_language is None:
+        query_language = detect_language(state["initial_query"])
+    
+    return apply_language(state, query_language)
+
+
+def apply_language(state, query_language: str):
+    """Store the detected language, and the final query for English input.
+    
+    Args:
+        state: The current state of the graph.
+        query_language: Raw detector output.
+        
+    Returns:
+        Updated state.
+    """
+    print(f"Detected language: {query_language}")
+    
+    if query_language.strip().lower() == "english":
+        state["query_language"] = "english"
+        state["final_query"] = state["initial_query"]
+    else:
+        state["query_language"] = "another"
+    
+    return state
+
+
+def translation_url(text: str) -> str:
+    """Build the MyMemory request URL for translating a query.
+    
+    Args:
+        text: Text to translate.
+        
+    Returns:
+        The request URL.
     """
-    text = state["initial_query"]
     base_url = "https://api.mymemory.translated.net/get"
     params = {
         "q": text,
         "langpair": "ar|en"  # Arabic to English by default, could be made dynamic
     }
     
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
-    
-    response = requests.get(url)
+    return f"{base_url}?{urllib.parse.urlencode(params)}"
+
+
+def apply_translation(state, status_code: int, data=None):
+    """Store the outcome of a MyMemory response in the state.
     
-    if response.status_code == 200:
-        data = response.json()
-        if data["responseStatus"] == 200:
-            state["final_query"] = data["responseData"]["translatedText"]
-        else:
-            state["final_query"] = f"Translation error: {data['responseStatus']}"
+    Args:
+        state: The current state of the graph.
+        status_code: HTTP status code of the response.
+        data: Decoded JSON body, when the request succeeded.
+        
+    Returns:
+        Updated state with translated query.
+    """
+    if status_code == 200 and data["responseStatus"] == 200:
+        state["final_query"] = data["responseData"]["translatedText"]
+        cache = get_stage_cache("translation")
+        if cache is not None:
+            cache.put(state["initial_query"], state["final_query"])
     else:
-        state["final_query"] = f"HTTP error: {response.status_code}"
+        # Searching with the original question beats searching with an error message
+        error = data["responseStatus"] if status_code == 200 else f"HTTP {status_code}"
+        return translation_failed(state, f"Translation error: {error}")
     
     print(f"Translated query: {state['final_query']}")
     return state
 
 
-def query_enhancement_agent(state):
-    """Enhance the query for better search results.
+def translation_failed(state, reason: str):
+    """Fall back to the original question when it cannot be translated.
     
     Args:
         state: The current state of the graph.
+        reason: Description of the failure.
         
     Returns:
-        Updated state with enhanced query.
+        Updated state with the original question as the final query.
     """
-    template = """You are a helpful assistant that improve search queries based on a single input query.
+    print(f"{reason}, using the original query")
+    state["final_query"] = state["initial_query"]
+    return state
 
-Generate a single improved search query related to: {question}
 
-Only respond with the generated query nothing else.
-Output (single query):"""
+def translation_agent(state):
+    """Translate non-English text to English.
+    
+    Args:
+        state: The current state of the graph.
+        
+    Returns:
+        Updated state with translated query.
+    """
+    if cached_translation(state):
+        return state
+    
+    url = translation_url(state["initial_query"])
+    try:
+        response = clients.call(
+            "mymemory",
+            lambda: raise_for_transient_status(clients.get_http_session().get(url, timeout=clients.timeout("mymemory"))),
+        )
+        data = response.json() if response.status_code == 200 else None
+    except Exception as e:
+        return translation_failed(state, f"Translation failed: {e}")
+    
+    return apply_translation(state, response.status_code, data)
+
+
+def cached_translation(state) -> bool:
+    """Fill in the final query from an earlier translation, if any.
+    
+    Args:
+        state: The current state of the graph.
+        
+    Returns:
+        True if the translation was served from the cache.
+    """
+    cache = get_stage_cache("translation")
+    translated = cache.get(state["initial_query"]) if cache is not None else MISSING
+    record(cache_hit=translated is not MISSING)
+    if translated is MISSING:
+        return False
     
-    prompt_rag_fusion = ChatPromptTemplate.from_template(template)
-    generate_queries = prompt_rag_fusion | llm | StrOutputParser()
+    state["final_query"] = translated
+    print(f"Translated query (cached): {translated}")
+    return True
+
+
+def query_enhancement_agent(state, mode: str = QUERY_ENHANCEMENT_MODE):
+    """Enhance the query for better search results.
     
+    Args:
+        state: The current state of the graph.
+        mode: "separate" to call the LLM, "skip" or "merged" to search with
+            the query as-is.
+        
+    Returns:
+        Updated state with enhanced query.
+    """
     question = state["final_query"]
-    enhanced_query = generate_queries.invoke({"question": question})
+    
+    if mode != "separate":
+        state['new_query'] = question
+        return state
+    
+    try:
+        enhanced_query = memoized(
+            "query_enhancement",
+            (LLM_MODEL, question),
+            lambda: clients.call("groq", lambda: query_enhancement_chain().invoke({"question": question})),
+        )
+    except Exception as e:
+        print(f"Query enhancement failed: {e}, searching with the original query")
+        enhanced_query = question
     
     state['new_query'] = enhanced_query
     print(f"Enhanced query: {enhanced_query}")
@@ -108,32 +349,77 @@ Output (single query):"""
     return state
 
 
-def rag_retrieval_agent(state, vector_store):
+def query_enhancement_chain():
+    """Chain that rewrites a question into a better search query."""
+    return QUERY_ENHANCEMENT_PROMPT | get_llm() | StrOutputParser()
+
+
+def summary_update(state, digests) -> Optional[dict]:
+    """Answer an overview question from the precomputed summary trees.
+    
+    Args:
+        state: The current state of the graph.
+        digests: Store of precomputed digests, or None.
+        
+    Returns:
+        State update with summaries in place of chunks, or None when the
+        question is not an overview question or a video has no digest.
+    """
+    question = state.get("final_query") or state["new_query"]
+    if digests is None or not is_summary_question(question):
+        return None
+    docs = digests.summaries(state.get("scope"))
+    if not docs:
+        return None
+    
+    record(retrieved_docs=len(docs), summaries=True)
+    print(f"Using {len(docs)} precomputed summaries")
+    # Summaries cover the whole video, so they count as strong matches
+    return {
+        "Rag_search": "\n".join(doc.page_content for doc in docs),
+        "rag_documents": docs,
+        "rag_scores": [1.0] * len(docs),
+    }
+
+
+def rag_retrieval_agent(state, vector_store, digests=None):
     """Retrieve relevant information from the vector store.
     
+    Overview questions are answered from the videos' summary trees instead
+    of individual chunks when digests are available.
+    
     Args:
         state: The current state of the graph.
         vector_store: The vector store to retrieve from.
+        digests: Store of precomputed digests, or None.
         
     Returns:
-        Updated state with retrieved information.
+        State update with retrieved information.
     """
     print("---RAG SEARCH INFO RETRIEVAL---")
+    update = summary_update(state, digests)
+    if update is not None:
+        return update
+    
     new_query = state["new_query"]
  
     print(f"Searching for: {new_query}")
 
-    # Retrieve documents from vector store
-    docs = vector_store.similarity_search(new_query, k=3)
+    # Retrieve documents from the videos in scope, with their similarity to the query
+    results = run_with_timeout(
+        lambda: vector_store.similarity_search_with_score(new_query, k=RAG_RETRIEVAL_K, video_ids=state.get("scope")),
+        RAG_RETRIEVAL_TIMEOUT,
+        [],
+        "RAG retrieval",
+    )
+    docs = [doc for doc, _ in results]
     
     # Join the documents' content
     combined_content = "\n".join([doc.page_content for doc in docs])
     
-    # Add to state
-    state["Rag_search"] = combined_content
-    
+    record(retrieved_docs=len(docs))
     print(f"Retrieved {len(docs)} documents from vector store")
-    return state
+    return {"Rag_search": combined_content, "rag_documents": docs, "rag_scores": [float(score) for _, score in results]}
 
 
 def web_retrieval_agent(state):
@@ -143,51 +429,153 @@ def web_retrieval_agent(state):
         state: The current state of the graph.
         
     Returns:
-        Updated state with web research results.
+        State update with web research results.
     """
-    web_results = web_retriever.invoke(state["new_query"])
+    new_query = state["new_query"]
+    passages = run_with_timeout(
+        lambda: memoized(
+            "web_results",
+            new_query,
+            lambda: web_passages(clients.call("tavily", lambda: get_web_retriever().invoke(new_query))),
+        ),
+        WEB_RETRIEVAL_TIMEOUT,
+        [],
+        "Web retrieval",
+        service="tavily",
+        executor=web_executor,
+    )
+    
+    print("Retrieved information from web")
+    return web_update(passages)
+
+
+def web_passages(web_results) -> List[str]:
+    """Convert web retriever output to a list of passages.
     
-    # Convert to string if it's a list of documents
+    Args:
+        web_results: List of documents, or any other retriever output.
+        
+    Returns:
+        The text of each result.
+    """
     if isinstance(web_results, list):
-        web_context = "\n".join([doc.page_content for doc in web_results])
-    else:
-        web_context = str(web_results)
+        return [doc.page_content for doc in web_results]
+    return [str(web_results)]
+
+
+def web_context(web_results) -> str:
+    """Convert web retriever output to a string.
     
-    state["web_research"] = web_context
+    Args:
+        web_results: List of documents, or any other retriever output.
+        
+    Returns:
+        The combined text of the results.
+    """
+    return "\n".join(web_passages(web_results))
+
+
+def web_update(passages: List[str]) -> dict:
+    """State update carrying web passages both joined and as documents."""
+    return {
+        "web_research": "\n".join(passages),
+        "web_documents": [Document(page_content=passage) for passage in passages],
+    }
+
+
+def context_builder_agent(state, budget: int = CONTEXT_TOKEN_BUDGET):
+    """Combine the RAG and web results into the answer context.
     
-    # Combine RAG and web results
-    state["context"] = f"Information from document: {state['Rag_search']}\n\nInformation from web: {state['web_research']}"
+    Overlapping and repeated passages are removed, the rest are re-ranked
+    against the query and the best are packed into ``budget`` tokens.
     
-    print("Retrieved information from web")
-    return state
+    Args:
+        state: The current state of the graph.
+        budget: Maximum number of context tokens.
+        
+    Returns:
+        State update with the combined context.
+    """
+    rag_documents = state.get("rag_documents")
+    web_documents = state.get("web_documents")
+    if rag_documents is None and web_documents is None:
+        rag_search = state.get("Rag_search", "")
+        web_research = state.get("web_research", "")
+        return {"context": f"Information from document: {rag_search}\n\nInformation from web: {web_research}"}
+    
+    context = build_context(state["new_query"], rag_documents or [], web_documents or [], budget)
+    record(context_tokens=estimate_tokens(context))
+    return {"context": context}
 
 
-def answer_generation_agent(state):
+def answer_generation_agent(state, mode: str = QUERY_ENHANCEMENT_MODE):
     """Generate a final answer based on retrieved information.
     
     Args:
         state: The current state of the graph.
+        mode: Query enhancement mode; "merged" rewrites the query and answers
+            it in a single structured call.
         
     Returns:
         Updated state with final answer.
     """
-    prompt = PromptTemplate(
-        template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You are an assistant for question-answering tasks. 
-        Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. 
-        Use three sentences maximum and keep the answer concise <|eot_id|><|start_header_id|>user<|end_header_id|>
-        Question: {question} 
-        Context: {context} 
-        Answer: <|eot_id|><|start_header_id|>assistant<|end_header_id|>"""
-    )
-
-    chain = (
-        {"context": lambda x: state['context'], "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
+    if mode == "merged":
+        response = clients.call("groq", lambda: merged_answer_chain().invoke(answer_inputs(state)))
+        return apply_merged_answer(state, response)
+    
+    on_token = token_sink()
+    if on_token is None:
+        state["final_answer"] = clients.call("groq", lambda: answer_chain().invoke(answer_inputs(state)))
+    else:
+        chunks = []
+        
+        def stream():
+            # Tokens already sent cannot be taken back, so a stream is never retried
+            for chunk in answer_chain().stream(answer_inputs(state)):
+                chunks.append(chunk)
+                on_token(chunk)
+        
+        clients.call("groq", stream, retries=0)
+        state["final_answer"] = "".join(chunks)
+        return state
     
-    state["final_answer"] = chain.invoke(state["new_query"])
     print(f"Generated answer: {state['final_answer']}")
     
-    return state
\ No newline at end of file
+    return state
+
+
+def answer_inputs(state) -> dict:
+    """Prompt inputs of the answer generation chains."""
+    return {"question": state["new_query"], "context": state["context"]}
+
+
+def answer_chain():
+    """Chain that answers a question from the retrieved context."""
+    return ANSWER_GENERATION_PROMPT | get_llm() | StrOutputParser()
+
+
+def merged_answer_chain():
+    """Chain that rewrites a question and answers it as one JSON object."""
+    return MERGED_ANSWER_PROMPT | get_llm() | StrOutputParser()
+
+
+def apply_merged_answer(state, response: str):
+    """Store the improved query and answer of a merged completion.
+    
+    Args:
+        state: The current state of the graph.
+        response: Raw completion of ``merged_answer_chain``.
+        
+    Returns:
+        Updated state with the improved query and final answer.
+    """
+    try:
+        result = json.loads(response[response.index("{"):response.rindex("}") + 1])
+        state["new_query"] = result.get("improved_query") or state["new_query"]
+        state["final_answer"] = result["answer"]
+    except (ValueError, KeyError, TypeError):
+        # Fall back to the raw completion if the model ignored the format
+        state["final_answer"] = response
+    
+    print(f"Generated answer: {state['final_answer']}")
+    return state
@@ -0,0 +1,138 @@
+"""Size-bounded on-disk store of the artifacts produced for each video."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from src.config import ARTIFACT_DIR, ARTIFACT_MAX_BYTES
+
+INDEX_FILE = "artifacts.json"
+
+
+def settings_key(settings: Dict[str, Any]) -> str:
+    """Return a short hash identifying the settings an artifact was produced with."""
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+class ArtifactStore:
+    """Audio and transcripts stored as ``<root>/<video_id>/<name>``, evicted least recently used first.
+
+    Names carry the settings that produced an artifact (e.g.
+    ``transcript-<settings_key>.txt``), so changing the Whisper model only
+    invalidates the transcript, not the downloaded audio. An artifact is
+    only served once ``put`` has registered it, so a file left behind by an
+    interrupted run is never mistaken for a finished one. Files still in
+    use elsewhere, such as the transcripts the corpus is indexed from, are
+    never evicted, even if that leaves the store over its budget.
+    """
+
+    def __init__(
+        self,
+        root: str = ARTIFACT_DIR,
+        max_bytes: int = ARTIFACT_MAX_BYTES,
+        pinned: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        """Open (or create) the store.
+
+        Args:
+            root: Directory of the store.
+            max_bytes: Total size above which the least recently used artifacts are deleted.
+            pinned: Returns the paths that must not be evicted, checked on every eviction.
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.pinned = pinned
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, float]] = {}  # "<video_id>/<name>" -> {"size", "used"}
+
+        index_path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as file:
+                self._entries = json.load(file)["entries"]
+
+    def path(self, video_id: str, name: str) -> str:
+        """Return where an artifact of a video is stored, creating its directory."""
+        directory = os.path.join(self.root, video_id)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    def get(self, video_id: str, name: str) -> Optional[str]:
+        """Return the path of a stored artifact, marking it as recently used.
+
+        Args:
+            video_id: ID of the video.
+            name: Name of the artifact.
+
+        Returns:
+            The path, or None if the artifact is not stored.
+        """
+        key = f"{video_id}/{name}"
+        path = os.path.join(self.root, key)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            if not os.path.exists(path):
+                del self._entries[key]
+                self._save()
+                return None
+            self._entries[key]["used"] = time.time()
+            self._save()
+        return path
+
+    def put(self, video_id: str, name: str, source: Optional[str] = None) -> str:
+        """Register an artifact, then evict others until the store fits its budget.
+
+        Args:
+            video_id: ID of the video.
+            name: Name of the artifact.
+            source: File to move into the store, or None if it was written
+                to ``path(video_id, name)`` directly.
+
+        Returns:
+            The path of the stored artifact.
+        """
+        path = self.path(video_id, name)
+        if source is not None and os.path.abspath(source) != os.path.abspath(path):
+            shutil.move(source, path)
+
+        key = f"{video_id}/{name}"
+        with self._lock:
+            self._entries[key] = {"size": os.path.getsize(path), "used": time.time()}
+            self._evict(keep={key})
+            self._save()
+        return path
+
+    def total_bytes(self) -> int:
+        """Return the size of every registered artifact."""
+        with self._lock:
+            return int(sum(entry["size"] for entry in self._entries.values()))
+
+    def _evict(self, keep: Iterable[str]) -> None:
+        """Delete least recently used artifacts until the total fits; the caller holds the lock."""
+        total = sum(entry["size"] for entry in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        pinned = {os.path.abspath(path) for path in self.pinned()} if self.pinned is not None else set()
+        for key in sorted(self._entries, key=lambda key: self._entries[key]["used"]):
+            if total <= self.max_bytes:
+                break
+            path = os.path.join(self.root, key)
+            if key in keep or os.path.abspath(path) in pinned:
+                continue
+            total -= self._entries.pop(key)["size"]
+            if os.path.exists(path):
+                os.remove(path)
+            print(f"Evicted artifact {key}")
+
+    def _save(self) -> None:
+        """Write the artifact index; the caller holds the lock."""
+        os.makedirs(self.root, exist_ok=True)
+        index_path = os.path.join(self.root, INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"entries": self._entries}, file)
+        os.replace(tmp_path, index_path)
@@ -0,0 +1,219 @@
+"""Asynchronous agent implementations for serving many questions on one event loop."""
+
+import asyncio
+
+from src.config import (
+    LLM_MODEL,
+    LANGUAGE_DETECTION_MODE,
+    QUERY_ENHANCEMENT_MODE,
+    RAG_RETRIEVAL_TIMEOUT,
+    WEB_RETRIEVAL_TIMEOUT,
+    RAG_RETRIEVAL_K,
+)
+from src.models import agents, clients
+from src.models.clients import get_http_client
+from src.models.cache import amemoized
+from src.models.instrumentation import record
+from src.models.language import detect_language
+
+
+async def _with_timeout(awaitable, timeout, default, name, service=None):
+    """Await a call, returning ``default`` on timeout or error.
+
+    A timeout counts as a failure of ``service``, if given, for its circuit breaker.
+    """
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        print(f"{name} timed out after {timeout}s, continuing without it")
+        if service is not None:
+            clients.breaker(service).record_failure()
+    except clients.CircuitOpenError:
+        print(f"{name} skipped, {service or 'the service'} is unavailable")
+    except Exception as e:
+        print(f"{name} failed: {e}")
+    return default
+
+
+async def language_detection_agent(state, mode: str = LANGUAGE_DETECTION_MODE):
+    """Detect the query language without blocking the event loop.
+
+    Args:
+        state: The current state of the graph.
+        mode: "rules" for the local detector, "llm" to ask the model.
+
+    Returns:
+        Updated state with query language.
+    """
+    query_language = None
+    if mode == "llm":
+        chain = agents.language_detection_chain(state)
+        try:
+            query_language = await clients.acall("groq", lambda: chain.ainvoke({"initial_query": state["initial_query"]}))
+        except Exception as e:
+            print(f"Language detection failed: {e}, using the local detector")
+    if query_language is None:
+        query_language = detect_language(state["initial_query"])
+
+    return agents.apply_language(state, query_language)
+
+
+async def translation_agent(state):
+    """Translate non-English text to English over the pooled HTTP client.
+
+    Args:
+        state: The current state of the graph.
+
+    Returns:
+        Updated state with translated query.
+    """
+    if agents.cached_translation(state):
+        return state
+
+    url = agents.translation_url(state["initial_query"])
+
+    async def fetch():
+        response = await get_http_client().get(url, timeout=clients.timeout("mymemory"))
+        return agents.raise_for_transient_status(response)
+
+    try:
+        response = await clients.acall("mymemory", fetch)
+        data = response.json() if response.status_code == 200 else None
+    except Exception as e:
+        return agents.translation_failed(state, f"Translation failed: {e}")
+
+    return agents.apply_translation(state, response.status_code, data)
+
+
+async def query_enhancement_agent(state, mode: str = QUERY_ENHANCEMENT_MODE):
+    """Enhance the query for better search results.
+
+    Args:
+        state: The current state of the graph.
+        mode: "separate" to call the LLM, "skip" or "merged" to search with
+            the query as-is.
+
+    Returns:
+        Updated state with enhanced query.
+    """
+    if mode != "separate":
+        state["new_query"] = state["final_query"]
+        return state
+
+    question = state["final_query"]
+    try:
+        state["new_query"] = await amemoized(
+            "query_enhancement",
+            (LLM_MODEL, question),
+            lambda: clients.acall("groq", lambda: agents.query_enhancement_chain().ainvoke({"question": question})),
+        )
+    except Exception as e:
+        print(f"Query enhancement failed: {e}, searching with the original query")
+        state["new_query"] = question
+    print(f"Enhanced query: {state['new_query']}")
+
+    return state
+
+
+async def rag_retrieval_agent(state, vector_store, digests=None):
+    """Retrieve relevant information from the vector store.
+
+    Neither Pinecone nor the local index has a native async client, so the
+    search goes through LangChain's default ``asimilarity_search_with_score``,
+    which runs the synchronous search on the event loop's default executor.
+
+    Args:
+        state: The current state of the graph.
+        vector_store: The vector store to retrieve from.
+        digests: Store of precomputed digests, or None.
+
+    Returns:
+        State update with retrieved information.
+    """
+    update = agents.summary_update(state, digests)
+    if update is not None:
+        return update
+
+    results = await _with_timeout(
+        vector_store.asimilarity_search_with_score(state["new_query"], k=RAG_RETRIEVAL_K, video_ids=state.get("scope")),
+        RAG_RETRIEVAL_TIMEOUT,
+        [],
+        "RAG retrieval",
+    )
+    docs = [doc for doc, _ in results]
+
+    record(retrieved_docs=len(docs))
+    print(f"Retrieved {len(docs)} documents from vector store")
+    return {
+        "Rag_search": "\n".join([doc.page_content for doc in docs]),
+        "rag_documents": docs,
+        "rag_scores": [float(score) for _, score in results],
+    }
+
+
+async def web_retrieval_agent(state):
+    """Retrieve information from the web using Tavily.
+
+    The search runs on the loop's pooled HTTP client, so the timeout cancels
+    it. A replacement retriever without an async search falls back to a
+    thread of the loop's default executor, which keeps running after a
+    timeout; such retrievers should bound their own calls.
+
+    Args:
+        state: The current state of the graph.
+
+    Returns:
+        State update with web research results.
+    """
+    new_query = state["new_query"]
+
+    async def search():
+        return agents.web_passages(await clients.acall("tavily", lambda: agents.get_web_retriever().ainvoke(new_query)))
+
+    passages = await _with_timeout(
+        amemoized("web_results", new_query, search),
+        WEB_RETRIEVAL_TIMEOUT,
+        [],
+        "Web retrieval",
+        service="tavily",
+    )
+
+    print("Retrieved information from web")
+    return agents.web_update(passages)
+
+
+async def answer_generation_agent(state, mode: str = QUERY_ENHANCEMENT_MODE):
+    """Generate a final answer based on retrieved information.
+
+    Args:
+        state: The current state of the graph.
+        mode: Query enhancement mode; "merged" rewrites the query and answers
+            it in a single structured call.
+
+    Returns:
+        Updated state with final answer.
+    """
+    if mode == "merged":
+        response = await clients.acall("groq", lambda: agents.merged_answer_chain().ainvoke(agents.answer_inputs(state)))
+        return agents.apply_merged_answer(state, response)
+
+    on_token = agents.token_sink()
+    if on_token is None:
+        state["final_answer"] = await clients.acall(
+            "groq", lambda: agents.answer_chain().ainvoke(agents.answer_inputs(state))
+        )
+    else:
+        chunks = []
+
+        async def stream():
+            async for chunk in agents.answer_chain().astream(agents.answer_inputs(state)):
+                chunks.append(chunk)
+                on_token(chunk)
+
+        await clients.acall("groq", stream, retries=0)
+        state["final_answer"] = "".join(chunks)
+        return state
+
+    print(f"Generated answer: {state['final_answer']}")
+
+    return state
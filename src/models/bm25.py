@@ -0,0 +1,223 @@
+"""Persisted BM25 inverted index over transcript chunks."""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from langchain.schema.document import Document
+
+from src.config import BM25_K1, BM25_B, BM25_MAX_DF
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased word tokens, keeping identifiers like ``foo_bar`` whole."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Inverted index scoring chunks with Okapi BM25.
+
+    Postings map each term to the term frequency per chunk. The BM25 weight
+    of every posting is computed once per term and cached until the index
+    changes, so a query only sums precomputed weights. Terms found in most
+    chunks carry almost no weight but the longest postings, so a query
+    skips them.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, k1: float = BM25_K1, b: float = BM25_B, max_df: float = BM25_MAX_DF
+    ):
+        """Initialize the index, loading it from ``path`` if it exists.
+
+        Args:
+            path: JSON file to persist the index in, or None for memory only.
+            k1: Term frequency saturation.
+            b: Document length normalization.
+            max_df: Share of chunks above which a query term is skipped.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.max_df = max_df
+        self.docs: Dict[str, list] = {}  # chunk ID -> [length, text, metadata]
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+        self._weights: Dict[str, List[Tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.docs = data["docs"]
+            self.postings = data["postings"]
+            self.total_length = sum(doc[0] for doc in self.docs.values())
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[dict]) -> None:
+        """Index chunks, replacing any with the same ID.
+
+        Args:
+            ids: Chunk IDs.
+            texts: Chunk texts.
+            metadatas: Chunk metadata.
+        """
+        with self._lock:
+            self._remove([chunk_id for chunk_id in ids if chunk_id in self.docs])
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                tokens = tokenize(text)
+                for term, frequency in Counter(tokens).items():
+                    self.postings.setdefault(term, {})[chunk_id] = frequency
+                self.docs[chunk_id] = [len(tokens), text, metadata]
+                self.total_length += len(tokens)
+            self._weights.clear()
+
+    def delete(self, ids: List[str]) -> None:
+        """Remove chunks by ID."""
+        with self._lock:
+            self._remove(ids)
+            self._weights.clear()
+
+    def _remove(self, ids: List[str]) -> None:
+        """Remove chunks and their postings; the caller holds the lock."""
+        for chunk_id in ids:
+            doc = self.docs.pop(chunk_id, None)
+            if doc is None:
+                continue
+            self.total_length -= doc[0]
+            for term in set(tokenize(doc[1])):
+                postings = self.postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self.postings[term]
+
+    def _term_weights(self, term: str) -> List[Tuple[str, float]]:
+        """Return the BM25 weight of a term in every chunk containing it."""
+        weights = self._weights.get(term)
+        if weights is not None:
+            return weights
+
+        postings = self.postings.get(term, {})
+        count = len(self.docs)
+        average_length = self.total_length / count if count else 0.0
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        weights = []
+        for chunk_id, frequency in postings.items():
+            norm = 1 - self.b + self.b * self.docs[chunk_id][0] / (average_length or 1.0)
+            weights.append((chunk_id, idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)))
+        self._weights[term] = weights
+        return weights
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """Return the chunks scoring highest for a query.
+
+        Args:
+            query: Query text.
+            k: Number of results.
+
+        Returns:
+            List of (document, BM25 score) pairs, best first.
+        """
+        scores: Dict[str, float] = {}
+        with self._lock:
+            terms = set(tokenize(query))
+            common = {term for term in terms if len(self.postings.get(term, ())) > self.max_df * len(self.docs)}
+            if common != terms:
+                terms -= common
+            for term in terms:
+                for chunk_id, weight in self._term_weights(term):
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + weight
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                (Document(page_content=self.docs[chunk_id][1], metadata=dict(self.docs[chunk_id][2])), score)
+                for chunk_id, score in best
+            ]
+
+    def persist(self) -> None:
+        """Write the chunks and postings to ``path``."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock, open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"docs": self.docs, "postings": self.postings}, file)
+        os.replace(tmp_path, self.path)
+
+
+class PartitionedBM25Index:
+    """One ``BM25Index`` per video, stored as ``<index_dir>/<video_id>.json``.
+
+    The set of non-empty partitions is read from disk once and then kept up
+    to date by adds and deletes.
+    """
+
+    def __init__(self, index_dir: Optional[str] = None):
+        """Initialize the index without loading any partition.
+
+        Args:
+            index_dir: Directory holding the partitions, or None for memory only.
+        """
+        self.index_dir = index_dir
+        self._partitions: Dict[str, BM25Index] = {}
+        self._partition_ids = set()
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+        if index_dir and os.path.isdir(index_dir):
+            self._partition_ids.update(name[:-5] for name in os.listdir(index_dir) if name.endswith(".json"))
+
+    def partition_ids(self) -> List[str]:
+        """Return the IDs of every partition holding chunks."""
+        with self._lock:
+            return sorted(self._partition_ids)
+
+    def partition(self, video_id: str) -> BM25Index:
+        """Open the partition of a video, creating it if needed."""
+        with self._lock:
+            if video_id not in self._partitions:
+                path = os.path.join(self.index_dir, f"{video_id}.json") if self.index_dir else None
+                self._partitions[video_id] = BM25Index(path)
+            return self._partitions[video_id]
+
+    def add(self, video_id: str, ids: List[str], texts: List[str], metadatas: List[dict]) -> None:
+        """Index chunks of a video; call ``persist`` to save them."""
+        partition = self.partition(video_id)
+        partition.add(ids, texts, metadatas)
+        with self._lock:
+            if len(partition):
+                self._partition_ids.add(video_id)
+            self._dirty.add(video_id)
+
+    def delete(self, video_id: str, ids: List[str]) -> None:
+        """Remove chunks of a video; call ``persist`` to save the change."""
+        partition = self.partition(video_id)
+        partition.delete(ids)
+        with self._lock:
+            if not len(partition):
+                self._partition_ids.discard(video_id)
+            self._dirty.add(video_id)
+
+    def persist(self) -> None:
+        """Persist every partition changed since the last call."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        for video_id in dirty:
+            self._partitions[video_id].persist()
+
+    def search(self, query: str, k: int = 4, video_ids: Optional[List[str]] = None) -> List[Tuple[Document, float]]:
+        """Return the best chunks over the partitions of ``video_ids``, or all."""
+        known = set(self.partition_ids())
+        results = []
+        for video_id in video_ids if video_ids is not None else known:
+            if video_id in known:
+                results.extend(self.partition(video_id).search(query, k))
+        return heapq.nlargest(k, results, key=lambda result: result[1])
@@ -0,0 +1,358 @@
+"""Caches used to skip repeated work in the QA pipeline."""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import (
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    STAGE_CACHE_ENABLED,
+    STAGE_CACHE_MAX_ENTRIES,
+    STAGE_CACHE_TTLS,
+    STAGE_CACHE_DB,
+)
+from src.models.instrumentation import record
+
+# Sentinel distinguishing a cached None from a miss
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a time-to-live."""
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction.
+            ttl: Seconds an entry stays valid, or None for no expiry.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the value cached under ``key``.
+
+        Args:
+            key: Cache key.
+            default: Value returned on a miss.
+
+        Returns:
+            The cached value, or ``default`` when missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Return the live (key, value) pairs, dropping expired entries."""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, (expires, _) in self._entries.items() if expires is not None and expires <= now]:
+                del self._entries[key]
+            return [(key, value) for key, (_, value) in self._entries.items()]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class SQLiteStore:
+    """Shared on-disk key/value store backing the stage caches.
+
+    Values are stored as JSON together with a wall-clock expiry, so entries
+    survive restarts and can be shared between processes on one host.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the database at ``path``.
+
+        Args:
+            path: Location of the SQLite file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "stage TEXT, key TEXT, value TEXT, expires REAL, PRIMARY KEY (stage, key))"
+            )
+
+    def get(self, stage: str, key: str) -> Any:
+        """Return the stored value, or ``MISSING`` when absent or expired."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires FROM cache WHERE stage = ? AND key = ?", (stage, key)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return MISSING
+        return json.loads(row[0])
+
+    def put(self, stage: str, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Store a JSON-serializable value."""
+        expires = time.time() + ttl if ttl is not None else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (stage, key, value, expires) VALUES (?, ?, ?, ?)",
+                (stage, key, json.dumps(value), expires),
+            )
+
+
+class StageCache(TTLCache):
+    """Memoization cache for one pipeline stage, optionally backed by SQLite."""
+
+    def __init__(self, name: str, max_entries: int, ttl: Optional[float], store: Optional[SQLiteStore] = None):
+        """Initialize the cache.
+
+        Args:
+            name: Stage name, used as the namespace in the shared store.
+            max_entries: Maximum number of in-memory entries.
+            ttl: Seconds an entry stays valid, or None for no expiry.
+            store: Optional shared on-disk store.
+        """
+        super().__init__(max_entries, ttl)
+        self.name = name
+        self.store = store
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the value from memory, falling back to the shared store."""
+        value = super().get(key, MISSING)
+        if value is not MISSING or self.store is None:
+            return default if value is MISSING else value
+
+        value = self.store.get(self.name, json.dumps(key))
+        if value is MISSING:
+            return default
+
+        # Count the store hit as a hit rather than the memory miss
+        with self._lock:
+            self.misses -= 1
+            self.hits += 1
+        super().put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value in memory and in the shared store."""
+        super().put(key, value)
+        if self.store is not None:
+            self.store.put(self.name, json.dumps(key), value, self.ttl)
+
+
+_stage_caches: Dict[str, StageCache] = {}
+_stage_store: Optional[SQLiteStore] = None
+_stage_lock = threading.Lock()
+
+
+def get_stage_cache(name: str) -> Optional[StageCache]:
+    """Get the memoization cache of a pipeline stage.
+
+    Args:
+        name: Stage name, a key of ``STAGE_CACHE_TTLS``.
+
+    Returns:
+        The shared cache of the stage, or None when stage caching is disabled.
+    """
+    global _stage_store
+    if not STAGE_CACHE_ENABLED:
+        return None
+
+    with _stage_lock:
+        if name not in _stage_caches:
+            if STAGE_CACHE_DB and _stage_store is None:
+                _stage_store = SQLiteStore(STAGE_CACHE_DB)
+            _stage_caches[name] = StageCache(name, STAGE_CACHE_MAX_ENTRIES, STAGE_CACHE_TTLS.get(name), _stage_store)
+        return _stage_caches[name]
+
+
+def stage_cache_stats() -> Dict[str, dict]:
+    """Return hit/miss counters for every stage cache in use."""
+    return {name: cache.stats() for name, cache in _stage_caches.items()}
+
+
+def memoized(stage: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Return the cached result of a stage, computing and caching it on a miss.
+
+    Exceptions raised by ``compute`` propagate and nothing is cached.
+
+    Args:
+        stage: Stage name.
+        key: JSON-serializable cache key.
+        compute: Zero-argument callable producing a JSON-serializable value.
+
+    Returns:
+        The cached or freshly computed value.
+    """
+    cache = get_stage_cache(stage)
+    if cache is None:
+        return compute()
+
+    value = cache.get(key)
+    record(cache_hit=value is not MISSING)
+    if value is MISSING:
+        value = compute()
+        cache.put(key, value)
+    return value
+
+
+async def amemoized(stage: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Async counterpart of ``memoized`` for coroutine-producing callables."""
+    cache = get_stage_cache(stage)
+    if cache is None:
+        return await compute()
+
+    value = cache.get(key)
+    record(cache_hit=value is not MISSING)
+    if value is MISSING:
+        value = await compute()
+        cache.put(key, value)
+    return value
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for exact-match lookups.
+
+    Args:
+        question: Raw question text.
+
+    Returns:
+        Lower-cased question with collapsed whitespace and no trailing punctuation.
+    """
+    return re.sub(r"\s+", " ", question).strip().lower().rstrip("?!. ")
+
+
+class AnswerCache:
+    """Two-tier cache of final answers per question scope.
+
+    The exact tier matches normalized question text. The semantic tier
+    compares question embeddings and reuses an answer when the cosine
+    similarity clears ``similarity_threshold``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = ANSWER_CACHE_TTL,
+        similarity_threshold: float = ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    ):
+        """Initialize both tiers.
+
+        Args:
+            max_entries: Maximum number of answers in each tier.
+            ttl: Seconds an answer stays valid, or None for no expiry.
+            similarity_threshold: Minimum cosine similarity for a semantic hit.
+        """
+        self.similarity_threshold = similarity_threshold
+        self.exact = TTLCache(max_entries, ttl)
+        self.semantic = TTLCache(max_entries, ttl)
+        self.semantic_hits = 0
+
+    def get_exact(self, scope_key: str, question: str) -> Optional[str]:
+        """Look up an answer by normalized question text.
+
+        Args:
+            scope_key: Identity of the videos the question is about.
+            question: The question.
+
+        Returns:
+            The cached answer, or None.
+        """
+        return self.exact.get((scope_key, normalize_question(question)), None)
+
+    def get_similar(self, scope_key: str, embedding: List[float]) -> Optional[str]:
+        """Look up the answer of the most similar earlier question.
+
+        Args:
+            scope_key: Identity of the videos the question is about.
+            embedding: Embedding of the question.
+
+        Returns:
+            The cached answer, or None when no question is similar enough.
+        """
+        candidates = [value for key, value in self.semantic.items() if key[0] == scope_key]
+        if not candidates:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = np.stack([vector for vector, _ in candidates]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        self.semantic_hits += 1
+        return candidates[best][1]
+
+    def put(self, scope_key: str, question: str, answer: str, embedding: Optional[List[float]] = None) -> None:
+        """Cache the answer to a question in both tiers.
+
+        Args:
+            scope_key: Identity of the videos the question is about.
+            question: The question.
+            answer: Its final answer.
+            embedding: Embedding of the question, for the semantic tier.
+        """
+        key = (scope_key, normalize_question(question))
+        self.exact.put(key, answer)
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+            self.semantic.put(key, (vector, answer))
+
+    def stats(self) -> dict:
+        """Return hit/miss counters of both tiers."""
+        exact = self.exact.stats()
+        return {
+            "exact_hits": exact["hits"],
+            "semantic_hits": self.semantic_hits,
+            "misses": exact["misses"] - self.semantic_hits,
+            "size": exact["size"],
+        }
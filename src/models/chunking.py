@@ -0,0 +1,114 @@
+"""Streaming, bounded-memory splitting of long transcripts."""
+
+from typing import Iterator, List
+
+from langchain.schema.document import Document
+from langchain.text_splitter import TextSplitter
+
+from src.config import CHUNK_SIZE, TRANSCRIPT_WINDOW_CHARS
+
+
+class StreamingSplitter:
+    """Splits text that arrives piece by piece into overlapping chunks.
+
+    Only chunks ending at least ``chunk_size`` characters before the end of
+    the buffered text are emitted; the rest of the buffer, starting at the
+    first held-back chunk, is split again together with the next piece. That
+    chunk already overlaps the last emitted one, so ``CHUNK_OVERLAP`` is kept
+    across piece boundaries and memory stays bounded by the piece size.
+
+    With a single kind of separator the chunks are those of the whole text.
+    Text mixing paragraph, line and word breaks can be cut at a different
+    separator near piece boundaries than a split of the whole text would
+    pick, so chunk boundaries there may shift.
+    """
+
+    def __init__(self, source: str, splitter: TextSplitter, chunk_size: int = CHUNK_SIZE):
+        """Initialize an empty splitter.
+
+        Args:
+            source: Path recorded as the ``source`` of every chunk.
+            splitter: Splitter created with ``add_start_index=True``.
+            chunk_size: Chunk size of ``splitter``.
+        """
+        self.source = source
+        self.splitter = splitter
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.base = 0
+
+    def _split(self) -> List[Document]:
+        documents = self.splitter.create_documents([self.buffer], metadatas=[{"source": self.source}])
+        for doc in documents:
+            doc.metadata["start_index"] += self.base
+        return documents
+
+    def feed(self, text: str) -> List[Document]:
+        """Append text and return the chunks that can no longer change.
+
+        Args:
+            text: Text following everything fed so far.
+
+        Returns:
+            Documents with ``source`` and absolute ``start_index`` metadata.
+        """
+        self.buffer += text
+        if not self.buffer:
+            return []
+
+        documents = self._split()
+        settled = self.base + len(self.buffer) - self.chunk_size
+        keep = next(
+            (i for i, doc in enumerate(documents)
+             if doc.metadata["start_index"] + len(doc.page_content) > settled),
+            len(documents),
+        )
+        if keep == 0:
+            return []
+
+        if keep < len(documents):
+            cut = documents[keep].metadata["start_index"] - self.base
+            # Keep the whitespace the splitter stripped, so the piece starts as it would in the whole text
+            while cut > 0 and self.buffer[cut - 1].isspace():
+                cut -= 1
+        else:
+            last = documents[-1]
+            cut = last.metadata["start_index"] - self.base + len(last.page_content)
+        self.buffer = self.buffer[cut:]
+        self.base += cut
+        return documents[:keep]
+
+    def finish(self) -> List[Document]:
+        """Return the chunks still held back, once no more text will follow."""
+        documents = self._split() if self.buffer else []
+        self.base += len(self.buffer)
+        self.buffer = ""
+        return documents
+
+
+def iter_chunks(
+    path: str,
+    splitter: TextSplitter,
+    window_chars: int = TRANSCRIPT_WINDOW_CHARS,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Document]:
+    """Split a transcript into chunks while reading it window by window.
+
+    Windows go through a ``StreamingSplitter``, so chunks keep their
+    ``CHUNK_OVERLAP`` across window boundaries while memory stays bounded by
+    the window size.
+
+    Args:
+        path: Path of the transcription file.
+        splitter: Splitter created with ``add_start_index=True``.
+        window_chars: Number of characters read per window.
+        chunk_size: Chunk size of ``splitter``.
+
+    Yields:
+        Documents with ``source`` and absolute ``start_index`` metadata.
+    """
+    chunker = StreamingSplitter(path, splitter, chunk_size)
+    with open(path, "r", encoding="utf-8") as file:
+        for window in iter(lambda: file.read(window_chars), ""):
+            yield from chunker.feed(window)
+    yield from chunker.finish()
@@ -0,0 +1,265 @@
+"""Shared layer for calls to external services: pooled sessions, retries and circuit breakers."""
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import (
+    HTTP_MAX_CONNECTIONS,
+    SERVICE_TIMEOUTS,
+    SERVICE_MAX_RETRIES,
+    SERVICE_BACKOFF_BASE,
+    SERVICE_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+)
+from src.models.lazy import Lazy
+from src.models.ratelimit import backoff_delay, call_with_backoff, is_rate_limited
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a service after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail immediately. Once ``reset_timeout`` has passed, one probe
+    call is let through: success closes the circuit, failure reopens it.
+    Only transient errors count as failures; a call ending any other way
+    is ``release``d, which frees the probe slot and leaves the state as is.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        """Initialize a closed circuit.
+
+        Args:
+            name: Name of the service, used in messages.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds before an open circuit lets a probe through.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half-open."""
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        """Check whether a call may go through now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """End a call whose outcome says nothing about the service's health."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+                print(f"Circuit for {self.name} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(service: str) -> CircuitBreaker:
+    """Get the circuit breaker of a service, creating it on first use."""
+    with _breakers_lock:
+        if service not in _breakers:
+            _breakers[service] = CircuitBreaker(service)
+        return _breakers[service]
+
+
+def circuit_states() -> Dict[str, Dict[str, Any]]:
+    """Return the state and consecutive failures of every service's circuit."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {cb.name: {"state": cb.state, "failures": cb.failures} for cb in breakers}
+
+
+def is_transient(error: BaseException) -> bool:
+    """Check whether an error is worth retrying: a timeout, a dropped
+    connection, a rate limit or a 5xx response.
+
+    Args:
+        error: The raised exception.
+
+    Returns:
+        True for transient errors.
+    """
+    if is_rate_limited(error):
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError, requests.Timeout, requests.ConnectionError)):
+        return True
+    if type(error).__name__ in ("APITimeoutError", "APIConnectionError", "TimeoutException", "ConnectError",
+                                "ReadError", "RemoteProtocolError"):
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+def raise_for_transient_status(response):
+    """Raise for 429 and 5xx responses so the client layer retries them."""
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
+    return response
+
+
+def timeout(service: str) -> float:
+    """Return the per-request timeout of a service in seconds."""
+    return SERVICE_TIMEOUTS[service]
+
+
+def call(service: str, func: Callable[[], T], retries: Optional[int] = None) -> T:
+    """Call a service through its circuit breaker, retrying transient errors.
+
+    Args:
+        service: Service name, a key of ``SERVICE_MAX_RETRIES``.
+        func: Zero-argument callable making the request.
+        retries: Retries after the first attempt, defaulting to the
+            service's ``SERVICE_MAX_RETRIES``.
+
+    Returns:
+        The result of ``func``.
+
+    Raises:
+        CircuitOpenError: If the service's circuit is open.
+    """
+    circuit = breaker(service)
+    if not circuit.allow():
+        raise CircuitOpenError(f"Circuit for {service} is open")
+    try:
+        result = call_with_backoff(
+            func,
+            max_retries=SERVICE_MAX_RETRIES[service] if retries is None else retries,
+            base=SERVICE_BACKOFF_BASE,
+            cap=SERVICE_BACKOFF_MAX,
+            retryable=is_transient,
+        )
+    except BaseException as e:
+        _record_error(circuit, e)
+        raise
+    circuit.record_success()
+    return result
+
+
+def _record_error(circuit: CircuitBreaker, error: BaseException) -> None:
+    """Count a transient error against a circuit; release it for any other error or a cancellation.
+
+    Rate limits are retried but not counted: the service is up, only busy,
+    and opening the circuit would turn a short backoff into a long outage.
+    """
+    if isinstance(error, Exception) and is_transient(error) and not is_rate_limited(error):
+        circuit.record_failure()
+    else:
+        circuit.release()
+
+
+async def acall(service: str, func: Callable[[], Awaitable[T]], retries: Optional[int] = None) -> T:
+    """Async counterpart of ``call`` for coroutine-producing callables."""
+    circuit = breaker(service)
+    if not circuit.allow():
+        raise CircuitOpenError(f"Circuit for {service} is open")
+    max_retries = SERVICE_MAX_RETRIES[service] if retries is None else retries
+    try:
+        for attempt in range(max_retries + 1):
+            try:
+                result = await func()
+            except Exception as e:
+                if not is_transient(e) or attempt == max_retries:
+                    raise
+                delay = backoff_delay(e, attempt, SERVICE_BACKOFF_BASE, SERVICE_BACKOFF_MAX)
+                print(f"{type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+                await asyncio.sleep(delay)
+            else:
+                circuit.record_success()
+                return result
+    except BaseException as e:
+        _record_error(circuit, e)
+        raise
+
+
+def create_http_session() -> requests.Session:
+    """Create a keep-alive session pooling up to ``HTTP_MAX_CONNECTIONS`` connections per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_MAX_CONNECTIONS, pool_maxsize=HTTP_MAX_CONNECTIONS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared session of the sync query path, created on first use
+_http_session = Lazy(create_http_session)
+
+
+def get_http_session() -> requests.Session:
+    """Get the shared keep-alive HTTP session."""
+    return _http_session.get()
+
+
+def set_http_session(session) -> None:
+    """Replace the shared HTTP session, e.g. with a local stand-in."""
+    _http_session.set(session)
+
+
+# One pooled HTTP client per event loop, since connections are bound to their loop
+_http_clients = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the pooled keep-alive HTTP client of the running event loop.
+
+    Returns:
+        An ``httpx.AsyncClient`` shared by all agents on this loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS))
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the pooled HTTP client of the running event loop."""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
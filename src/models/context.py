@@ -0,0 +1,201 @@
+"""Token-budgeted assembly of the answer context from retrieved passages."""
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from langchain.schema.document import Document
+
+from src.config import (
+    BM25_K1,
+    BM25_B,
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_CHARS_PER_TOKEN,
+    CONTEXT_MIN_PASSAGE_TOKENS,
+    RERANK_RANK_WEIGHT,
+)
+from src.models.bm25 import tokenize
+
+
+@dataclass
+class Passage:
+    """A retrieved passage competing for a place in the context."""
+
+    text: str
+    origin: str  # "document" or "web"
+    rank: int  # position in its retriever's results, from 0
+    source: Optional[str] = None
+    start: Optional[int] = None
+    score: float = 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text."""
+    return math.ceil(len(text) / CONTEXT_CHARS_PER_TOKEN)
+
+
+def to_passages(documents: List[Document], origin: str) -> List[Passage]:
+    """Wrap retrieved documents as passages, keeping their transcript position."""
+    return [
+        Passage(
+            text=doc.page_content,
+            origin=origin,
+            rank=rank,
+            source=doc.metadata.get("source"),
+            start=doc.metadata.get("start_index"),
+        )
+        for rank, doc in enumerate(documents)
+    ]
+
+
+def dedupe(passages: List[Passage]) -> List[Passage]:
+    """Drop repeated passages and trim the regions chunks share with their neighbours.
+
+    Chunks of one transcript overlap by up to ``CHUNK_OVERLAP`` characters,
+    and hybrid retrieval can return the same chunk twice. Overlaps are found
+    from the chunks' source offsets; the later chunk loses the shared prefix.
+
+    Args:
+        passages: Passages in retrieval order.
+
+    Returns:
+        The passages without duplicated text, in retrieval order.
+    """
+    seen = set()
+    unique = []
+    for passage in passages:
+        key = " ".join(passage.text.split()).lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(passage)
+
+    positioned = sorted(
+        (passage for passage in unique if passage.source is not None and passage.start is not None),
+        key=lambda passage: (passage.source, passage.start),
+    )
+    covered_source, covered_end = None, -1
+    for passage in positioned:
+        if passage.source != covered_source:
+            covered_source, covered_end = passage.source, -1
+        end = passage.start + len(passage.text)
+        if passage.start < covered_end:
+            passage.text = passage.text[covered_end - passage.start:] if end > covered_end else ""
+            passage.start = min(covered_end, end)
+        covered_end = max(covered_end, end)
+
+    return [passage for passage in unique if passage.text.strip()]
+
+
+def rerank(query: str, passages: List[Passage]) -> List[Passage]:
+    """Score passages against the query and sort them best first.
+
+    The score is BM25 over the candidate pool itself, normalized to [0, 1],
+    plus ``RERANK_RANK_WEIGHT`` times the reciprocal retrieval rank, so
+    passages matching the query's exact terms move up without discarding
+    what the retrievers already know.
+
+    Args:
+        query: The search query.
+        passages: Candidate passages.
+
+    Returns:
+        The passages with ``score`` set, best first.
+    """
+    if not passages:
+        return []
+
+    tokenized = [tokenize(passage.text) for passage in passages]
+    average_length = sum(len(tokens) for tokens in tokenized) / len(tokenized) or 1.0
+    frequencies = Counter(term for tokens in tokenized for term in set(tokens))
+
+    lexical = []
+    for tokens in tokenized:
+        counts = Counter(tokens)
+        score = 0.0
+        for term in set(tokenize(query)):
+            frequency = counts.get(term, 0)
+            if not frequency:
+                continue
+            idf = math.log(1 + (len(passages) - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+            norm = 1 - BM25_B + BM25_B * len(tokens) / average_length
+            score += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+        lexical.append(score)
+
+    best = max(lexical) or 1.0
+    for passage, score in zip(passages, lexical):
+        passage.score = score / best + RERANK_RANK_WEIGHT / (1 + passage.rank)
+    return sorted(passages, key=lambda passage: passage.score, reverse=True)
+
+
+def truncate(text: str, tokens: int) -> str:
+    """Cut a text to about ``tokens`` tokens, preferring a sentence or word boundary."""
+    limit = tokens * CONTEXT_CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind(". "), cut.rfind("? "), cut.rfind("! "))
+    if boundary > limit // 2:
+        return cut[:boundary + 1]
+    return cut.rsplit(" ", 1)[0]
+
+
+def pack(passages: List[Passage], budget: int) -> List[Passage]:
+    """Greedily fill the token budget with the best passages.
+
+    A passage that does not fit whole is truncated when at least
+    ``CONTEXT_MIN_PASSAGE_TOKENS`` tokens remain.
+
+    Args:
+        passages: Passages sorted best first.
+        budget: Maximum number of tokens.
+
+    Returns:
+        The selected passages.
+    """
+    selected = []
+    remaining = budget
+    for passage in passages:
+        cost = estimate_tokens(passage.text)
+        if cost > remaining:
+            if remaining < CONTEXT_MIN_PASSAGE_TOKENS:
+                continue
+            passage.text = truncate(passage.text, remaining)
+            cost = estimate_tokens(passage.text)
+        selected.append(passage)
+        remaining -= cost
+        if remaining <= 0:
+            break
+    return selected
+
+
+def build_context(
+    query: str,
+    rag_documents: List[Document],
+    web_documents: List[Document],
+    budget: int = CONTEXT_TOKEN_BUDGET,
+) -> str:
+    """Build the answer context from transcript and web results.
+
+    Args:
+        query: The search query.
+        rag_documents: Transcript chunks, best first.
+        web_documents: Web results, best first.
+        budget: Maximum number of context tokens.
+
+    Returns:
+        The context, with transcript passages in transcript order followed
+        by web passages, in the format the answer prompts expect.
+    """
+    passages = dedupe(to_passages(rag_documents, "document") + to_passages(web_documents, "web"))
+    selected = pack(rerank(query, passages), budget)
+
+    document = sorted(
+        (passage for passage in selected if passage.origin == "document"),
+        key=lambda passage: (passage.source or "", passage.start if passage.start is not None else passage.rank),
+    )
+    web = sorted((passage for passage in selected if passage.origin == "web"), key=lambda passage: passage.rank)
+
+    rag_search = "\n".join(passage.text for passage in document)
+    web_research = "\n".join(passage.text for passage in web)
+    return f"Information from document: {rag_search}\n\nInformation from web: {web_research}"
@@ -0,0 +1,150 @@
+"""Registry of the videos in the index and the playlists they belong to."""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Scope labels accepted by ``Corpus.resolve``
+ALL_SCOPE = "all"
+VIDEO_SCOPE = "video:"
+PLAYLIST_SCOPE = "playlist:"
+
+
+def youtube_video_id(url: str) -> Optional[str]:
+    """Extract the video ID from a YouTube URL.
+
+    Args:
+        url: Watch, short or youtu.be URL.
+
+    Returns:
+        The video ID, or None when the URL does not carry one.
+    """
+    parsed = urlparse(url)
+    if parsed.hostname and parsed.hostname.endswith("youtu.be"):
+        return parsed.path.strip("/") or None
+    if "v" in parse_qs(parsed.query):
+        return parse_qs(parsed.query)["v"][0]
+    match = re.match(r"^/(?:shorts|embed|live)/([^/?]+)", parsed.path)
+    return match.group(1) if match else None
+
+
+def video_id_for_path(path: str) -> str:
+    """Derive a stable video ID from the location of a transcription.
+
+    Args:
+        path: Path of the transcription file.
+
+    Returns:
+        The file stem followed by a short hash of its absolute path.
+    """
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "-", os.path.splitext(os.path.basename(path))[0]).strip("-")
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return f"{stem or 'video'}-{digest}"
+
+
+class Corpus:
+    """JSON record of every indexed video, its transcript and its playlists.
+
+    Scopes are strings: ``"video:<id>"``, ``"playlist:<name>"`` or ``"all"``.
+    """
+
+    def __init__(self, path: str):
+        """Load the registry from ``path`` if it exists.
+
+        Args:
+            path: Location of the registry file.
+        """
+        self.path = path
+        self.videos: Dict[str, dict] = {}
+        self.revision = ""
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.videos = data["videos"]
+            self.revision = data["revision"]
+
+    def __len__(self) -> int:
+        return len(self.videos)
+
+    def add(
+        self,
+        video_id: str,
+        source: str,
+        transcript_id: str,
+        playlists: Optional[List[str]] = None,
+        chunking: Optional[str] = None,
+    ) -> None:
+        """Register (or update) a video.
+
+        Args:
+            video_id: ID of the video, also its index partition.
+            source: Path of its transcription.
+            transcript_id: Hash of the transcription contents.
+            playlists: Playlists the video belongs to, merged with earlier ones.
+            chunking: Identity of the splitter settings the video was chunked with.
+        """
+        entry = self.videos.get(video_id, {"playlists": []})
+        merged = sorted(set(entry["playlists"]) | set(playlists or []))
+        self.videos[video_id] = {
+            "source": os.path.abspath(source),
+            "transcript_id": transcript_id,
+            "playlists": merged,
+            "chunking": chunking,
+        }
+        key = f"{self.revision}:{video_id}:{transcript_id}:{','.join(merged)}"
+        self.revision = hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def save(self) -> None:
+        """Write the registry to disk."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"videos": self.videos, "revision": self.revision}, file)
+        os.replace(tmp_path, self.path)
+
+    def playlist(self, name: str) -> List[str]:
+        """Return the IDs of the videos in a playlist."""
+        return [video_id for video_id, entry in self.videos.items() if name in entry["playlists"]]
+
+    def resolve(self, scope: str) -> Optional[List[str]]:
+        """Turn a scope into the video IDs retrieval is restricted to.
+
+        Args:
+            scope: ``"video:<id>"``, ``"playlist:<name>"`` or ``"all"``.
+
+        Returns:
+            The video IDs, or None to search the whole corpus.
+
+        Raises:
+            ValueError: If the scope is malformed or names nothing indexed.
+        """
+        if scope == ALL_SCOPE:
+            return None
+        if scope.startswith(VIDEO_SCOPE):
+            video_id = scope[len(VIDEO_SCOPE):]
+            if video_id not in self.videos:
+                raise ValueError(f"Video {video_id!r} has not been indexed.")
+            return [video_id]
+        if scope.startswith(PLAYLIST_SCOPE):
+            video_ids = self.playlist(scope[len(PLAYLIST_SCOPE):])
+            if not video_ids:
+                raise ValueError(f"Playlist {scope[len(PLAYLIST_SCOPE):]!r} has no indexed videos.")
+            return video_ids
+        raise ValueError(f"Unknown scope {scope!r}; use 'video:<id>', 'playlist:<name>' or 'all'.")
+
+    def scope_key(self, scope: str) -> str:
+        """Identify the contents of a scope, e.g. for answer caching.
+
+        Args:
+            scope: A scope accepted by ``resolve``.
+
+        Returns:
+            Key that changes whenever a transcript in the scope changes.
+        """
+        if scope.startswith(VIDEO_SCOPE):
+            video_id = scope[len(VIDEO_SCOPE):]
+            return f"{scope}@{self.videos[video_id]['transcript_id']}"
+        return f"{scope}@{self.revision}"
@@ -0,0 +1,329 @@
+"""Summary tree and FAQ of each video, precomputed once the video is indexed."""
+
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.prompts import PromptTemplate
+from langchain.schema.document import Document
+from langchain.schema.embeddings import Embeddings
+from langchain.schema.output_parser import StrOutputParser
+
+from src.config import (
+    DIGEST_FANOUT,
+    DIGEST_FAQ_QUESTIONS,
+    DIGEST_FAQ_SIMILARITY_THRESHOLD,
+    DIGEST_SUMMARY_NODES,
+    DIGEST_CONCURRENCY,
+)
+from src.models import clients
+from src.models.corpus import Corpus
+from src.models.llm import get_llm
+
+SUMMARY_PROMPT = PromptTemplate(
+    template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You summarize parts of a video transcript.
+        Write a summary of at most five sentences covering every topic in the text, in the order they appear.
+        Only respond with the summary <|eot_id|><|start_header_id|>user<|end_header_id|>
+        Text: {text}
+        Summary: <|eot_id|><|start_header_id|>assistant<|end_header_id|>""",
+    input_variables=["text"],
+)
+
+FAQ_PROMPT = PromptTemplate(
+    template="""<|begin_of_text|><|start_header_id|>system<|end_header_id|> You prepare a FAQ for a video from its summary.
+        Write the {count} questions a viewer is most likely to ask about the video, starting with what its main topic is.
+        Answer each one from the summary in at most three sentences. Write every pair as two lines:
+        Q: <question>
+        A: <answer> <|eot_id|><|start_header_id|>user<|end_header_id|>
+        Summary: {summary}
+        FAQ: <|eot_id|><|start_header_id|>assistant<|end_header_id|>""",
+    input_variables=["count", "summary"],
+)
+
+# Overview questions are answered from the summary tree rather than a few chunks. A keyword
+# followed by a topic ("summary of backprop", "summarize dropout") asks about that topic, so it
+# only counts when the topic is the video itself.
+SUMMARY_NOUNS = (
+    "summary", "summaries", "overview", "gist", "tl;dr", "tldr",
+    "main point", "main points", "key point", "key points", "main idea", "main ideas", "key ideas",
+    "main topic", "main topics", "key topics", "main takeaways", "key takeaways", "main themes",
+)
+SUMMARY_VERBS = ("summarize", "summarise", "recap")
+_VIDEO_WORDS = {"video", "videos", "lecture", "talk", "lesson"}
+_REFERENCES = {"it", "this", "that", "these", "those", "the"}
+_PREPOSITIONS = {"of", "about", "on", "in", "for", "regarding", "behind"}
+_VERB_OBJECTS = {"it", "this", "that", "everything", "all", "briefly", "please", "in", "for", "me"}
+
+
+def _refers_to_video(words: List[str]) -> bool:
+    """Check whether words like "of this video" or "it" name the video rather than a topic."""
+    if words[:1] and words[0] in _PREPOSITIONS:
+        words = words[1:]
+    while words[:1] and words[0] in _REFERENCES:
+        words = words[1:]
+    return not words or words[0] in _VIDEO_WORDS
+
+
+def is_summary_question(question: str) -> bool:
+    """Check whether a question asks about a video as a whole."""
+    words = re.findall(r"[\w;']+", question.lower())
+    if words[-1:] == ["about"] and _VIDEO_WORDS & set(words):
+        return True  # "what is this video about"
+    for keyword in SUMMARY_NOUNS + SUMMARY_VERBS:
+        size = len(keyword.split())
+        for i in range(len(words) - size + 1):
+            if words[i:i + size] != keyword.split():
+                continue
+            rest = words[i + size:]
+            if _refers_to_video(rest):
+                return True
+            if keyword in SUMMARY_VERBS and rest[0] in _VERB_OBJECTS:
+                return True
+            if keyword in SUMMARY_NOUNS and rest[0] not in _PREPOSITIONS:
+                return True
+    return False
+
+
+def parse_faq(text: str) -> List[Tuple[str, str]]:
+    """Parse ``Q: ...`` / ``A: ...`` lines into (question, answer) pairs."""
+    pairs = []
+    question = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line[:2].upper() == "Q:":
+            question = line[2:].strip()
+        elif line[:2].upper() == "A:" and question:
+            pairs.append((question, line[2:].strip()))
+            question = None
+    return pairs
+
+
+@dataclass
+class Digest:
+    """Precomputed summaries and answers of one video."""
+
+    video_id: str
+    transcript_id: str  # hash of the transcription the digest was built from
+    levels: List[List[str]]  # summaries of each tree level, from the chunks up; the last holds the root
+    faq: List[Dict[str, Any]]  # {"question", "answer", "embedding"}
+
+    def summary_documents(self, count: int = DIGEST_SUMMARY_NODES) -> List[Document]:
+        """Return the root summary and the most detailed level that fits with it in ``count`` nodes.
+
+        Args:
+            count: Maximum number of summaries.
+
+        Returns:
+            Summaries as documents, root first.
+        """
+        root = self.levels[-1]
+        detail = []
+        for level in self.levels[:-1]:
+            if len(root) + len(level) <= count:
+                detail = level
+                break
+        return [
+            Document(page_content=text, metadata={"video_id": self.video_id, "source": f"summary:{self.video_id}"})
+            for text in (root + detail)[:count]
+        ]
+
+    def match(self, embedding: List[float], threshold: float = DIGEST_FAQ_SIMILARITY_THRESHOLD) -> Optional[str]:
+        """Find the FAQ answer whose question is most similar to a query.
+
+        Args:
+            embedding: Embedding of the query.
+            threshold: Minimum cosine similarity of a match.
+
+        Returns:
+            The answer, or None if no question is similar enough.
+        """
+        if not self.faq:
+            return None
+        questions = np.asarray([entry["embedding"] for entry in self.faq], dtype=np.float32)
+        query = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(questions, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = questions @ query / np.where(norms == 0, 1.0, norms)
+        best = int(np.argmax(scores))
+        return self.faq[best]["answer"] if scores[best] >= threshold else None
+
+
+def _summarize(chain, groups: List[Dict[str, str]], concurrency: int) -> List[str]:
+    """Summarize groups in one batch, retrying only the groups whose call failed.
+
+    Args:
+        chain: Summarization chain.
+        groups: Inputs of the chain.
+        concurrency: Calls in flight at once.
+
+    Returns:
+        The summaries, in the order of ``groups``.
+    """
+    summaries: Dict[int, str] = {}
+
+    def attempt() -> List[str]:
+        pending = [i for i in range(len(groups)) if i not in summaries]
+        results = chain.batch(
+            [groups[i] for i in pending], config={"max_concurrency": concurrency}, return_exceptions=True
+        )
+        errors = []
+        for i, result in zip(pending, results):
+            if isinstance(result, Exception):
+                errors.append(result)
+            else:
+                summaries[i] = result
+        if errors:
+            # A permanent error fails the batch at once; transient ones are retried by the client layer
+            raise next((error for error in errors if not clients.is_transient(error)), errors[0])
+        return [summaries[i] for i in range(len(groups))]
+
+    return clients.call("groq", attempt)
+
+
+def build_digest(
+    video_id: str,
+    transcript_id: str,
+    texts: List[str],
+    embeddings: Embeddings,
+    fanout: int = DIGEST_FANOUT,
+    faq_questions: int = DIGEST_FAQ_QUESTIONS,
+    concurrency: int = DIGEST_CONCURRENCY,
+) -> Digest:
+    """Summarize a video's chunks into a tree and answer its likely questions.
+
+    Every ``fanout`` consecutive chunks are summarized together, then every
+    ``fanout`` summaries, until a single root summary is left. The FAQ is
+    generated from the top of the tree and its questions are embedded for
+    matching.
+
+    Args:
+        video_id: ID of the video.
+        transcript_id: Hash of its transcription.
+        texts: Chunks of the transcription, in order.
+        embeddings: Embedding model of the FAQ questions.
+        fanout: Children per summary.
+        faq_questions: Number of questions to answer.
+        concurrency: Summarization calls in flight at once.
+
+    Returns:
+        The digest.
+    """
+    chain = SUMMARY_PROMPT | get_llm() | StrOutputParser()
+    level, levels = texts, []
+    while len(level) > 1 or not levels:
+        groups = [{"text": "\n\n".join(level[i:i + fanout])} for i in range(0, len(level), fanout)]
+        level = _summarize(chain, groups, concurrency)
+        levels.append([summary.strip() for summary in level])
+        print(f"Summarized {video_id}: {len(level)} nodes at level {len(levels)}")
+
+    digest = Digest(video_id=video_id, transcript_id=transcript_id, levels=levels, faq=[])
+    summary = "\n\n".join(doc.page_content for doc in digest.summary_documents())
+    faq_chain = FAQ_PROMPT | get_llm() | StrOutputParser()
+    pairs = parse_faq(clients.call("groq", lambda: faq_chain.invoke({"count": faq_questions, "summary": summary})))
+    pairs = pairs[:faq_questions]
+    if pairs:
+        vectors = embeddings.embed_documents([question for question, _ in pairs])
+        digest.faq = [
+            {"question": question, "answer": answer, "embedding": [float(value) for value in vector]}
+            for (question, answer), vector in zip(pairs, vectors)
+        ]
+    return digest
+
+
+class DigestStore:
+    """Digests persisted as ``<directory>/<video_id>.json``, next to the index.
+
+    A digest is only served while the video's registered transcription
+    still has the hash it was built from.
+    """
+
+    def __init__(self, directory: str, corpus: Corpus):
+        """Initialize the store.
+
+        Args:
+            directory: Directory of the digest files.
+            corpus: Registry of indexed videos, used to detect stale digests.
+        """
+        self.directory = directory
+        self.corpus = corpus
+        self.hits = 0
+        self.misses = 0
+        self._digests: Dict[str, Optional[Digest]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{video_id}.json")
+
+    def get(self, video_id: str) -> Optional[Digest]:
+        """Return the digest of a video, or None if missing or stale."""
+        with self._lock:
+            if video_id not in self._digests:
+                digest = None
+                if os.path.exists(self._path(video_id)):
+                    with open(self._path(video_id), "r", encoding="utf-8") as file:
+                        digest = Digest(**json.load(file))
+                self._digests[video_id] = digest
+            digest = self._digests[video_id]
+
+        entry = self.corpus.videos.get(video_id)
+        if digest is None or entry is None or entry["transcript_id"] != digest.transcript_id:
+            return None
+        return digest
+
+    def save(self, digest: Digest) -> None:
+        """Persist a digest, replacing any earlier one of the video."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(digest.video_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(asdict(digest), file)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._digests[digest.video_id] = digest
+
+    def answer(self, video_id: str, embedding: List[float]) -> Optional[str]:
+        """Serve a question about one video from its FAQ.
+
+        Args:
+            video_id: ID of the video.
+            embedding: Embedding of the question.
+
+        Returns:
+            The precomputed answer, or None.
+        """
+        digest = self.get(video_id)
+        answer = digest.match(embedding) if digest is not None else None
+        with self._lock:
+            if answer is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return answer
+
+    def summaries(self, video_ids: Optional[List[str]], count: int = DIGEST_SUMMARY_NODES) -> List[Document]:
+        """Return summary-tree nodes covering the given videos.
+
+        One video contributes its root and a detailed level; several
+        videos contribute their root summaries.
+
+        Args:
+            video_ids: Videos to summarize, or None for the whole corpus.
+            count: Maximum number of summaries.
+
+        Returns:
+            The summaries, or an empty list if any video has no current digest.
+        """
+        digests = [self.get(video_id) for video_id in (self.corpus.videos if video_ids is None else video_ids)]
+        if not digests or any(digest is None for digest in digests):
+            return []
+        if len(digests) == 1:
+            return digests[0].summary_documents(count)
+        return [doc for digest in digests for doc in digest.summary_documents(1)][:count]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters of FAQ lookups."""
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,246 @@
+"""Persistent, content-addressed cache for chunk embeddings."""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+
+from src.config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSION,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_QUERY_CACHE_ENTRIES,
+)
+from src.models.cache import MISSING, TTLCache
+from src.models.instrumentation import tracer
+
+VECTORS_FILE = "embeddings.bin"
+INDEX_FILE = "index.json"
+
+
+def embedding_key(text: str, model_name: str = EMBEDDING_MODEL) -> str:
+    """Build the cache key for a text embedded with a given model.
+
+    Args:
+        text: The embedded text.
+        model_name: Name of the embedding model.
+
+    Returns:
+        Hex digest identifying the (model, text) pair.
+    """
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Fixed-capacity on-disk embedding store with LRU eviction.
+
+    Vectors live in a memory-mapped array file with one row per slot; a JSON
+    index maps cache keys to slots and records their least-recently-used order.
+    Writes only mark the cache dirty and ``flush`` persists them once per
+    ingest. Lookups reorder the LRU in memory; that order reaches the disk
+    with the next write or eviction, or with ``flush(recency=True)``, which
+    also runs at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = EMBEDDING_CACHE_DIR,
+        model_name: str = EMBEDDING_MODEL,
+        dimension: int = EMBEDDING_DIMENSION,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        dtype: str = EMBEDDING_CACHE_DTYPE,
+    ):
+        """Open (or create) the cache in ``cache_dir``.
+
+        Args:
+            cache_dir: Directory holding the array file and its index.
+            model_name: Embedding model the cached vectors belong to.
+            dimension: Dimension of the embedding vectors.
+            max_entries: Maximum number of cached vectors.
+            dtype: Storage dtype, "float16" or "float32".
+        """
+        self.cache_dir = cache_dir
+        self.model_name = model_name
+        self.dimension = dimension
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._reordered = False
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._load_index()
+
+        vectors_path = os.path.join(cache_dir, VECTORS_FILE)
+        mode = "r+" if self._slots and os.path.exists(vectors_path) else "w+"
+        if mode == "w+":
+            self._slots.clear()
+        self._vectors = np.memmap(vectors_path, dtype=self.dtype, mode=mode, shape=(max_entries, dimension))
+        atexit.register(self.flush, recency=True)
+
+    def _load_index(self) -> None:
+        """Read the slot index, discarding it if the layout has changed."""
+        index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+
+        with open(index_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        layout = (data.get("dimension"), data.get("dtype"), data.get("max_entries"))
+        if layout != (self.dimension, self.dtype.name, self.max_entries):
+            print("Embedding cache layout changed, starting with an empty cache")
+            return
+
+        self._slots = OrderedDict((key, slot) for key, slot in data["slots"])
+
+    def flush(self, recency: bool = False) -> None:
+        """Persist the vectors and the slot index, if anything changed since the last flush.
+
+        Args:
+            recency: Also persist an LRU order that only lookups have changed.
+        """
+        with self._lock:
+            if not (self._dirty or (recency and self._reordered)):
+                return
+            self._dirty = False
+            self._reordered = False
+            self._vectors.flush()
+            index_path = os.path.join(self.cache_dir, INDEX_FILE)
+            tmp_path = f"{index_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "dimension": self.dimension,
+                        "dtype": self.dtype.name,
+                        "max_entries": self.max_entries,
+                        "slots": list(self._slots.items()),
+                    },
+                    file,
+                )
+            os.replace(tmp_path, index_path)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up the cached embeddings of several texts.
+
+        Args:
+            texts: Texts to look up.
+
+        Returns:
+            One embedding per text, or None where the text is not cached.
+        """
+        results = []
+        with self._lock:
+            for text in texts:
+                key = embedding_key(text, self.model_name)
+                slot = self._slots.get(key)
+                if slot is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self.hits += 1
+                self._slots.move_to_end(key)
+                self._reordered = True
+                results.append(self._vectors[slot].astype(np.float32).tolist())
+        return results
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """Store embeddings, evicting the least recently used entries when full.
+
+        The entries are persisted by the next ``flush``.
+
+        Args:
+            texts: Texts the embeddings were computed from.
+            embeddings: One embedding per text.
+        """
+        with self._lock:
+            for text, embedding in zip(texts, embeddings):
+                key = embedding_key(text, self.model_name)
+                slot = self._slots.get(key)
+                if slot is None:
+                    if len(self._slots) < self.max_entries:
+                        slot = len(self._slots)
+                    else:
+                        _, slot = self._slots.popitem(last=False)
+                self._slots[key] = slot
+                self._slots.move_to_end(key)
+                self._vectors[slot] = np.asarray(embedding, dtype=self.dtype)
+                self._dirty = True
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends uncached texts to the underlying model.
+
+    Documents go through the persistent chunk cache. Questions use a small
+    in-memory LRU instead, so they never evict chunk vectors.
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache, query_entries: int = EMBEDDING_QUERY_CACHE_ENTRIES):
+        """Wrap an embedding model with a cache.
+
+        Args:
+            underlying: Embedding model used on cache misses.
+            cache: Cache to read from and write to.
+            query_entries: Question embeddings kept in memory.
+        """
+        self.underlying = underlying
+        self.cache = cache
+        self.queries = TTLCache(query_entries)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, reusing cached vectors where possible.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            One embedding per text.
+        """
+        with tracer.span("embedding.embed_documents", texts=len(texts)) as span:
+            embeddings = self.cache.get_many(texts)
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            span["cache_hits"] = len(texts) - len(missing)
+
+            if missing:
+                # Embed each distinct missing text once
+                unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+                computed = dict(zip(unique_texts, self.underlying.embed_documents(unique_texts)))
+                self.cache.put_many(unique_texts, [computed[text] for text in unique_texts])
+                for i in missing:
+                    embeddings[i] = computed[texts[i]]
+
+        return embeddings
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several questions in one call, reusing recently embedded ones.
+
+        Args:
+            texts: Questions to embed.
+
+        Returns:
+            One embedding per question.
+        """
+        embeddings = [self.queries.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is MISSING))
+        if missing:
+            for text, embedding in zip(missing, self.underlying.embed_documents(missing)):
+                self.queries.put(text, embedding)
+        return [self.queries.get(text) if embedding is MISSING else embedding for text, embedding in zip(texts, embeddings)]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing a recently embedded one."""
+        return self.embed_queries([text])[0]
@@ -0,0 +1,131 @@
+"""Batched, multi-process embedding of transcript chunks."""
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langchain.schema.embeddings import Embeddings
+from langchain_community.embeddings.gpt4all import GPT4AllEmbeddings
+
+from src.config import EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE, EMBEDDING_WORKERS
+from src.models.embedding_cache import EmbeddingCache
+from src.models.instrumentation import tracer
+
+GPT4ALL_KWARGS = {'allow_download': 'True'}
+
+# Embedding model of the current worker process, loaded once by _init_worker
+_worker_embeddings = None
+
+
+def _init_worker(model_name: str, gpt4all_kwargs: dict) -> None:
+    """Load the embedding model once in a pool worker."""
+    global _worker_embeddings
+    _worker_embeddings = GPT4AllEmbeddings(model_name=model_name, gpt4all_kwargs=gpt4all_kwargs)
+
+
+def _embed_batch(texts: List[str]) -> List[List[float]]:
+    """Embed one batch with the worker's model."""
+    return _worker_embeddings.embed_documents(texts)
+
+
+class EmbeddingEngine:
+    """Embeds texts in batches, fanning them out over a process pool.
+
+    Batches are yielded as soon as they finish so callers can upsert them
+    while later batches are still being embedded. Cached vectors are served
+    without reaching the model.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        workers: int = EMBEDDING_WORKERS,
+    ):
+        """Initialize the engine.
+
+        Args:
+            embeddings: In-process model, used when ``workers`` is 1 or less.
+            cache: Optional cache consulted before and filled after embedding.
+            batch_size: Number of texts per batch.
+            workers: Number of worker processes, each with its own model.
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.workers = workers
+        self._executor = None
+
+    def _submit(self, texts: List[str]) -> Future:
+        """Schedule a batch on the pool, or embed it in-process."""
+        if self.workers <= 1:
+            future = Future()
+            future.set_result(self.embeddings.embed_documents(texts))
+            return future
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(EMBEDDING_MODEL, GPT4ALL_KWARGS),
+            )
+        return self._executor.submit(_embed_batch, texts)
+
+    def _collect(self, future: Future, start: int, vectors: list, missing: List[int], batch: List[str], submitted: float):
+        """Merge a finished batch into its cached vectors."""
+        computed = future.result()
+        tracer.add(
+            "embedding.batch",
+            (time.perf_counter() - submitted) * 1000,
+            texts=len(batch),
+            cache_hits=len(batch) - len(missing),
+        )
+        if self.cache is not None:
+            self.cache.put_many([batch[i] for i in missing], computed)
+        for position, vector in zip(missing, computed):
+            vectors[position] = vector
+        return start, vectors
+
+    def embed(self, texts: List[str]) -> Iterator[Tuple[int, List[List[float]]]]:
+        """Embed texts batch by batch.
+
+        Args:
+            texts: Texts to embed.
+
+        Yields:
+            (start, vectors) pairs, where ``vectors`` embeds
+            ``texts[start:start + len(vectors)]``. Batches arrive in
+            completion order, not input order.
+        """
+        max_in_flight = max(2, self.workers * 2)
+        in_flight: Dict[Future, tuple] = {}
+
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            vectors = self.cache.get_many(batch) if self.cache is not None else [None] * len(batch)
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+            if not missing:
+                yield start, vectors
+                continue
+
+            submitted = time.perf_counter()
+            future = self._submit([batch[i] for i in missing])
+            in_flight[future] = (start, vectors, missing, batch, submitted)
+
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield self._collect(future, *in_flight.pop(future))
+
+        for future in as_completed(list(in_flight)):
+            yield self._collect(future, *in_flight.pop(future))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,147 @@
+"""Deterministic local stand-ins for the external services used by the pipeline."""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+from langchain.schema.document import Document
+from langchain.schema.embeddings import Embeddings
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForLLMRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+from langchain_core.retrievers import BaseRetriever
+
+from src.config import EMBEDDING_DIMENSION
+
+
+class FakeEmbeddings(Embeddings):
+    """Embeds text as a hashed bag of words, so similar texts get similar vectors."""
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION, latency_ms: float = 0.0):
+        """Initialize the embedder.
+
+        Args:
+            dimension: Dimension of the vectors.
+            latency_ms: Simulated model time per text.
+        """
+        self.dimension = dimension
+        self.latency_ms = latency_ms
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for word in text.lower().split():
+            bucket = int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16)
+            vector[bucket % self.dimension] += 1.0 if bucket & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms * len(texts) / 1000)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class FakeLLM(LLM):
+    """LLM that answers instantly (or after a fixed delay) from the prompt itself."""
+
+    latency_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        question = prompt.split("Question:")[-1].split("\n")[0].strip() if "Question:" in prompt else prompt[-80:]
+        if "JSON" in prompt:
+            return json.dumps({"improved_query": question, "answer": f"Fake answer to {question}"})
+        if "english" in prompt and "another" in prompt:
+            return "english"
+        if "improved search query" in prompt:
+            return prompt.split("related to:")[-1].split("\n")[0].strip()
+        if "prepare a FAQ" in prompt:
+            return ("Q: What is the main topic of this video?\nA: Fake overview of the video.\n"
+                    "Q: Who is this video for?\nA: Fake audience of the video.")
+        if "summarize parts of a video transcript" in prompt:
+            text = prompt.split("Text:")[-1].split("Summary:")[0]
+            return "Summary: " + " ".join(text.split()[:20])
+        return f"Fake answer to {question}"
+
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        # Emit the answer word by word, as a hosted model streams tokens
+        for token in re.findall(r"\S+\s*", self._call(prompt, stop, run_manager, **kwargs)):
+            yield GenerationChunk(text=token)
+
+
+class FakeWebRetriever(BaseRetriever):
+    """Retriever returning canned web results for any query."""
+
+    latency_ms: float = 0.0
+    k: int = 2
+
+    def _results(self, query: str) -> List[Document]:
+        return [
+            Document(page_content=f"Web result {i} about {query}", metadata={"source": f"https://example.com/{i}"})
+            for i in range(self.k)
+        ]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._results(query)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._results(query)
+
+
+class FakeTranslatorResponse:
+    """Minimal stand-in for a ``requests`` response from MyMemory."""
+
+    status_code = 200
+
+    def __init__(self, text: str):
+        self._text = text
+
+    def json(self) -> dict:
+        return {"responseStatus": 200, "responseData": {"translatedText": f"translated: {self._text}"}}
+
+
+class FakeTranslator:
+    """Replacement for the HTTP session used by the translation agent."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+
+    def get(self, url: str, **kwargs: Any) -> FakeTranslatorResponse:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return FakeTranslatorResponse(url)
@@ -1,6 +1,8 @@
 """Definition of the state used in the LangGraph workflow."""
 
-from typing import TypedDict
+from typing import List, Optional, TypedDict
+
+from langchain.schema.document import Document
 
 
 class GraphState(TypedDict):
@@ -9,6 +11,9 @@ class GraphState(TypedDict):
     # Input query
     initial_query: str
     
+    # Video IDs retrieval is restricted to (None for the whole corpus)
+    scope: Optional[List[str]]
+    
     # Language detection
     query_language: str
     
@@ -21,6 +26,9 @@ class GraphState(TypedDict):
     # Retrieved information
     Rag_search: str
     web_research: str
+    rag_documents: List[Document]
+    rag_scores: List[float]  # similarity of each RAG document to the query
+    web_documents: List[Document]
     context: str
     
     # Final answer
@@ -0,0 +1,188 @@
+"""Hybrid lexical and dense retrieval fused by reciprocal rank."""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain.schema.document import Document
+from langchain.schema.embeddings import Embeddings
+from langchain.vectorstores.base import VectorStore
+
+from src.config import RETRIEVAL_DENSE_K, RETRIEVAL_LEXICAL_K, RRF_K
+from src.models.bm25 import PartitionedBM25Index
+from src.models.instrumentation import record
+from src.models.local_index import DEFAULT_PARTITION, PartitionedLocalIndex
+
+
+def document_key(doc: Document) -> str:
+    """Identify a retrieved document by its ``chunk_id``, or its text if it has none."""
+    return doc.metadata.get("chunk_id") or doc.page_content
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int, rrf_k: int = RRF_K) -> List[Document]:
+    """Merge ranked lists, scoring each document by the sum of 1 / (rrf_k + rank).
+
+    Args:
+        rankings: Ranked document lists, best first.
+        k: Number of documents to return.
+        rrf_k: Rank offset damping the weight of the top ranks.
+
+    Returns:
+        The ``k`` best documents, identified by ``chunk_id`` (or text).
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = document_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(key, doc)
+    best = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [documents[key] for key in best]
+
+
+class HybridVectorStore(VectorStore):
+    """Vector store combining a dense store with a BM25 index.
+
+    Transcripts are indexed through ``TranscriptionVectorStore``, which
+    writes both sides itself; ``add_texts`` covers other callers by adding
+    texts to the dense store and the BM25 index together.
+    """
+
+    def __init__(
+        self,
+        dense: VectorStore,
+        lexical: PartitionedBM25Index,
+        dense_k: int = RETRIEVAL_DENSE_K,
+        lexical_k: int = RETRIEVAL_LEXICAL_K,
+        rrf_k: int = RRF_K,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            dense: Vector store searched by embedding similarity.
+            lexical: BM25 index over the same chunks.
+            dense_k: Candidates taken from the vector store.
+            lexical_k: Candidates taken from the BM25 index.
+            rrf_k: Rank offset of reciprocal-rank fusion.
+        """
+        self.dense = dense
+        self.lexical = lexical
+        self.dense_k = dense_k
+        self.lexical_k = lexical_k
+        self.rrf_k = rrf_k
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self.dense.embeddings
+
+    def similarity_search(
+        self, query: str, k: int = 4, video_ids: Optional[List[str]] = None, **kwargs: Any
+    ) -> List[Document]:
+        """Return the documents ranked best by both retrievers together.
+
+        Args:
+            query: Query text.
+            k: Number of documents to return.
+            video_ids: Videos to search, or None for all.
+
+        Returns:
+            The fused top ``k`` documents.
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, video_ids)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, video_ids: Optional[List[str]] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Return the fused top ``k`` documents with their cosine similarity to the query.
+
+        Fusion only uses ranks, so each document carries the similarity the
+        vector store gave it. Documents only BM25 found get theirs from the
+        vectors stored under their ``chunk_id`` in a ``PartitionedLocalIndex``,
+        so similarity thresholds such as adaptive routing treat both alike.
+        Other vector stores cannot be read back by ID; there, such documents
+        score 0.0 and never count as strong matches on their own.
+        """
+        embedding = self.embeddings.embed_query(query)
+        dense = self.dense.similarity_search_by_vector_with_score(
+            embedding, k=max(k, self.dense_k), video_ids=video_ids
+        )
+        lexical_docs = [doc for doc, _ in self.lexical.search(query, max(k, self.lexical_k), video_ids)]
+        record(dense_docs=len(dense), lexical_docs=len(lexical_docs))
+
+        scores = {document_key(doc): score for doc, score in dense}
+        fused = reciprocal_rank_fusion([[doc for doc, _ in dense], lexical_docs], k, self.rrf_k)
+        lexical_only = [document_key(doc) for doc in fused if document_key(doc) not in scores]
+        if lexical_only and isinstance(self.dense, PartitionedLocalIndex):
+            scores.update(self.dense.similarity_by_id(embedding, lexical_only, video_ids))
+        return [(doc, scores.get(document_key(doc), 0.0)) for doc in fused]
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Add texts to the dense store and the BM25 index.
+
+        Texts are grouped by their ``video_id`` metadata, which selects the
+        partition of both indexes.
+
+        Args:
+            texts: Texts to add.
+            metadatas: Optional metadata per text.
+            ids: Optional ID per text; generated by the dense store otherwise.
+
+        Returns:
+            The IDs of the added texts.
+        """
+        texts = list(texts)
+        metadatas = [dict(metadata) for metadata in metadatas] if metadatas else [{} for _ in texts]
+        by_video: Dict[str, List[int]] = {}
+        for position, metadata in enumerate(metadatas):
+            by_video.setdefault(metadata.get("video_id", DEFAULT_PARTITION), []).append(position)
+
+        added: List[Optional[str]] = [None] * len(texts)
+        for video_id, positions in by_video.items():
+            video_texts = [texts[i] for i in positions]
+            video_metadatas = [metadatas[i] for i in positions]
+            video_ids = [ids[i] for i in positions] if ids else None
+            if isinstance(self.dense, PartitionedLocalIndex):
+                video_ids = self.dense.add_texts(video_texts, video_metadatas, video_ids, video_id=video_id, **kwargs)
+            else:
+                video_ids = self.dense.add_texts(video_texts, video_metadatas, ids=video_ids, **kwargs)
+            for metadata, chunk_id in zip(video_metadatas, video_ids):
+                metadata.setdefault("chunk_id", chunk_id)
+            self.lexical.add(video_id, video_ids, video_texts, video_metadatas)
+            for position, chunk_id in zip(positions, video_ids):
+                added[position] = chunk_id
+        self.lexical.persist()
+        return added
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        index_dir: Optional[str] = None,
+        lexical_dir: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "HybridVectorStore":
+        """Build a hybrid store over a local index from raw texts.
+
+        Args:
+            texts: Texts to index.
+            embedding: Embedding model of the dense index.
+            metadatas: Optional metadata per text.
+            ids: Optional ID per text.
+            index_dir: Directory of the dense index, or None for memory only.
+            lexical_dir: Directory of the BM25 index, or None for memory only.
+            **kwargs: Search settings passed to the constructor.
+
+        Returns:
+            The populated store.
+        """
+        store = cls(PartitionedLocalIndex(embedding, index_dir), PartitionedBM25Index(lexical_dir), **kwargs)
+        store.add_texts(texts, metadatas, ids)
+        return store
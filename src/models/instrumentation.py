@@ -0,0 +1,203 @@
+"""Per-call latency instrumentation and tracing for the QA system."""
+
+import contextvars
+import functools
+import inspect
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import TRACING_ENABLED, TRACE_PATH, TRACE_MAX_RECORDS
+
+# Record of the span currently running in this context, if any
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the nearest-rank percentile of a list of values.
+
+    Args:
+        values: Values to summarize.
+        q: Percentile in [0, 100].
+
+    Returns:
+        The percentile, or 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """LangChain callback that adds LLM token usage to the current span."""
+
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        record(
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+        )
+
+
+class Tracer:
+    """Collects timed spans and exports them as JSON lines and percentiles.
+
+    When disabled, ``instrument`` returns functions unchanged and ``span``
+    does no timing, so tracing costs nothing in production.
+    """
+
+    def __init__(self, enabled: bool = TRACING_ENABLED, path: Optional[str] = TRACE_PATH):
+        """Initialize the tracer.
+
+        Args:
+            enabled: Whether to record spans.
+            path: Optional JSON lines file every finished span is appended to.
+        """
+        self.enabled = enabled
+        self.path = path
+        self.records = deque(maxlen=TRACE_MAX_RECORDS)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block of code.
+
+        Args:
+            name: Name of the span, e.g. "node.rag_retrieval".
+            **fields: Initial fields of the record.
+
+        Yields:
+            The record of the span; callers may add fields to it.
+        """
+        if not self.enabled:
+            yield fields
+            return
+
+        entry = {"name": name, "start": time.time(), **fields}
+        token = _current_span.set(entry)
+        started = time.perf_counter()
+        try:
+            yield entry
+        except BaseException as e:
+            entry["error"] = type(e).__name__
+            raise
+        finally:
+            entry["duration_ms"] = (time.perf_counter() - started) * 1000
+            _current_span.reset(token)
+            self._finish(entry)
+
+    def add(self, name: str, duration_ms: float, **fields: Any) -> None:
+        """Record a span timed by the caller, e.g. work done in another process.
+
+        Args:
+            name: Name of the span.
+            duration_ms: Wall time of the work in milliseconds.
+            **fields: Extra fields of the record.
+        """
+        if self.enabled:
+            self._finish({"name": name, "start": time.time() - duration_ms / 1000, "duration_ms": duration_ms, **fields})
+
+    def _finish(self, entry: Dict[str, Any]) -> None:
+        """Store a finished record and append it to the trace file."""
+        with self._lock:
+            self.records.append(entry)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(entry, default=str) + "\n")
+
+    def instrument(self, name: str, func: Callable) -> Callable:
+        """Wrap a sync or async function so each call is recorded as a span.
+
+        Args:
+            name: Name of the span.
+            func: Function to wrap.
+
+        Returns:
+            The wrapped function, or ``func`` itself when tracing is disabled.
+        """
+        if not self.enabled:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self.span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize the recorded spans per name.
+
+        Returns:
+            Count, mean and p50/p95/p99 wall time in milliseconds per span
+            name, plus totals of numeric fields such as token counts.
+        """
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for entry in self.records:
+                by_name.setdefault(entry["name"], []).append(entry)
+
+        summary = {}
+        for name, entries in sorted(by_name.items()):
+            durations = [entry["duration_ms"] for entry in entries]
+            stats = {
+                "count": len(entries),
+                "mean_ms": sum(durations) / len(durations),
+                "p50_ms": percentile(durations, 50),
+                "p95_ms": percentile(durations, 95),
+                "p99_ms": percentile(durations, 99),
+            }
+            for entry in entries:
+                for key, value in entry.items():
+                    if key in ("start", "duration_ms") or isinstance(value, bool) or not isinstance(value, (int, float)):
+                        continue
+                    stats[f"total_{key}"] = stats.get(f"total_{key}", 0) + value
+                if entry.get("cache_hit"):
+                    stats["cache_hits"] = stats.get("cache_hits", 0) + 1
+            summary[name] = stats
+        return summary
+
+    def export_jsonl(self, path: str) -> None:
+        """Write every recorded span to a JSON lines file.
+
+        Args:
+            path: Destination file.
+        """
+        with self._lock, open(path, "w", encoding="utf-8") as file:
+            for entry in self.records:
+                file.write(json.dumps(entry, default=str) + "\n")
+
+    def reset(self) -> None:
+        """Drop every recorded span."""
+        with self._lock:
+            self.records.clear()
+
+
+def record(**fields: Any) -> None:
+    """Add fields, such as counts or cache hits, to the span running in this context."""
+    entry = _current_span.get()
+    if entry is None:
+        return
+    for key, value in fields.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(entry.get(key), (int, float)):
+            entry[key] += value
+        else:
+            entry[key] = value
+
+
+# Process-wide tracer used by the workflow and the vector store
+tracer = Tracer()
@@ -0,0 +1,70 @@
+"""Local, model-free language identification for user queries."""
+
+import re
+import unicodedata
+
+# Frequent function words of English and of other Latin-script languages
+ENGLISH_WORDS = {
+    "the", "a", "an", "is", "are", "was", "were", "be", "what", "which", "who",
+    "how", "why", "when", "where", "does", "do", "did", "of", "in", "on", "to",
+    "and", "or", "this", "that", "it", "for", "with", "about", "can", "you",
+    "video", "explain", "main", "topic", "between", "difference", "mean",
+}
+OTHER_LATIN_WORDS = {
+    # French
+    "le", "la", "les", "est", "une", "des", "du", "que", "qui", "quoi", "pourquoi",
+    "comment", "dans", "sur", "avec", "pour", "cette", "vidéo",
+    # Spanish / Portuguese
+    "el", "los", "las", "es", "un", "una", "qué", "que", "por", "como", "cómo",
+    "con", "para", "del", "este", "esta", "é", "não", "uma",
+    # German
+    "der", "die", "das", "ist", "und", "nicht", "was", "wie", "warum", "mit",
+    "ein", "eine", "über",
+    # Italian
+    "il", "di", "che", "perché", "questo", "sono",
+}
+ENGLISH_BIGRAMS = ("th", "he", "wh", "ng", "sh", "ou", "ea")
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+def _latin_ratio(text: str) -> float:
+    """Return the share of letters in ``text`` that are Latin script."""
+    letters = [char for char in text if char.isalpha()]
+    if not letters:
+        return 1.0
+    latin = sum(1 for char in letters if "LATIN" in unicodedata.name(char, ""))
+    return latin / len(letters)
+
+
+def detect_language(text: str) -> str:
+    """Classify a query as English or another language.
+
+    Non-Latin scripts (Arabic, Cyrillic, CJK, ...) are decided by script
+    alone. Latin-script text is scored on function words, accented letters
+    and common English letter pairs; ambiguous input defaults to English.
+
+    Args:
+        text: Text to classify.
+
+    Returns:
+        "english" or "another", matching the labels of the LLM detector.
+    """
+    if _latin_ratio(text) < 0.5:
+        return "another"
+
+    words = [word.lower() for word in WORD_PATTERN.findall(text)]
+    if not words:
+        return "english"
+
+    english_score = sum(1 for word in words if word in ENGLISH_WORDS)
+    other_score = sum(1 for word in words if word in OTHER_LATIN_WORDS and word not in ENGLISH_WORDS)
+
+    # Accented letters are rare in English
+    other_score += sum(1 for char in text if char.isalpha() and not char.isascii())
+
+    if english_score == other_score:
+        joined = " ".join(words)
+        english_score += sum(joined.count(bigram) for bigram in ENGLISH_BIGRAMS) > len(words) // 2
+
+    return "english" if english_score >= other_score else "another"
@@ -0,0 +1,55 @@
+"""Thread-safe lazy initialization of expensive components."""
+
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """Holds a value that is built by ``factory`` the first time it is needed."""
+
+    def __init__(self, factory: Callable[[], T]):
+        """Initialize the holder without building the value.
+
+        Args:
+            factory: Zero-argument callable building the value.
+        """
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the value has been built."""
+        return self._ready
+
+    def get(self) -> T:
+        """Return the value, building it on first use.
+
+        Returns:
+            The value.
+        """
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self._value = self._factory()
+                    self._ready = True
+        return self._value
+
+    def set(self, value: T) -> None:
+        """Replace the value, e.g. with a local stand-in.
+
+        Args:
+            value: The new value.
+        """
+        with self._lock:
+            self._value = value
+            self._ready = True
+
+    def reset(self) -> None:
+        """Drop the value so the next ``get`` rebuilds it."""
+        with self._lock:
+            self._value = None
+            self._ready = False
@@ -6,11 +6,13 @@ from langchain.schema.language_model import BaseLanguageModel
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from src.config import GROQ_API_KEY, LLM_MODEL
+from src.config import GROQ_API_KEY, LLM_MODEL, SERVICE_TIMEOUTS
+from src.models.instrumentation import TokenUsageHandler, tracer
+from src.models.lazy import Lazy
 
 
-def get_llm() -> BaseLanguageModel:
-    """Get the configured LLM model.
+def create_llm() -> BaseLanguageModel:
+    """Create a new instance of the configured LLM model.
     
     Returns:
         A configured language model instance.
@@ -23,6 +25,31 @@ def get_llm() -> BaseLanguageModel:
     llm = ChatGroq(
         api_key=GROQ_API_KEY,
         model=LLM_MODEL,
+        timeout=SERVICE_TIMEOUTS["groq"],
+        max_retries=0,  # retried by src.models.clients, which also tracks the circuit
+        callbacks=[TokenUsageHandler()] if tracer.enabled else None,
     )
     
-    return llm
\ No newline at end of file
+    return llm
+
+
+# Shared client, created on first use
+_llm = Lazy(create_llm)
+
+
+def get_llm() -> BaseLanguageModel:
+    """Get the shared LLM client, creating it on first use.
+    
+    Returns:
+        A configured language model instance.
+    """
+    return _llm.get()
+
+
+def set_llm(llm: BaseLanguageModel) -> None:
+    """Replace the shared LLM client, e.g. with a local stand-in.
+    
+    Args:
+        llm: The language model to use from now on.
+    """
+    _llm.set(llm)
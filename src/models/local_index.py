@@ -0,0 +1,817 @@
+"""Local in-process vector index used as an offline alternative to Pinecone."""
+
+import heapq
+import json
+import os
+import re
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema.document import Document
+from langchain.schema.embeddings import Embeddings
+from langchain.vectorstores.base import VectorStore
+
+from src.config import (
+    EMBEDDING_DIMENSION,
+    LOCAL_INDEX_ANN,
+    LOCAL_INDEX_IVF_MIN_SIZE,
+    LOCAL_INDEX_IVF_NLIST,
+    LOCAL_INDEX_IVF_NPROBE,
+    LOCAL_INDEX_SEARCH_BLOCK,
+    LOCAL_INDEX_QUANTIZATION,
+    LOCAL_INDEX_RESCORE_FACTOR,
+)
+from src.models.locks import ReadWriteLock
+
+VECTORS_FILE = "vectors.f32"
+METADATA_FILE = "metadata.json"
+CODES_FILE = "codes-{mode}.npz"
+QUANTIZATION_MODES = ("none", "int8", "binary")
+INT8_BLOCK = 1024  # int8 rows widened to float32 at a time, few enough to stay in cache
+
+# Set bits of every byte value, for popcounts on NumPy versions without bitwise_count
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+DEFAULT_PARTITION = "default"
+
+PARTITION_PATTERN = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row of a matrix to unit length.
+
+    Args:
+        vectors: Matrix of shape (n, dimension).
+
+    Returns:
+        The row-normalized matrix as float32.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the positions of the k highest scores, best first.
+
+    Args:
+        scores: 1-D array of scores.
+        k: Number of positions to return.
+
+    Returns:
+        Array of positions sorted by descending score.
+    """
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class _IVFIndex:
+    """Inverted-file approximate index built over a snapshot of the vectors."""
+
+    def __init__(self, vectors: np.ndarray, nlist: int, iterations: int = 10):
+        """Cluster the vectors with k-means and record the inverted lists.
+
+        Args:
+            vectors: Normalized matrix to index.
+            nlist: Number of clusters.
+            iterations: Number of k-means iterations.
+        """
+        nlist = max(1, min(nlist, vectors.shape[0]))
+        rng = np.random.default_rng(0)
+        self.centroids = vectors[rng.choice(vectors.shape[0], nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = self._assign(vectors)
+            for cluster in range(nlist):
+                members = vectors[assignments == cluster]
+                if len(members):
+                    self.centroids[cluster] = members.mean(axis=0)
+            self.centroids = normalize(self.centroids)
+
+        assignments = self._assign(vectors)
+        self.lists = [np.flatnonzero(assignments == cluster) for cluster in range(nlist)]
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Assign each vector to its closest centroid."""
+        assignments = np.empty(vectors.shape[0], dtype=np.int64)
+        for start in range(0, vectors.shape[0], LOCAL_INDEX_SEARCH_BLOCK):
+            block = vectors[start:start + LOCAL_INDEX_SEARCH_BLOCK]
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Return the row positions stored in the lists closest to the query."""
+        probes = top_k(self.centroids @ query, nprobe)
+        return np.concatenate([self.lists[probe] for probe in probes])
+
+
+class _QuantizedCodes:
+    """Compact codes of the embedding rows, scanned before an exact re-score.
+
+    "int8" keeps each row as int8 with a per-row scale (4x smaller than
+    float32) and scores with integer dot products against an int8 query.
+    "binary" keeps only the sign of each component, packed 8 per byte (32x
+    smaller), and scores by the Hamming distance of the sign bits.
+    """
+
+    def __init__(self, mode: str, dimension: int):
+        """Initialize an empty set of codes.
+
+        Args:
+            mode: Either "int8" or "binary".
+            dimension: Dimension of the embedding vectors.
+        """
+        self.mode = mode
+        self.dimension = dimension
+        width = dimension if mode == "int8" else (dimension + 7) // 8
+        self.codes = np.zeros((0, width), dtype=np.int8 if mode == "int8" else np.uint8)
+        self.scales = np.zeros(0, dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the codes in bytes."""
+        return self.codes.nbytes + (self.scales.nbytes if self.mode == "int8" else 0)
+
+    def encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantize normalized vectors.
+
+        Args:
+            vectors: Matrix of shape (n, dimension).
+
+        Returns:
+            The codes and, for int8, the scale of each row.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.mode == "binary":
+            return np.packbits(vectors > 0, axis=1), np.zeros(len(vectors), dtype=np.float32)
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def reserve(self, rows: int) -> None:
+        """Grow the code arrays so they can hold ``rows`` codes."""
+        capacity = self.codes.shape[0]
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2, 1024)
+        codes = np.zeros((capacity, self.codes.shape[1]), dtype=self.codes.dtype)
+        codes[:self.codes.shape[0]] = self.codes
+        scales = np.zeros(capacity, dtype=np.float32)
+        scales[:self.scales.shape[0]] = self.scales
+        self.codes, self.scales = codes, scales
+
+    def set(self, start: int, vectors: np.ndarray) -> None:
+        """Encode vectors into the rows starting at ``start``."""
+        self.reserve(start + len(vectors))
+        codes, scales = self.encode(vectors)
+        self.codes[start:start + len(vectors)] = codes
+        self.scales[start:start + len(vectors)] = scales
+
+    def move(self, source: int, target: int) -> None:
+        """Copy the code of row ``source`` over row ``target``."""
+        self.codes[target] = self.codes[source]
+        self.scales[target] = self.scales[source]
+
+    def scores(self, query: np.ndarray, count: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Estimate the cosine similarity of the query to some rows.
+
+        Args:
+            query: Normalized query vector.
+            count: Number of live rows.
+            rows: Row positions to score, or None for the first ``count`` rows.
+
+        Returns:
+            One approximate score per row, in the order of ``rows``.
+        """
+        codes = self.codes[rows] if rows is not None else self.codes[:count]
+        scales = self.scales[rows] if rows is not None else self.scales[:count]
+        query_codes, query_scales = self.encode(query[None, :])
+
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        step = LOCAL_INDEX_SEARCH_BLOCK if self.mode == "binary" else INT8_BLOCK
+        for start in range(0, codes.shape[0], step):
+            block = codes[start:start + step]
+            if self.mode == "binary":
+                differing = np.bitwise_xor(block, query_codes[0])
+                hamming = _POPCOUNT[differing].sum(axis=1, dtype=np.int32)
+                scores[start:start + len(block)] = 1.0 - 2.0 * hamming / self.dimension
+            else:
+                # Products of int8 codes sum to at most 127 * 127 * dimension, which
+                # float32 holds exactly, so BLAS computes the integer dot product
+                dots = block.astype(np.float32) @ query_codes[0].astype(np.float32)
+                scores[start:start + len(block)] = dots * scales[start:start + len(block)] * query_scales[0]
+        return scores
+
+    def save(self, path: str, count: int) -> None:
+        """Write the first ``count`` codes to ``path``."""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, codes=self.codes[:count], scales=self.scales[:count])
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, count: int) -> bool:
+        """Read codes written by ``save``.
+
+        Returns:
+            False when the file is missing or holds a different number of rows.
+        """
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            if data["codes"].shape[0] != count:
+                return False
+            self.codes, self.scales = data["codes"], data["scales"]
+        return True
+
+
+class LocalVectorIndex(VectorStore):
+    """Vector store backed by a NumPy matrix of normalized embeddings.
+
+    The matrix is memory-mapped from ``index_dir`` when one is given, so the
+    index survives restarts without holding every vector in RAM. Search is an
+    exact top-k over batched dot products, optionally accelerated by an IVF
+    index once the collection reaches ``LOCAL_INDEX_IVF_MIN_SIZE`` vectors.
+
+    With ``quantization`` set to "int8" or "binary", the scan runs over
+    compact codes kept in memory and only the best ``k *
+    LOCAL_INDEX_RESCORE_FACTOR`` rows are read at full precision and
+    re-scored, so the memory-mapped vectors are mostly left on disk.
+
+    Searches share a read/write lock with ``add_embeddings`` and ``delete``,
+    so a video can be ingested while questions are answered.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        index_dir: Optional[str] = None,
+        dimension: int = EMBEDDING_DIMENSION,
+        ann: str = LOCAL_INDEX_ANN,
+        quantization: str = LOCAL_INDEX_QUANTIZATION,
+    ):
+        """Initialize the index, loading any vectors persisted in ``index_dir``.
+
+        Args:
+            embedding: Embedding model used for texts and queries.
+            index_dir: Directory to persist the index in, or None for memory only.
+            dimension: Dimension of the embedding vectors.
+            ann: Approximate search mode, either "none" or "ivf".
+            quantization: Code scanned before re-scoring: "none", "int8" or "binary".
+
+        Raises:
+            ValueError: If the quantization mode is unknown.
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization!r}")
+
+        self.embedding = embedding
+        self.index_dir = index_dir
+        self.dimension = dimension
+        self.ann = ann
+        self.quantization = quantization
+
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[dict] = []
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._ivf = None
+        self._codes = _QuantizedCodes(quantization, dimension) if quantization != "none" else None
+        self._lock = ReadWriteLock()
+
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+            self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The live rows of the embedding matrix."""
+        return self._vectors[:len(self.ids)]
+
+    def _load(self) -> None:
+        """Load the metadata and memory-map the vectors from ``index_dir``."""
+        metadata_path = os.path.join(self.index_dir, METADATA_FILE)
+        if not os.path.exists(metadata_path):
+            return
+
+        with open(metadata_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self.ids = data["ids"]
+        self.texts = data["texts"]
+        self.metadatas = data["metadatas"]
+
+        if self.ids:
+            self._vectors = np.memmap(
+                os.path.join(self.index_dir, VECTORS_FILE),
+                dtype=np.float32,
+                mode="r+",
+                shape=(len(self.ids), self.dimension),
+            )
+
+        # Codes missing or stale (e.g. the mode changed) are rebuilt once from the vectors
+        if self._codes is not None and not self._codes.load(self._codes_path(), len(self.ids)):
+            for start in range(0, len(self.ids), LOCAL_INDEX_SEARCH_BLOCK):
+                self._codes.set(start, self.vectors[start:start + LOCAL_INDEX_SEARCH_BLOCK])
+            self._codes.save(self._codes_path(), len(self.ids))
+
+    def _codes_path(self) -> str:
+        """Return the file the quantized codes are persisted in."""
+        return os.path.join(self.index_dir, CODES_FILE.format(mode=self.quantization))
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the embedding matrix so it can hold ``rows`` vectors."""
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+
+        capacity = max(rows, capacity * 2, 1024)
+        if self.index_dir:
+            path = os.path.join(self.index_dir, VECTORS_FILE)
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            with open(path, "ab") as file:
+                file.truncate(capacity * self.dimension * 4)
+            self._vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        else:
+            grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+            grown[:len(self.ids)] = self.vectors
+            self._vectors = grown
+
+    def persist(self) -> None:
+        """Flush the vectors and write the metadata to ``index_dir``."""
+        with self._lock.read():
+            self._persist()
+
+    def _persist(self) -> None:
+        """Persist the index; the caller holds the lock."""
+        if not self.index_dir:
+            return
+
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        if self._codes is not None:
+            self._codes.save(self._codes_path(), len(self.ids))
+
+        metadata_path = os.path.join(self.index_dir, METADATA_FILE)
+        tmp_path = f"{metadata_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"ids": self.ids, "texts": self.texts, "metadatas": self.metadatas}, file)
+        os.replace(tmp_path, metadata_path)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist: bool = True,
+    ) -> List[str]:
+        """Add pre-computed embeddings to the index.
+
+        Args:
+            texts: Texts the embeddings were computed from.
+            embeddings: One embedding per text.
+            metadatas: Optional metadata per text.
+            ids: Optional ID per text; random UUIDs otherwise.
+            persist: Whether to write the metadata to disk after adding.
+
+        Returns:
+            The IDs of the added vectors.
+        """
+        if not texts:
+            return []
+
+        # Row positions change on delete, so they cannot serve as IDs
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+        vectors = normalize(embeddings)
+
+        with self._lock.write():
+            start = len(self.ids)
+            self._reserve(start + len(texts))
+            self._vectors[start:start + len(texts)] = vectors
+            if self._codes is not None:
+                self._codes.set(start, vectors)
+
+            self.ids.extend(ids)
+            self.texts.extend(texts)
+            self.metadatas.extend(metadatas)
+            self._ivf = None
+            if persist:
+                self._persist()
+
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and add them to the index.
+
+        Args:
+            texts: Texts to add.
+            metadatas: Optional metadata per text.
+            ids: Optional ID per text.
+
+        Returns:
+            The IDs of the added vectors.
+        """
+        texts = list(texts)
+        return self.add_embeddings(texts, self.embedding.embed_documents(texts), metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete vectors by ID, filling each hole with the last row.
+
+        Args:
+            ids: IDs of the vectors to delete.
+
+        Returns:
+            True once the vectors are removed.
+        """
+        doomed = set(ids or [])
+        with self._lock.write():
+            position = 0
+            while position < len(self.ids):
+                if self.ids[position] not in doomed:
+                    position += 1
+                    continue
+                last = len(self.ids) - 1
+                if position != last:
+                    self._vectors[position] = self._vectors[last]
+                    if self._codes is not None:
+                        self._codes.move(last, position)
+                    self.ids[position] = self.ids[last]
+                    self.texts[position] = self.texts[last]
+                    self.metadatas[position] = self.metadatas[last]
+                self.ids.pop()
+                self.texts.pop()
+                self.metadatas.pop()
+
+            self._ivf = None
+            self._persist()
+        return True
+
+    def similarity_by_id(self, embedding: List[float], ids: Iterable[str]) -> Dict[str, float]:
+        """Return the cosine similarity of an embedding to stored vectors.
+
+        Args:
+            embedding: Query embedding.
+            ids: IDs of the vectors to score; IDs not in the index are skipped.
+
+        Returns:
+            The similarity of each ID found.
+        """
+        wanted = set(ids)
+        query = normalize(embedding)
+        with self._lock.read():
+            found = [(row, vector_id) for row, vector_id in enumerate(self.ids) if vector_id in wanted]
+            if not found:
+                return {}
+            scores = self._vectors[[row for row, _ in found]] @ query
+        return {vector_id: float(score) for (_, vector_id), score in zip(found, scores)}
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Return the rows to scan for a query, or None to scan everything."""
+        if self.ann != "ivf" or len(self.ids) < LOCAL_INDEX_IVF_MIN_SIZE:
+            return None
+        if self._ivf is None:
+            self._ivf = _IVFIndex(np.asarray(self.vectors), LOCAL_INDEX_IVF_NLIST)
+        return self._ivf.candidates(query, LOCAL_INDEX_IVF_NPROBE)
+
+    def search_vector(self, embedding: List[float], k: int = 4) -> List[Tuple[int, float]]:
+        """Find the rows closest to a query embedding.
+
+        Args:
+            embedding: Query embedding.
+            k: Number of results.
+
+        Returns:
+            List of (row, cosine similarity) pairs, best first.
+        """
+        with self._lock.read():
+            return self._search(embedding, k)
+
+    def _search(self, embedding: List[float], k: int) -> List[Tuple[int, float]]:
+        """Search the index; the caller holds the lock."""
+        if not self.ids:
+            return []
+
+        query = normalize(embedding)
+        rows = self._candidate_rows(query)
+
+        if self._codes is not None:
+            # Shortlist on the codes, then re-score the shortlist at full precision
+            shortlist = top_k(self._codes.scores(query, len(self.ids), rows), k * LOCAL_INDEX_RESCORE_FACTOR)
+            rows = shortlist if rows is None else rows[shortlist]
+
+        if rows is not None:
+            rows = np.sort(rows)
+            scores = np.asarray(self.vectors[rows]) @ query
+        else:
+            vectors = self.vectors
+            scores = np.empty(vectors.shape[0], dtype=np.float32)
+            for start in range(0, vectors.shape[0], LOCAL_INDEX_SEARCH_BLOCK):
+                block = vectors[start:start + LOCAL_INDEX_SEARCH_BLOCK]
+                scores[start:start + len(block)] = block @ query
+            rows = None
+
+        best = top_k(scores, k)
+        if rows is not None:
+            return [(int(rows[i]), float(scores[i])) for i in best]
+        return [(int(i), float(scores[i])) for i in best]
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents closest to an embedding with their scores."""
+        # Rows are resolved under the same lock, so a concurrent delete cannot move them
+        with self._lock.read():
+            return [
+                (Document(page_content=self.texts[row], metadata=dict(self.metadatas[row])), score)
+                for row, score in self._search(embedding, k)
+            ]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        """Return the documents closest to an embedding."""
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        """Return the documents closest to a query with their cosine similarity."""
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        """Return the documents closest to a query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        """Map cosine similarity in [-1, 1] onto a [0, 1] relevance score."""
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        index_dir: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorIndex":
+        """Build an index from raw texts.
+
+        Args:
+            texts: Texts to index.
+            embedding: Embedding model.
+            metadatas: Optional metadata per text.
+            ids: Optional ID per text.
+            index_dir: Directory to persist the index in.
+
+        Returns:
+            The populated index.
+        """
+        index = cls(embedding=embedding, index_dir=index_dir, **kwargs)
+        index.add_texts(texts, metadatas=metadatas, ids=ids)
+        return index
+
+
+class PartitionedLocalIndex(VectorStore):
+    """Set of ``LocalVectorIndex`` partitions, one per video.
+
+    Each partition lives in its own subdirectory of ``index_dir`` and is
+    opened on first use, so a query scoped to some videos only scans their
+    vectors and latency stays flat as the corpus grows. The set of non-empty
+    partitions is read from disk once and then kept up to date by adds and
+    deletes, so unscoped queries never list the directory.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        index_dir: Optional[str] = None,
+        dimension: int = EMBEDDING_DIMENSION,
+        ann: str = LOCAL_INDEX_ANN,
+        quantization: str = LOCAL_INDEX_QUANTIZATION,
+    ):
+        """Initialize the index without opening any partition.
+
+        Args:
+            embedding: Embedding model used for texts and queries.
+            index_dir: Directory holding one subdirectory per partition, or
+                None for memory only.
+            dimension: Dimension of the embedding vectors.
+            ann: Approximate search mode of each partition.
+            quantization: Code each partition scans before re-scoring.
+        """
+        self.embedding = embedding
+        self.index_dir = index_dir
+        self.dimension = dimension
+        self.ann = ann
+        self.quantization = quantization
+        self._partitions: Dict[str, LocalVectorIndex] = {}
+        self._partition_ids = set()
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+            self._partition_ids.update(
+                name for name in os.listdir(index_dir)
+                if os.path.exists(os.path.join(index_dir, name, METADATA_FILE))
+            )
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self) -> int:
+        return sum(len(self.partition(video_id)) for video_id in self.partition_ids())
+
+    def partition_ids(self) -> List[str]:
+        """Return the IDs of every partition holding vectors."""
+        with self._lock:
+            return sorted(self._partition_ids)
+
+    def partition(self, video_id: str) -> LocalVectorIndex:
+        """Open the partition of a video, creating it if needed.
+
+        Args:
+            video_id: ID of the video.
+
+        Returns:
+            The partition.
+
+        Raises:
+            ValueError: If the ID cannot be used as a directory name.
+        """
+        partition = self._partitions.get(video_id)
+        if partition is not None:
+            return partition
+
+        if not PARTITION_PATTERN.match(video_id):
+            raise ValueError(f"Invalid partition name: {video_id!r}")
+
+        with self._lock:
+            if video_id not in self._partitions:
+                self._partitions[video_id] = LocalVectorIndex(
+                    embedding=self.embedding,
+                    index_dir=os.path.join(self.index_dir, video_id) if self.index_dir else None,
+                    dimension=self.dimension,
+                    ann=self.ann,
+                    quantization=self.quantization,
+                )
+            return self._partitions[video_id]
+
+    def persist(self) -> None:
+        """Persist every partition changed since the last call."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        for video_id in dirty:
+            self._partitions[video_id].persist()
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist: bool = True,
+        video_id: str = DEFAULT_PARTITION,
+    ) -> List[str]:
+        """Add pre-computed embeddings to the partition of a video.
+
+        Args:
+            texts: Texts the embeddings were computed from.
+            embeddings: One embedding per text.
+            metadatas: Optional metadata per text.
+            ids: Optional ID per text.
+            persist: Whether to write the partition to disk after adding.
+            video_id: Partition to add to.
+
+        Returns:
+            The IDs of the added vectors.
+        """
+        added = self.partition(video_id).add_embeddings(texts, embeddings, metadatas, ids, persist=persist)
+        with self._lock:
+            if added:
+                self._partition_ids.add(video_id)
+            if not persist:
+                self._dirty.add(video_id)
+        return added
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        video_id: str = DEFAULT_PARTITION,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and add them to the partition of a video."""
+        texts = list(texts)
+        return self.add_embeddings(
+            texts, self.embedding.embed_documents(texts), metadatas, ids, video_id=video_id
+        )
+
+    def delete(self, ids: Optional[List[str]] = None, video_id: Optional[str] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete vectors by ID.
+
+        Args:
+            ids: IDs of the vectors to delete.
+            video_id: Partition holding them; every partition when None.
+
+        Returns:
+            True once the vectors are removed.
+        """
+        for partition_id in [video_id] if video_id else self.partition_ids():
+            partition = self.partition(partition_id)
+            partition.delete(ids)
+            with self._lock:
+                if not len(partition):
+                    self._partition_ids.discard(partition_id)
+        return True
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4, video_ids: Optional[List[str]] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents closest to an embedding with their scores.
+
+        Args:
+            embedding: Query embedding.
+            k: Number of results.
+            video_ids: Partitions to search; every partition when None.
+
+        Returns:
+            The best ``k`` documents over all searched partitions.
+        """
+        known = set(self.partition_ids())
+        results = []
+        for video_id in video_ids if video_ids is not None else known:
+            if video_id in known:
+                results.extend(self.partition(video_id).similarity_search_by_vector_with_score(embedding, k))
+        return heapq.nlargest(k, results, key=lambda result: result[1])
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        """Return the documents closest to an embedding."""
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_by_id(
+        self, embedding: List[float], ids: Iterable[str], video_ids: Optional[List[str]] = None
+    ) -> Dict[str, float]:
+        """Return the cosine similarity of an embedding to stored vectors.
+
+        Args:
+            embedding: Query embedding.
+            ids: IDs of the vectors to score; IDs not found are skipped.
+            video_ids: Partitions to look in; every partition when None.
+
+        Returns:
+            The similarity of each ID found.
+        """
+        wanted = set(ids)
+        known = set(self.partition_ids())
+        scores: Dict[str, float] = {}
+        for video_id in video_ids if video_ids is not None else known:
+            if video_id in known and len(scores) < len(wanted):
+                scores.update(self.partition(video_id).similarity_by_id(embedding, wanted - scores.keys()))
+        return scores
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        """Return the documents closest to a query with their cosine similarity."""
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        """Return the documents closest to a query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        """Map cosine similarity in [-1, 1] onto a [0, 1] relevance score."""
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        index_dir: Optional[str] = None,
+        video_id: str = DEFAULT_PARTITION,
+        **kwargs: Any,
+    ) -> "PartitionedLocalIndex":
+        """Build an index with one partition from raw texts."""
+        index = cls(embedding=embedding, index_dir=index_dir, **kwargs)
+        index.add_texts(texts, metadatas=metadatas, ids=ids, video_id=video_id)
+        return index
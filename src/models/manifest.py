@@ -0,0 +1,190 @@
+"""Stable chunk identifiers and the manifest of what each index holds."""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from langchain.schema.document import Document
+
+
+def content_hash(text: str) -> str:
+    """Hash the text of a chunk.
+
+    Args:
+        text: Chunk text.
+
+    Returns:
+        Hex digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """Hash the contents of a file without reading it whole.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(source: str, offset: int, text_hash: str) -> str:
+    """Build the deterministic ID of a chunk.
+
+    Args:
+        source: Path of the transcription the chunk came from.
+        offset: Character offset of the chunk within the transcription.
+        text_hash: Hash of the chunk text.
+
+    Returns:
+        ID that only changes when the source, position or content changes.
+    """
+    key = f"{os.path.abspath(source)}:{offset}:{text_hash}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def assign_chunk_ids(documents: List[Document]) -> List[Document]:
+    """Attach ``content_hash`` and ``chunk_id`` metadata to split documents.
+
+    Args:
+        documents: Documents produced by a splitter with ``add_start_index``.
+
+    Returns:
+        The same documents, annotated in place.
+    """
+    for doc in documents:
+        text_hash = content_hash(doc.page_content)
+        doc.metadata["content_hash"] = text_hash
+        doc.metadata["chunk_id"] = chunk_id(doc.metadata["source"], doc.metadata["start_index"], text_hash)
+    return documents
+
+
+def chunk_entries(documents: List[Document]) -> Dict[str, int]:
+    """Map the chunk ID of each document to its offset.
+
+    Args:
+        documents: Documents with chunk IDs assigned.
+
+    Returns:
+        Offset of every chunk, keyed by chunk ID, in document order.
+    """
+    return {doc.metadata["chunk_id"]: doc.metadata["start_index"] for doc in documents}
+
+
+@dataclass
+class IndexSummary:
+    """Counts of the work done (and avoided) by one indexing run."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    upserted_ids: List[str] = field(default_factory=list, repr=False)
+    deleted_ids: List[str] = field(default_factory=list, repr=False)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.added} added, {self.updated} updated, "
+            f"{self.unchanged} unchanged, {self.removed} removed"
+        )
+
+
+class ChunkManifest:
+    """JSON record of the chunk IDs stored in an index, grouped by source."""
+
+    def __init__(self, path: str):
+        """Load the manifest from ``path`` if it exists.
+
+        Args:
+            path: Location of the manifest file.
+        """
+        self.path = path
+        self.sources: Dict[str, Dict[str, int]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.sources = json.load(file)
+
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.sources, file)
+        os.replace(tmp_path, self.path)
+
+    def plan(self, source: str, documents: List[Document]) -> IndexSummary:
+        """Compare the chunks of a source against what is already indexed.
+
+        A new ID at an offset that previously held a different chunk counts
+        as an update; old IDs that are no longer produced are deleted.
+
+        Args:
+            source: Key of the source in the manifest.
+            documents: Current chunks of the source, with chunk IDs assigned.
+
+        Returns:
+            Summary listing the IDs to upsert and delete.
+        """
+        return self.plan_entries(source, chunk_entries(documents))
+
+    def plan_entries(self, source: str, entries: Dict[str, int]) -> IndexSummary:
+        """Like ``plan``, for chunks given as a chunk ID to offset mapping.
+
+        Args:
+            source: Key of the source in the manifest.
+            entries: Offset of every current chunk, keyed by chunk ID, in
+                document order.
+
+        Returns:
+            Summary listing the IDs to upsert and delete.
+        """
+        old = self.known(source)
+        stale_offsets = {offset for old_id, offset in old.items() if old_id not in entries}
+
+        summary = IndexSummary()
+        for new_id, offset in entries.items():
+            if new_id in old:
+                summary.unchanged += 1
+                continue
+            summary.upserted_ids.append(new_id)
+            if offset in stale_offsets:
+                summary.updated += 1
+            else:
+                summary.added += 1
+
+        summary.deleted_ids = [old_id for old_id in old if old_id not in entries]
+        summary.removed = len(summary.deleted_ids) - summary.updated
+        return summary
+
+    def known(self, source: str) -> Dict[str, int]:
+        """Return the indexed chunk IDs of a source with their offsets.
+
+        Args:
+            source: Key of the source in the manifest.
+
+        Returns:
+            Offset of every indexed chunk, keyed by chunk ID.
+        """
+        return self.sources.get(os.path.abspath(source), {})
+
+    def record(self, source: str, documents: List[Document]) -> None:
+        """Replace the manifest entry of a source with its current chunks.
+
+        Args:
+            source: Key of the source in the manifest.
+            documents: Chunks now stored in the index.
+        """
+        self.record_entries(source, chunk_entries(documents))
+
+    def record_entries(self, source: str, entries: Dict[str, int]) -> None:
+        """Like ``record``, for chunks given as a chunk ID to offset mapping."""
+        self.sources[os.path.abspath(source)] = dict(entries)
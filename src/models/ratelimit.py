@@ -0,0 +1,109 @@
+"""Backoff for rate-limited API calls shared across concurrent workers."""
+
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from src.config import RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_BACKOFF_BASE, RATE_LIMIT_BACKOFF_MAX
+
+T = TypeVar("T")
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Check whether an error is an HTTP 429 from an API client such as Groq.
+
+    Args:
+        error: The raised exception.
+
+    Returns:
+        True for rate-limit errors.
+    """
+    if type(error).__name__ == "RateLimitError":
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Return the delay requested by a ``Retry-After`` header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitGate:
+    """Pause that every worker honors once any of them is rate limited.
+
+    Backing off only the worker that hit the limit lets the others keep
+    hammering the API, so all of them wait until the shared deadline.
+    """
+
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every worker for at least ``seconds`` from now."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self) -> None:
+        """Block until the current pause, if any, is over."""
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+
+def backoff_delay(error: BaseException, attempt: int, base: float, cap: float) -> float:
+    """Return how long to wait before retry ``attempt + 1`` of a failed call.
+
+    Honors ``Retry-After``; otherwise the delay grows exponentially from
+    ``base`` up to ``cap`` with full jitter in its upper half, so callers
+    that failed together do not retry in lockstep.
+    """
+    return retry_after(error) or min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def call_with_backoff(
+    func: Callable[[], T],
+    gate: Optional[RateLimitGate] = None,
+    max_retries: int = RATE_LIMIT_MAX_RETRIES,
+    base: float = RATE_LIMIT_BACKOFF_BASE,
+    cap: float = RATE_LIMIT_BACKOFF_MAX,
+    retryable: Callable[[BaseException], bool] = is_rate_limited,
+) -> T:
+    """Call ``func``, retrying with jittered exponential backoff on rate limits.
+
+    Other errors propagate immediately.
+
+    Args:
+        func: Zero-argument callable to run.
+        gate: Optional pause shared with concurrent callers.
+        max_retries: Number of retries after the first attempt.
+        base: Delay before the first retry in seconds.
+        cap: Upper bound of a single delay in seconds.
+        retryable: Predicate selecting the errors worth retrying.
+
+    Returns:
+        The result of ``func``.
+    """
+    for attempt in range(max_retries + 1):
+        if gate is not None:
+            gate.wait()
+        try:
+            return func()
+        except Exception as e:
+            if not retryable(e) or attempt == max_retries:
+                raise
+            delay = backoff_delay(e, attempt, base, cap)
+            print(f"{type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            if gate is not None:
+                gate.pause(delay)
+            else:
+                time.sleep(delay)
@@ -0,0 +1,58 @@
+"""Offline backend: local stores and stand-ins for every external service.
+
+Used by ``python -m src.server --stub`` and the benchmarks. This module only
+imports the standard library, so ``prepare_environment`` can run before
+``src.config`` is read.
+"""
+
+import os
+
+
+def prepare_environment(workdir: str, routing: str = "parallel", digest: bool = False) -> None:
+    """Point every on-disk store at ``workdir`` and select the local backend.
+
+    Must run before any other ``src`` module is imported, since configuration
+    is read at import time. Routing and digests are pinned too, so a shell
+    environment cannot silently change what a run measures.
+
+    Args:
+        workdir: Directory of the run's stores.
+        routing: ``ROUTING_MODE`` of the workflow.
+        digest: Whether digests are precomputed at ingest.
+    """
+    os.environ.update({
+        "VECTOR_BACKEND": "local",
+        "LOCAL_INDEX_DIR": os.path.join(workdir, "index"),
+        "EMBEDDING_CACHE_DIR": os.path.join(workdir, "embedding_cache"),
+        "INDEX_MANIFEST_DIR": os.path.join(workdir, "manifests"),
+        "ARTIFACT_DIR": os.path.join(workdir, "artifacts"),
+        "EMBEDDING_WORKERS": "1",
+        "ROUTING_MODE": routing,
+        "DIGEST_ENABLED": "1" if digest else "0",
+        "GROQ_API_KEY": os.environ.get("GROQ_API_KEY") or "offline",
+        "TAVILY_API_KEY": os.environ.get("TAVILY_API_KEY") or "offline",
+    })
+    os.environ.pop("STAGE_CACHE_DB", None)
+
+
+def install_fakes(
+    embedding_latency_ms: float = 0.0,
+    llm_latency_ms: float = 0.0,
+    web_latency_ms: float = 0.0,
+    translation_latency_ms: float = 0.0,
+) -> None:
+    """Replace the embedder, LLM, web retriever and translator with local stand-ins.
+
+    Args:
+        embedding_latency_ms: Simulated embedding time per chunk.
+        llm_latency_ms: Simulated Groq latency.
+        web_latency_ms: Simulated Tavily latency.
+        translation_latency_ms: Simulated MyMemory latency.
+    """
+    from src.models import agents, clients, llm, vectorstore
+    from src.models.fakes import FakeEmbeddings, FakeLLM, FakeTranslator, FakeWebRetriever
+
+    vectorstore.GPT4AllEmbeddings = lambda **kwargs: FakeEmbeddings(latency_ms=embedding_latency_ms)
+    llm.set_llm(FakeLLM(latency_ms=llm_latency_ms))
+    agents.set_web_retriever(FakeWebRetriever(latency_ms=web_latency_ms))
+    clients.set_http_session(FakeTranslator(latency_ms=translation_latency_ms))
@@ -0,0 +1,219 @@
+"""Segmented Whisper transcription spread over a process pool."""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import (
+    USE_CUDA,
+    WHISPER_MODEL,
+    TRANSCRIPTION_WORKERS,
+    TRANSCRIPTION_SEGMENT_SECONDS,
+    TRANSCRIPTION_SILENCE_WINDOW_SECONDS,
+)
+
+SAMPLE_RATE = 16000  # Whisper resamples all audio to 16 kHz mono
+FRAME_SECONDS = 0.03  # frame length of the silence detector
+
+# Whisper model of this worker process, loaded once by the pool initializer
+_worker_model = None
+
+
+@dataclass
+class TranscriptSegment:
+    """Transcript of one slice of the audio, with absolute timestamps in seconds."""
+
+    index: int
+    start: float
+    end: float
+    lines: List[Tuple[float, str]]  # (start time, text) of each Whisper segment
+
+    def text(self) -> str:
+        """Return the segment as ``[hh:mm:ss] text`` lines."""
+        return "".join(f"[{format_timestamp(start)}] {text}\n" for start, text in self.lines)
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as ``hh:mm:ss``."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def download_audio(video_url: str, output_dir: str) -> str:
+    """Download the audio track of a YouTube video.
+
+    Args:
+        video_url: URL of the YouTube video.
+        output_dir: Directory to save the audio in.
+
+    Returns:
+        Path to the audio file.
+    """
+    from pytube import YouTube
+
+    stream = YouTube(video_url).streams.filter(only_audio=True).order_by("abr").desc().first()
+    return stream.download(output_path=output_dir, filename="audio.mp4")
+
+
+def load_audio(path: str) -> np.ndarray:
+    """Decode an audio file to 16 kHz mono float32 samples with ffmpeg."""
+    import whisper
+
+    return whisper.load_audio(path, sr=SAMPLE_RATE)
+
+
+def split_on_silence(
+    audio: np.ndarray,
+    segment_seconds: float = TRANSCRIPTION_SEGMENT_SECONDS,
+    window_seconds: float = TRANSCRIPTION_SILENCE_WINDOW_SECONDS,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Tuple[int, int]]:
+    """Cut audio into segments of about ``segment_seconds``, at the quietest moments.
+
+    Each cut is placed at the frame with the lowest energy within
+    ``window_seconds`` of the target length, so words are not split
+    between segments.
+
+    Args:
+        audio: Mono samples.
+        segment_seconds: Target segment length.
+        window_seconds: How far a cut may move from the target to find silence.
+        sample_rate: Samples per second.
+
+    Returns:
+        (start, end) sample offsets of each segment, covering the whole audio.
+    """
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    frames = len(audio) // frame
+    if frames == 0:
+        return [(0, len(audio))] if len(audio) else []
+    energy = np.sqrt(np.mean(audio[:frames * frame].reshape(frames, frame) ** 2, axis=1))
+
+    target = max(1, int(segment_seconds * sample_rate / frame))
+    window = int(window_seconds * sample_rate / frame)
+    cuts = [0]
+    while frames - cuts[-1] > target + window:
+        low = cuts[-1] + max(1, target - window)
+        high = min(frames, cuts[-1] + target + window)
+        cuts.append(low + int(np.argmin(energy[low:high])))
+
+    bounds = [cut * frame for cut in cuts] + [len(audio)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _load_worker_model(model_name: str, device: str, threads: int) -> None:
+    """Load the Whisper model once per worker process."""
+    global _worker_model
+    import torch
+    import whisper
+
+    # Share the cores between workers instead of every worker using all of them
+    torch.set_num_threads(threads)
+    _worker_model = whisper.load_model(model_name, device=device)
+
+
+def _transcribe_segment(index: int, offset: float, samples: np.ndarray, language: Optional[str]) -> TranscriptSegment:
+    """Transcribe one segment in a worker process."""
+    result = _worker_model.transcribe(samples, language=language, fp16=_worker_model.device.type == "cuda")
+    lines = [(offset + segment["start"], segment["text"].strip()) for segment in result["segments"]]
+    end = offset + len(samples) / SAMPLE_RATE
+    return TranscriptSegment(index=index, start=offset, end=end, lines=[line for line in lines if line[1]])
+
+
+def transcribe_audio(audio_path: str, model_name: str = WHISPER_MODEL, language: Optional[str] = None) -> TranscriptSegment:
+    """Transcribe a whole audio file in this process.
+
+    Args:
+        audio_path: Path to the audio file.
+        model_name: Whisper model name, e.g. "base" or "small".
+        language: Spoken language, or None to let Whisper detect it.
+
+    Returns:
+        The transcript as a single segment.
+    """
+    import whisper
+
+    device = "cuda" if USE_CUDA and _cuda_available() else "cpu"
+    model = whisper.load_model(model_name, device=device)
+    audio = load_audio(audio_path)
+    print(f"Transcribing {len(audio) / SAMPLE_RATE:.0f}s of audio")
+    result = model.transcribe(audio, language=language, fp16=device == "cuda")
+    lines = [(segment["start"], segment["text"].strip()) for segment in result["segments"]]
+    return TranscriptSegment(index=0, start=0.0, end=len(audio) / SAMPLE_RATE, lines=[line for line in lines if line[1]])
+
+
+class SegmentedTranscriber:
+    """Transcribes long audio as silence-delimited segments on a pool of worker processes.
+
+    Each worker loads its own Whisper model. Segments are yielded in order
+    as soon as they and every segment before them are done, so indexing can
+    start long before the whole audio is transcribed.
+    """
+
+    def __init__(
+        self,
+        model_name: str = WHISPER_MODEL,
+        workers: int = TRANSCRIPTION_WORKERS,
+        segment_seconds: float = TRANSCRIPTION_SEGMENT_SECONDS,
+        language: Optional[str] = None,
+    ):
+        """Initialize the transcriber.
+
+        Args:
+            model_name: Whisper model name, e.g. "base" or "small".
+            workers: Worker processes; a GPU is shared by a single worker.
+            segment_seconds: Target segment length.
+            language: Spoken language, or None to let Whisper detect it per segment.
+        """
+        self.model_name = model_name
+        self.device = "cuda" if USE_CUDA and _cuda_available() else "cpu"
+        self.workers = 1 if self.device == "cuda" else max(1, workers)
+        self.segment_seconds = segment_seconds
+        self.language = language
+
+    def transcribe(self, audio_path: str) -> Iterator[TranscriptSegment]:
+        """Transcribe an audio file segment by segment.
+
+        Args:
+            audio_path: Path to the audio file.
+
+        Yields:
+            Transcribed segments, in order.
+        """
+        audio = load_audio(audio_path)
+        segments = split_on_silence(audio, self.segment_seconds)
+        print(f"Transcribing {len(audio) / SAMPLE_RATE:.0f}s of audio in {len(segments)} segments "
+              f"on {self.workers} workers")
+
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        # Spawned rather than forked: the parent runs threads and may hold CUDA state
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_load_worker_model,
+            initargs=(self.model_name, self.device, threads),
+        ) as executor:
+            # Keep a couple of segments queued per worker, so memory stays bounded
+            pending = deque()
+            for index, (start, end) in enumerate(segments):
+                pending.append(executor.submit(
+                    _transcribe_segment, index, start / SAMPLE_RATE, audio[start:end], self.language
+                ))
+                while len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def _cuda_available() -> bool:
+    """Check for a CUDA device without failing when torch is missing."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
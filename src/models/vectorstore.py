@@ -1,9 +1,12 @@
 """Vector store operations for storing and retrieving document embeddings."""
 
 import os
+import threading
 import time
-from typing import List, Optional
-from langchain_community.vectorstores.pinecone import (Pinecone)
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from langchain_community.vectorstores.pinecone import Pinecone as PineconeVectorStore
 from langchain_community.embeddings.gpt4all import GPT4AllEmbeddings
 from langchain.schema.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -13,105 +16,630 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import (
+from src.config import (
+    VECTOR_BACKEND,
+    RETRIEVAL_MODE,
     PINECONE_API_KEY,
     PINECONE_INDEX_NAME,
     PINECONE_CLOUD,
     PINECONE_REGION,
+    LOCAL_INDEX_DIR,
+    INDEX_MANIFEST_DIR,
     EMBEDDING_MODEL,
     EMBEDDING_DIMENSION,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_WORKERS,
     CHUNK_SIZE,
     CHUNK_OVERLAP,
 )
+from src.models.bm25 import PartitionedBM25Index
+from src.models.chunking import StreamingSplitter, iter_chunks
+from src.models.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.models.embedding_engine import GPT4ALL_KWARGS, EmbeddingEngine
+from src.models.hybrid import HybridVectorStore
+from src.models.instrumentation import tracer
+from src.models.lazy import Lazy
+from src.models.corpus import Corpus, video_id_for_path
+from src.models.digest import DigestStore
+from src.models.local_index import PARTITION_PATTERN, PartitionedLocalIndex
+from src.models.manifest import ChunkManifest, IndexSummary, assign_chunk_ids, chunk_entries, file_hash
+
+# Splitter settings; chunks of a transcription indexed with others must be rebuilt
+CHUNKING = f"{CHUNK_SIZE}:{CHUNK_OVERLAP}"
+
+
+class ScopedPinecone(PineconeVectorStore):
+    """Pinecone store whose searches can be restricted to some videos.
+    
+    Every vector carries a ``video_id`` metadata field, so scoping is a
+    metadata pre-filter applied by Pinecone before the similarity search.
+    """
+    
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        *,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+        video_ids: Optional[List[str]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents closest to an embedding, within ``video_ids`` if given."""
+        if video_ids is not None:
+            filter = {**(filter or {}), "video_id": {"$in": list(video_ids)}}
+        return super().similarity_search_by_vector_with_score(embedding, k=k, filter=filter, namespace=namespace)
+    
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+        video_ids: Optional[List[str]] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents closest to a query, within ``video_ids`` if given."""
+        return self.similarity_search_by_vector_with_score(
+            self._embed_query(query), k=k, filter=filter, namespace=namespace, video_ids=video_ids
+        )
 
 
 class TranscriptionVectorStore:
     """Class for managing the vector store for transcription data."""
     
-    def __init__(self):
-        """Initialize the vector store."""
-        # Set up embeddings
-        gpt4all_kwargs = {'allow_download': 'True'}
-        self.embeddings = GPT4AllEmbeddings(
-            model_name=EMBEDDING_MODEL,
-            gpt4all_kwargs=gpt4all_kwargs
-        )
+    def __init__(
+        self,
+        backend: str = VECTOR_BACKEND,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        workers: int = EMBEDDING_WORKERS,
+    ):
+        """Initialize the vector store.
+        
+        Args:
+            backend: Vector backend to use, either "pinecone" or "local".
+            batch_size: Number of chunks embedded per batch.
+            workers: Number of embedding worker processes.
+        """
+        if backend not in ("pinecone", "local"):
+            raise ValueError(f"Unknown vector backend: {backend}")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.workers = workers
+        
+        # The embedding model and Pinecone client are expensive, so build them on first use
+        self._embedding_stack = Lazy(self._create_embedding_stack)
+        self._pinecone_client = Lazy(self._create_pinecone_client)
         
         # Set up text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=CHUNK_SIZE, 
-            chunk_overlap=CHUNK_OVERLAP
+            chunk_overlap=CHUNK_OVERLAP,
+            add_start_index=True,
         )
         
-        # Initialize Pinecone
-        self.pinecone_client = Pinecone(api_key=PINECONE_API_KEY)
-        self._initialize_index()
-        
         # Initialize vector store
         self.vector_store = None
+        self._connect_lock = threading.Lock()
+        
+        # Manifests and the corpus registry live next to the data they describe
+        self.metadata_dir = (
+            os.path.join(INDEX_MANIFEST_DIR, f"pinecone_{PINECONE_INDEX_NAME}")
+            if self.backend == "pinecone"
+            else LOCAL_INDEX_DIR
+        )
+        self.corpus = Corpus(os.path.join(self.metadata_dir, "corpus.json"))
+        self._manifests: Dict[str, ChunkManifest] = {}
+        
+        # BM25 index over the same chunks, for hybrid retrieval
+        self.lexical_index = PartitionedBM25Index(os.path.join(self.metadata_dir, "bm25"))
+        
+        # Summary trees and FAQs precomputed per video
+        self.digests = DigestStore(os.path.join(self.metadata_dir, "digests"), self.corpus)
+        self.last_index_summary = None
     
-    def _initialize_index(self) -> None:
-        """Initialize the Pinecone index."""
+    def _create_embedding_stack(self):
+        """Load the embedding model and wrap it with the cache and batch engine.
+        
+        Returns:
+            The query/document embeddings and the indexing engine.
+        """
+        # Set up embeddings
+        embeddings = GPT4AllEmbeddings(
+            model_name=EMBEDDING_MODEL,
+            gpt4all_kwargs=GPT4ALL_KWARGS
+        )
+        
+        # Reuse embeddings of previously seen chunks
+        embedding_cache = EmbeddingCache() if EMBEDDING_CACHE_ENABLED else None
+        
+        # Batch (and optionally parallelize) chunk embedding during indexing
+        engine = EmbeddingEngine(embeddings, embedding_cache, self.batch_size, self.workers)
+        if embedding_cache is not None:
+            embeddings = CachedEmbeddings(embeddings, embedding_cache)
+        
+        return embeddings, engine
+    
+    @property
+    def embeddings(self):
+        """Embedding model used for queries and documents, loaded on first use."""
+        return self._embedding_stack.get()[0]
+    
+    @property
+    def embedding_engine(self) -> EmbeddingEngine:
+        """Batch embedding engine used for indexing, loaded on first use."""
+        return self._embedding_stack.get()[1]
+    
+    def _create_pinecone_client(self) -> Pinecone:
+        """Connect to Pinecone and make sure the index exists.
+        
+        Returns:
+            The Pinecone client.
+        """
+        client = Pinecone(api_key=PINECONE_API_KEY)
+        self._initialize_index(client)
+        return client
+    
+    @property
+    def pinecone_client(self) -> Optional[Pinecone]:
+        """Pinecone client, connected on first use; None for the local backend."""
+        if self.backend != "pinecone":
+            return None
+        return self._pinecone_client.get()
+    
+    def _initialize_index(self, client: Pinecone) -> None:
+        """Initialize the Pinecone index.
+        
+        Args:
+            client: Connected Pinecone client.
+        """
         # Check if index exists
-        existing_indexes = [index_info["name"] for index_info in self.pinecone_client.list_indexes()]
+        existing_indexes = [index_info["name"] for index_info in client.list_indexes()]
         
         if PINECONE_INDEX_NAME not in existing_indexes:
             print(f"Creating Pinecone index: {PINECONE_INDEX_NAME}")
-            self.pinecone_client.create_index(
+            client.create_index(
                 name=PINECONE_INDEX_NAME,
                 dimension=EMBEDDING_DIMENSION,
                 metric="cosine",
                 spec=ServerlessSpec(cloud=PINECONE_CLOUD, region=PINECONE_REGION),
             )
             # Wait for index to be ready
-            while not self.pinecone_client.describe_index(PINECONE_INDEX_NAME).status["ready"]:
+            while not client.describe_index(PINECONE_INDEX_NAME).status["ready"]:
                 time.sleep(1)
             print(f"Pinecone index {PINECONE_INDEX_NAME} created successfully")
         else:
             print(f"Using existing Pinecone index: {PINECONE_INDEX_NAME}")
     
-    def load_transcription(self, transcription_path: str) -> List[Document]:
-        """Load and split a transcription into documents.
+    def manifest_for(self, video_id: str) -> ChunkManifest:
+        """Get the manifest of the chunks indexed for one video.
         
         Args:
-            transcription_path: Path to the transcription file.
+            video_id: ID of the video.
             
         Returns:
-            List of Document objects.
+            The video's manifest.
         """
-        # Read the transcription
-        with open(transcription_path, "r", encoding="utf-8") as file:
-            transcription_text = file.read()
+        if video_id not in self._manifests:
+            path = (
+                os.path.join(self.metadata_dir, "manifests", f"{video_id}.json")
+                if self.backend == "pinecone"
+                else os.path.join(self.metadata_dir, video_id, "manifest.json")
+            )
+            self._manifests[video_id] = ChunkManifest(path)
+        return self._manifests[video_id]
+    
+    @staticmethod
+    def resolve_video_id(transcription_path: str, video_id: Optional[str] = None) -> str:
+        """Return the video ID to index a transcription under.
         
-        # Create a document
-        doc = Document(page_content=transcription_text, metadata={"source": transcription_path})
+        Args:
+            transcription_path: Path to the transcription file.
+            video_id: Explicit video ID, derived from the path when None.
+            
+        Returns:
+            The video ID.
+            
+        Raises:
+            ValueError: If the ID cannot be used as a partition name.
+        """
+        video_id = video_id or video_id_for_path(transcription_path)
+        if not PARTITION_PATTERN.match(video_id):
+            raise ValueError(f"Invalid video ID: {video_id!r}")
+        return video_id
+    
+    def load_transcription(
+        self,
+        transcription_path: str,
+        video_id: Optional[str] = None,
+        playlists: Optional[List[str]] = None,
+    ) -> List[Document]:
+        """Load and split a transcription into documents.
         
-        # Split the document
-        documents = self.text_splitter.split_documents([doc])
+        Args:
+            transcription_path: Path to the transcription file.
+            video_id: ID of the video, derived from the path when None.
+            playlists: Playlists the video belongs to.
+            
+        Returns:
+            List of Document objects with stable ``chunk_id`` metadata.
+        """
+        documents = list(self.iter_transcription(transcription_path, video_id, playlists))
         print(f"Split transcription into {len(documents)} chunks")
         
         return documents
     
+    def iter_transcription(
+        self,
+        transcription_path: str,
+        video_id: Optional[str] = None,
+        playlists: Optional[List[str]] = None,
+    ) -> Iterator[Document]:
+        """Split a transcription into documents without reading it whole.
+        
+        Args:
+            transcription_path: Path to the transcription file.
+            video_id: ID of the video, derived from the path when None.
+            playlists: Playlists the video belongs to.
+            
+        Yields:
+            Document objects with stable ``chunk_id`` and ``video_id`` metadata.
+        """
+        video_id = self.resolve_video_id(transcription_path, video_id)
+        for doc in iter_chunks(transcription_path, self.text_splitter):
+            doc.metadata["video_id"] = video_id
+            if playlists:
+                doc.metadata["playlists"] = list(playlists)
+            yield assign_chunk_ids([doc])[0]
+    
+    def index_transcription(
+        self,
+        transcription_path: str,
+        video_id: Optional[str] = None,
+        playlists: Optional[List[str]] = None,
+    ) -> IndexSummary:
+        """Stream a transcription into the index with bounded memory.
+        
+        Chunks are split, embedded and upserted as the file is read. The IDs
+        seen along the way are compared against the manifest at the end, so
+        chunks the transcription no longer produces are still deleted.
+        
+        Args:
+            transcription_path: Path to the transcription file.
+            video_id: ID of the video, derived from the path when None.
+            playlists: Playlists the video belongs to.
+            
+        Returns:
+            Counts of added, updated, unchanged and removed chunks.
+        """
+        self.connect()
+        
+        video_id = self.resolve_video_id(transcription_path, video_id)
+        manifest = self.manifest_for(video_id)
+        known = manifest.known(transcription_path)
+        seen: Dict[str, int] = {}
+        backfill = self._needs_lexical_backfill(video_id, known)
+        
+        # A transcription indexed before and unchanged since needs no chunking at all
+        if known and not backfill and self._is_current(video_id, transcription_path):
+            self._register(video_id, transcription_path, playlists)
+            summary = IndexSummary(unchanged=len(known))
+            self.last_index_summary = summary
+            print(f"Transcription of {video_id} is already indexed in {self.backend}: {summary}")
+            return summary
+        
+        def new_chunks() -> Iterator[Document]:
+            for doc in self.iter_transcription(transcription_path, video_id, playlists):
+                seen[doc.metadata["chunk_id"]] = doc.metadata["start_index"]
+                if doc.metadata["chunk_id"] not in known:
+                    yield doc
+                elif backfill:
+                    self._add_lexical([doc])
+        
+        with tracer.span("index.sync", backend=self.backend, streaming=True) as span:
+            self._embed_and_upsert(new_chunks())
+            
+            summary = manifest.plan_entries(transcription_path, seen)
+            if summary.deleted_ids:
+                self._delete(summary.deleted_ids, video_id)
+            manifest.record_entries(transcription_path, seen)
+            manifest.save()
+            self.lexical_index.persist()
+            self._register(video_id, transcription_path, playlists)
+            
+            span.update(
+                chunks=len(seen),
+                added=summary.added,
+                updated=summary.updated,
+                unchanged=summary.unchanged,
+                removed=summary.removed,
+            )
+        
+        self.last_index_summary = summary
+        print(f"Indexed transcription in {self.backend}: {summary}")
+        
+        return summary
+    
+    def appender(
+        self,
+        transcription_path: str,
+        video_id: Optional[str] = None,
+        playlists: Optional[List[str]] = None,
+    ) -> "TranscriptAppender":
+        """Index a transcription while it is being written.
+        
+        Args:
+            transcription_path: Path the transcription is written to.
+            video_id: ID of the video, derived from the path when None.
+            playlists: Playlists the video belongs to.
+            
+        Returns:
+            An appender; pass it every piece written to the file, then close it.
+        """
+        self.connect()
+        return TranscriptAppender(self, transcription_path, self.resolve_video_id(transcription_path, video_id), playlists)
+    
+    def _needs_lexical_backfill(self, video_id: str, known: Dict[str, int]) -> bool:
+        """Check whether a video was indexed before its BM25 index existed."""
+        return bool(known) and not len(self.lexical_index.partition(video_id))
+    
+    def _add_lexical(self, documents: List[Document]) -> None:
+        """Add chunks to the BM25 index of their videos."""
+        by_video: Dict[str, List[Document]] = {}
+        for doc in documents:
+            by_video.setdefault(doc.metadata["video_id"], []).append(doc)
+        for video_id, video_docs in by_video.items():
+            self.lexical_index.add(
+                video_id,
+                [doc.metadata["chunk_id"] for doc in video_docs],
+                [doc.page_content for doc in video_docs],
+                [doc.metadata for doc in video_docs],
+            )
+    
+    def _is_current(self, video_id: str, transcription_path: str) -> bool:
+        """Check whether a video was last indexed from this file with its current contents."""
+        entry = self.corpus.videos.get(video_id)
+        return (
+            entry is not None
+            and entry["source"] == os.path.abspath(transcription_path)
+            and entry.get("chunking") == CHUNKING
+            and entry["transcript_id"] == file_hash(transcription_path)
+        )
+    
+    def _register(
+        self,
+        video_id: str,
+        transcription_path: str,
+        playlists: Optional[List[str]],
+        transcript_id: Optional[str] = None,
+    ) -> None:
+        """Record an indexed video in the corpus registry, hashing its transcription unless given."""
+        if transcript_id is None:
+            transcript_id = file_hash(transcription_path) if os.path.exists(transcription_path) else ""
+        self.corpus.add(video_id, transcription_path, transcript_id, playlists, CHUNKING)
+        self.corpus.save()
+    
     def index_documents(self, documents: List[Document]) -> VectorStore:
         """Index documents in the vector store.
         
+        Only new or changed chunks are embedded and upserted; the summary of
+        the run is kept in ``last_index_summary``.
+        
         Args:
             documents: List of Document objects to index.
             
         Returns:
             The vector store instance.
         """
-        # Create Pinecone Vector Store
-        self.vector_store = Pinecone.from_documents(
-            documents=documents,
+        self.sync_documents(documents)
+        return self.vector_store
+    
+    def sync_documents(self, documents: List[Document]) -> IndexSummary:
+        """Bring the index in line with the given chunks of each source.
+        
+        Chunks whose ``chunk_id`` is already indexed are skipped, new or
+        changed chunks are upserted, and chunks a source no longer produces
+        are deleted.
+        
+        Args:
+            documents: Chunks from ``load_transcription``.
+            
+        Returns:
+            Counts of added, updated, unchanged and removed chunks.
+        """
+        self.connect()
+        
+        by_source: Dict[str, List[Document]] = {}
+        for doc in documents:
+            by_source.setdefault(doc.metadata["source"], []).append(doc)
+        
+        with tracer.span("index.sync", backend=self.backend, chunks=len(documents)) as span:
+            total = self._sync_sources(by_source)
+            span.update(added=total.added, updated=total.updated, unchanged=total.unchanged, removed=total.removed)
+        
+        self.last_index_summary = total
+        print(f"Indexed transcription in {self.backend}: {total}")
+        
+        return total
+    
+    def _sync_sources(self, by_source: Dict[str, List[Document]]) -> IndexSummary:
+        """Upsert and delete the chunks of each source as planned by the manifest.
+        
+        Args:
+            by_source: Chunks grouped by their source path.
+            
+        Returns:
+            Summed counts over all sources.
+        """
+        total = IndexSummary()
+        for source, source_docs in by_source.items():
+            video_id = self.resolve_video_id(source, source_docs[0].metadata.get("video_id"))
+            for doc in source_docs:
+                doc.metadata["video_id"] = video_id
+            manifest = self.manifest_for(video_id)
+            summary = manifest.plan(source, source_docs)
+            
+            pending = set(summary.upserted_ids)
+            upserts = [doc for doc in source_docs if doc.metadata["chunk_id"] in pending]
+            if self._needs_lexical_backfill(video_id, manifest.known(source)):
+                self._add_lexical([doc for doc in source_docs if doc.metadata["chunk_id"] not in pending])
+            if upserts:
+                self._embed_and_upsert(upserts)
+            if summary.deleted_ids:
+                self._delete(summary.deleted_ids, video_id)
+            
+            manifest.record(source, source_docs)
+            manifest.save()
+            self.lexical_index.persist()
+            self._register(video_id, source, source_docs[0].metadata.get("playlists"))
+            total.added += summary.added
+            total.updated += summary.updated
+            total.unchanged += summary.unchanged
+            total.removed += summary.removed
+        
+        return total
+    
+    def _embed_and_upsert(self, documents: Iterable[Document]) -> None:
+        """Embed documents in batches and upsert each batch as it finishes.
+        
+        Documents are consumed in groups, so an iterator is never read ahead
+        by more than one group. Upserts run on a writer thread so they
+        overlap with the embedding of the following batches.
+        
+        Args:
+            documents: Documents to embed and store.
+        """
+        engine = self.embedding_engine
+        group_size = engine.batch_size * max(2, engine.workers * 2)
+        documents = iter(documents)
+        written = 0
+        
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            pending = []
+            for group in iter(lambda: list(islice(documents, group_size)), []):
+                previous, pending = pending, [
+                    writer.submit(self._upsert_embeddings, group[start:start + len(vectors)], vectors)
+                    for start, vectors in engine.embed([doc.page_content for doc in group])
+                ]
+                # Hold at most two groups in memory
+                for future in previous:
+                    future.result()
+                written += len(group)
+            for future in pending:
+                future.result()
+        
+        if self.backend == "local" and written:
+            self.vector_store.persist()
+        if engine.cache is not None:
+            engine.cache.flush()
+    
+    def _upsert_embeddings(self, documents: List[Document], vectors: List[List[float]]) -> None:
+        """Bulk-upsert pre-computed embeddings into the backend.
+        
+        Args:
+            documents: Documents the vectors belong to.
+            vectors: One embedding per document.
+        """
+        with tracer.span("index.upsert", backend=self.backend, vectors=len(documents)):
+            self._write_embeddings(documents, vectors)
+    
+    def _write_embeddings(self, documents: List[Document], vectors: List[List[float]]) -> None:
+        """Write one batch of embeddings to the selected backend."""
+        ids = [doc.metadata["chunk_id"] for doc in documents]
+        self._add_lexical(documents)
+        
+        if self.backend == "local":
+            by_video: Dict[str, List[int]] = {}
+            for position, doc in enumerate(documents):
+                by_video.setdefault(doc.metadata["video_id"], []).append(position)
+            for video_id, positions in by_video.items():
+                self.vector_store.add_embeddings(
+                    texts=[documents[i].page_content for i in positions],
+                    embeddings=[vectors[i] for i in positions],
+                    metadatas=[documents[i].metadata for i in positions],
+                    ids=[ids[i] for i in positions],
+                    persist=False,
+                    video_id=video_id,
+                )
+            return
+        
+        records = [
+            (chunk_id, vector, {**doc.metadata, "text": doc.page_content})
+            for chunk_id, vector, doc in zip(ids, vectors, documents)
+        ]
+        self.pinecone_client.Index(PINECONE_INDEX_NAME).upsert(vectors=records)
+    
+    def _delete(self, ids: List[str], video_id: str) -> None:
+        """Delete chunks of one video from the backend and the BM25 index."""
+        self.lexical_index.delete(video_id, ids)
+        if self.backend == "local":
+            self.vector_store.delete(ids=ids, video_id=video_id)
+        else:
+            self.vector_store.delete(ids=ids)
+    
+    def connect(self) -> VectorStore:
+        """Open the configured backend once and return it.
+        
+        Returns:
+            The vector store instance.
+        """
+        if self.vector_store is None:
+            with self._connect_lock:
+                if self.vector_store is None:
+                    self.vector_store = self._connect()
+        return self.vector_store
+    
+    def retrieval_store(self, mode: str = RETRIEVAL_MODE) -> VectorStore:
+        """Return the store the workflow searches.
+        
+        Args:
+            mode: "dense" for vector search only, "hybrid" to fuse it with
+                BM25 by reciprocal rank.
+            
+        Returns:
+            The vector store, or a hybrid wrapper around it.
+        """
+        if mode == "hybrid":
+            return HybridVectorStore(self.connect(), self.lexical_index)
+        return self.connect()
+    
+    def _connect(self) -> VectorStore:
+        """Open the configured backend without adding documents.
+        
+        Returns:
+            The vector store instance.
+        """
+        if self.backend == "local":
+            return PartitionedLocalIndex(
+                embedding=self.embeddings,
+                index_dir=LOCAL_INDEX_DIR,
+                dimension=EMBEDDING_DIMENSION,
+            )
+        
+        # Make sure the index exists before connecting to it
+        self.pinecone_client
+        return ScopedPinecone.from_existing_index(
+            index_name=PINECONE_INDEX_NAME,
             embedding=self.embeddings,
-            index_name=PINECONE_INDEX_NAME
         )
-        print(f"Indexed {len(documents)} documents in Pinecone")
+    
+    def warm_up(self) -> None:
+        """Load the embedding model and the Pinecone client ahead of use.
         
-        return self.vector_store
-    from langchain_community.vectorstores import Pinecone
-
+        The store itself is still opened by the first sync or retrieval, so
+        warming up in the background never races with indexing.
+        """
+        self.embeddings
+        self.pinecone_client
+    
+    def close(self) -> None:
+        """Stop the embedding worker processes and flush the embedding cache."""
+        if not self._embedding_stack.ready:
+            return
+        engine = self.embedding_engine
+        engine.shutdown()
+        if engine.cache is not None:
+            engine.cache.flush()
+    
     def get_retriever(self, k: int = 4):
         """Get a retriever for the vector store.
         
@@ -121,11 +649,93 @@ class TranscriptionVectorStore:
         Returns:
             A retriever instance.
         """
-        if self.vector_store is None:
-            # Connect to existing index
-            self.vector_store = Pinecone(
-                index_name=PINECONE_INDEX_NAME,
-                embedding=self.embeddings,
-            )
+        return self.connect().as_retriever(search_kwargs={"k": k})
+
+
+class TranscriptAppender:
+    """Indexes a transcription one appended piece at a time.
+    
+    Each piece only goes through the chunker together with the unfinished
+    tail of the previous ones, so only the chunks it completes are split and
+    embedded; the tail becomes searchable with the next piece or ``close``.
+    Chunks an earlier version of the file left in the index stay until
+    ``close`` deletes them.
+    """
+    
+    def __init__(
+        self,
+        store: TranscriptionVectorStore,
+        transcription_path: str,
+        video_id: str,
+        playlists: Optional[List[str]] = None,
+    ):
+        """Initialize the appender; use ``TranscriptionVectorStore.appender``.
+        
+        Args:
+            store: Store to index into.
+            transcription_path: Path the transcription is written to.
+            video_id: ID of the video.
+            playlists: Playlists the video belongs to.
+        """
+        self.store = store
+        self.transcription_path = transcription_path
+        self.video_id = video_id
+        self.playlists = playlists
+        self.manifest = store.manifest_for(video_id)
+        self.known = dict(self.manifest.known(transcription_path))
+        self.seen: Dict[str, int] = {}
+        self.chunker = StreamingSplitter(transcription_path, store.text_splitter)
+    
+    def append(self, text: str) -> IndexSummary:
+        """Index the chunks completed by a piece just written to the file.
         
-        return self.vector_store.as_retriever(search_kwargs={"k": k})
\ No newline at end of file
+        Args:
+            text: The piece, exactly as written.
+            
+        Returns:
+            Counts of the chunks added and found already indexed.
+        """
+        summary = self._index(self.chunker.feed(text))
+        self.manifest.record_entries(self.transcription_path, {**self.known, **self.seen})
+        self.manifest.save()
+        # The registered hash stays empty until the file is complete
+        self.store._register(self.video_id, self.transcription_path, self.playlists, transcript_id="")
+        return summary
+    
+    def close(self) -> IndexSummary:
+        """Index the rest of the transcription and drop chunks it no longer has.
+        
+        Returns:
+            Counts of the chunks added, found already indexed and removed.
+        """
+        summary = self._index(self.chunker.finish())
+        deleted = self.manifest.plan_entries(self.transcription_path, self.seen).deleted_ids
+        if deleted:
+            self.store._delete(deleted, self.video_id)
+            self.store.lexical_index.persist()
+        summary.deleted_ids = deleted
+        summary.removed = len(deleted)
+        self.manifest.record_entries(self.transcription_path, self.seen)
+        self.manifest.save()
+        self.store._register(self.video_id, self.transcription_path, self.playlists)
+        print(f"Indexed transcription in {self.store.backend}: {len(self.seen)} chunks, {len(deleted)} removed")
+        return summary
+    
+    def _index(self, documents: List[Document]) -> IndexSummary:
+        """Embed and store the chunks not indexed yet."""
+        for doc in documents:
+            doc.metadata["video_id"] = self.video_id
+            if self.playlists:
+                doc.metadata["playlists"] = list(self.playlists)
+        assign_chunk_ids(documents)
+        new = [doc for doc in documents if doc.metadata["chunk_id"] not in self.known]
+        with tracer.span("index.append", backend=self.store.backend, chunks=len(documents), added=len(new)):
+            if new:
+                self.store._embed_and_upsert(new)
+                self.store.lexical_index.persist()
+        self.seen.update(chunk_entries(documents))
+        return IndexSummary(
+            added=len(new),
+            unchanged=len(documents) - len(new),
+            upserted_ids=[doc.metadata["chunk_id"] for doc in new],
+        )
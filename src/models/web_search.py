@@ -0,0 +1,56 @@
+"""Tavily web search over the shared keep-alive HTTP session."""
+
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.models import clients
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+class TavilySearch(BaseRetriever):
+    """Retriever calling the Tavily search API.
+
+    ``TavilySearchAPIRetriever`` opens a new client for every search and
+    never times out; this one posts through the pooled session with the
+    ``SERVICE_TIMEOUTS["tavily"]`` per-request timeout. Its async search
+    uses the event loop's pooled client instead of falling back to a
+    thread, so cancelling it on a timeout stops the request.
+    """
+
+    api_key: Optional[str] = None
+    k: int = 2
+
+    def search_payload(self, query: str) -> Dict[str, Any]:
+        """Build the JSON body of a search request."""
+        return {"api_key": self.api_key, "query": query, "max_results": self.k, "search_depth": "basic"}
+
+    @staticmethod
+    def documents(data: Dict[str, Any]) -> List[Document]:
+        """Convert a Tavily response body to documents."""
+        return [
+            Document(
+                page_content=result.get("content", ""),
+                metadata={"title": result.get("title", ""), "source": result.get("url", "")},
+            )
+            for result in data.get("results") or []
+        ]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        response = clients.get_http_session().post(
+            TAVILY_SEARCH_URL, json=self.search_payload(query), timeout=clients.timeout("tavily")
+        )
+        clients.raise_for_transient_status(response).raise_for_status()
+        return self.documents(response.json())
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        response = await clients.get_http_client().post(
+            TAVILY_SEARCH_URL, json=self.search_payload(query), timeout=clients.timeout("tavily")
+        )
+        clients.raise_for_transient_status(response).raise_for_status()
+        return self.documents(response.json())
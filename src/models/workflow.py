@@ -1,18 +1,31 @@
 """LangGraph workflow definition for the multi-agent video QA system."""
 
+import threading
+from collections import Counter
+from functools import partial
+from typing import Dict
+
 from langchain_core.runnables import RunnablePassthrough
 from langgraph.graph import StateGraph, START, END
 
+from src.config import ROUTING_MODE, ROUTING_SIMILARITY_THRESHOLD, ROUTING_MIN_CONFIDENT_DOCS
+from src.models import async_agents
 from src.models.graph_state import GraphState
+from src.models.instrumentation import tracer
 from src.models.agents import (
-    language_detection_chain,
+    language_detection_agent,
     translation_agent,
     query_enhancement_agent,
     rag_retrieval_agent,
     web_retrieval_agent,
+    context_builder_agent,
     answer_generation_agent,
 )
 
+# How often adaptive routing answered from the transcript alone or searched the web
+_route_counts = Counter()
+_route_counts_lock = threading.Lock()
+
 
 def route_by_language(state: GraphState) -> str:
     """Route the workflow based on detected language.
@@ -23,50 +36,119 @@ def route_by_language(state: GraphState) -> str:
     Returns:
         Next node identifier based on language.
     """
-    # Get the initial query
-    initial_query = state['initial_query']
-    
-    # Create and invoke the language detector
-    language_detector = language_detection_chain(state)
-    query_language = language_detector.invoke({"initial_query": initial_query})
-    print(f"Detected language: {query_language}")
-    
-    # Update the state with the detected language
-    state["query_language"] = query_language
-    
-    # Route based on language
-    if query_language.lower() == 'english':
-        state["final_query"] = state["initial_query"]
+    # Route based on the language set by the detection node
+    if state["query_language"] == 'english':
         print("Language: English")
         return "english"
     else:
-        state["query_language"] = 'another'
         print("Language: Non-English")
         return "another"
 
 
-def create_workflow(vector_store):
+def route_by_confidence(
+    state: GraphState,
+    threshold: float = ROUTING_SIMILARITY_THRESHOLD,
+    min_docs: int = ROUTING_MIN_CONFIDENT_DOCS,
+) -> str:
+    """Route to web retrieval only when the transcript matches are weak.
+    
+    Args:
+        state: The current state of the graph.
+        threshold: Similarity a retrieved chunk needs to count as a strong match.
+        min_docs: Strong matches needed to skip web retrieval.
+        
+    Returns:
+        "transcript" to build the context right away, "web" to search the web first.
+    """
+    strong = sum(score >= threshold for score in state.get("rag_scores") or [])
+    route = "transcript" if strong >= min_docs else "web"
+    with _route_counts_lock:
+        _route_counts[route] += 1
+    print(f"Route: {route} ({strong} strong transcript matches)")
+    return route
+
+
+def route_stats() -> Dict[str, int]:
+    """Return how many questions took each adaptive route."""
+    with _route_counts_lock:
+        return dict(_route_counts)
+
+
+def create_workflow(vector_store, routing: str = ROUTING_MODE, digests=None):
     """Create the LangGraph workflow for the QA system.
     
     Args:
         vector_store: The vector store to use for retrievals.
+        routing: "parallel" to always search the web alongside the
+            transcript, "adaptive" to search it only when needed.
+        digests: Store of precomputed summary trees used for overview
+            questions, or None.
+        
+    Returns:
+        A compiled LangGraph workflow.
+    """
+    return _build_workflow({
+        "language_detection": lambda state: language_detection_agent(state),
+        "translation": lambda state: translation_agent(state),
+        "query_enhancement": lambda state: query_enhancement_agent(state),
+        "rag_retrieval": lambda state: rag_retrieval_agent(state, vector_store, digests),
+        "web_retrieval": lambda state: web_retrieval_agent(state),
+        "context_builder": lambda state: context_builder_agent(state),
+        "answer_generation": lambda state: answer_generation_agent(state),
+    }, routing)
+
+
+def create_async_workflow(vector_store, routing: str = ROUTING_MODE, digests=None):
+    """Create the QA workflow with non-blocking node implementations.
+    
+    The returned graph is meant to be driven with ``ainvoke``/``astream``.
+    
+    Args:
+        vector_store: The vector store to use for retrievals.
+        routing: "parallel" or "adaptive", as in ``create_workflow``.
+        digests: Store of precomputed summary trees, or None.
         
     Returns:
         A compiled LangGraph workflow.
     """
+    return _build_workflow({
+        "language_detection": async_agents.language_detection_agent,
+        "translation": async_agents.translation_agent,
+        "query_enhancement": async_agents.query_enhancement_agent,
+        "rag_retrieval": partial(async_agents.rag_retrieval_agent, vector_store=vector_store, digests=digests),
+        "web_retrieval": async_agents.web_retrieval_agent,
+        "context_builder": context_builder_agent,
+        "answer_generation": async_agents.answer_generation_agent,
+    }, routing)
+
+
+def _build_workflow(nodes, routing: str = ROUTING_MODE):
+    """Wire the QA graph from a mapping of node names to implementations.
+    
+    Args:
+        nodes: Callable for each node of the graph.
+        routing: "parallel" or "adaptive".
+        
+    Returns:
+        A compiled LangGraph workflow.
+        
+    Raises:
+        ValueError: If the routing mode is unknown.
+    """
+    if routing not in ("parallel", "adaptive"):
+        raise ValueError(f"Unknown routing mode: {routing!r}")
+    
     # Create the workflow with the defined state
     workflow = StateGraph(GraphState)
     
-    # Add nodes for each agent
-    workflow.add_node("translation", lambda state: translation_agent(state))
-    workflow.add_node("query_enhancement", lambda state: query_enhancement_agent(state))
-    workflow.add_node("rag_retrieval", lambda state: rag_retrieval_agent(state, vector_store))
-    workflow.add_node("web_retrieval", lambda state: web_retrieval_agent(state))
-    workflow.add_node("answer_generation", lambda state: answer_generation_agent(state))
+    # Add nodes for each agent, timed when tracing is enabled
+    for name, node in nodes.items():
+        workflow.add_node(name, tracer.instrument(f"node.{name}", node))
     
-    # Define the conditional routing from the start based on language
+    # Define the conditional routing based on the detected language
+    workflow.add_edge(START, "language_detection")
     workflow.add_conditional_edges(
-        START,
+        "language_detection",
         route_by_language,
         {
             "english": "query_enhancement",
@@ -77,9 +159,25 @@ def create_workflow(vector_store):
     # Define the rest of the workflow
     workflow.add_edge("translation", "query_enhancement")
     workflow.add_edge("query_enhancement", "rag_retrieval")
-    workflow.add_edge("rag_retrieval", "web_retrieval")
-    workflow.add_edge("web_retrieval", "answer_generation")
+    
+    if routing == "adaptive":
+        # Search the web only when the transcript alone is not a strong enough match
+        workflow.add_conditional_edges(
+            "rag_retrieval",
+            route_by_confidence,
+            {
+                "transcript": "context_builder",
+                "web": "web_retrieval",
+            },
+        )
+        workflow.add_edge("web_retrieval", "context_builder")
+    else:
+        # Fan out to both retrievers, then join once both have finished
+        workflow.add_edge("query_enhancement", "web_retrieval")
+        workflow.add_edge(["rag_retrieval", "web_retrieval"], "context_builder")
+    
+    workflow.add_edge("context_builder", "answer_generation")
     workflow.add_edge("answer_generation", END)
     
     # Compile the workflow
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
@@ -1,89 +1,686 @@
 """Complete pipeline for the video QA system."""
 
+import asyncio
+import atexit
+import contextvars
 import os
-from typing import Dict, Any, Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from data.transcription import VideoTranscriber
-from models.vectorstore import TranscriptionVectorStore
-from models.workflow import create_workflow
-from models.graph_state import GraphState
+from src.config import (
+    ANSWER_CACHE_ENABLED,
+    ASYNC_CONCURRENCY,
+    BATCH_CONCURRENCY,
+    DIGEST_ENABLED,
+    WHISPER_MODEL,
+    TRANSCRIPTION_SEGMENTED,
+    TRANSCRIPTION_SEGMENT_SECONDS,
+)
+from src.models.agents import get_web_retriever, streaming_tokens
+from src.models.artifacts import ArtifactStore, settings_key
+from src.models.cache import AnswerCache, normalize_question, stage_cache_stats
+from src.models.corpus import ALL_SCOPE, VIDEO_SCOPE, youtube_video_id
+from src.models.digest import Digest, build_digest
+from src.models.language import detect_language
+from src.models.llm import get_llm
+from src.models.vectorstore import TranscriptionVectorStore
+from src.models.workflow import create_workflow, create_async_workflow
+from src.models.graph_state import GraphState
+from src.models.manifest import IndexSummary
+from src.models.ratelimit import RateLimitGate, call_with_backoff
+
+
+def node_status(node: str, update: Dict[str, Any]) -> Optional[str]:
+    """Describe the progress a workflow node reports, for streaming clients.
+    
+    Args:
+        node: Name of the node that finished.
+        update: The state update it returned.
+        
+    Returns:
+        A short status line, or None for nodes not worth reporting.
+    """
+    if node == "language_detection":
+        return f"Detected language: {update.get('query_language')}"
+    if node == "translation":
+        return "Translated question to English"
+    if node == "query_enhancement":
+        return f"Searching for: {update.get('new_query')}"
+    if node == "rag_retrieval":
+        return f"Retrieved {len(update.get('rag_documents') or [])} transcript passages"
+    if node == "web_retrieval":
+        return f"Retrieved {len(update.get('web_documents') or [])} web results"
+    if node == "context_builder":
+        return "Generating answer"
+    return None
 
 
 class VideoQAPipeline:
     """Pipeline for video transcription and question answering."""
     
     def __init__(self):
-        """Initialize the pipeline components."""
-        self.transcriber = VideoTranscriber()
+        """Initialize the pipeline components.
+        
+        Models, clients and the workflow graph are built on first use (or by
+        ``warm_up``), so constructing the pipeline is cheap.
+        """
         self.vector_store = TranscriptionVectorStore()
         self.workflow = None
+        self.async_workflow = None
         self.transcription_path = None
+        self.video_id = None
+        self.answer_cache = AnswerCache() if ANSWER_CACHE_ENABLED else None
+        # Transcripts the corpus is indexed from stay until re-indexed from elsewhere
+        self.artifacts = ArtifactStore(pinned=self._indexed_sources)
+        self.digest_enabled = DIGEST_ENABLED
+        atexit.register(self.close)
     
-    def process_video(self, video_url: str, output_dir: str = "data") -> str:
+    def __enter__(self) -> "VideoQAPipeline":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release the embedding worker processes; safe to call more than once."""
+        self.vector_store.close()
+    
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """Build the LLM client, web retriever, embedding model, Pinecone
+        client and (if a transcription is loaded) the workflow ahead of the
+        first question.
+        
+        Args:
+            background: Warm up in a daemon thread instead of blocking.
+            
+        Returns:
+            The warm-up thread, or None when run in the foreground.
+        """
+        def run():
+            get_llm()
+            get_web_retriever()
+            self.vector_store.warm_up()
+            if len(self.vector_store.corpus):
+                self._compile_workflow()
+        
+        if not background:
+            run()
+            return None
+        
+        thread = threading.Thread(target=run, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+    
+    def process_video(
+        self,
+        video_url: str,
+        playlists: Optional[List[str]] = None,
+        segmented: bool = TRANSCRIPTION_SEGMENTED,
+        on_segment: Optional[Callable[[Any, IndexSummary], None]] = None,
+    ) -> str:
         """Process a video: download, transcribe, and index.
         
+        Audio and transcripts are kept in the artifact store under the
+        YouTube video ID, so a video processed before with the same
+        transcription settings is only re-indexed (which is itself a no-op
+        when its chunks are already stored), and one transcribed with other
+        settings, e.g. another ``WHISPER_MODEL``, reuses the downloaded audio.
+        
         Args:
             video_url: URL of the YouTube video.
-            output_dir: Directory to save outputs.
+            playlists: Playlists the video belongs to.
+            segmented: Transcribe silence-delimited segments in parallel and
+                index each one as soon as it is ready.
+            on_segment: In segmented mode, called with each transcribed
+                segment and its indexing summary; the video can be queried
+                from the first call on.
             
         Returns:
             Path to the transcription file.
+            
+        Raises:
+            ValueError: If the URL has no YouTube video ID.
         """
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        video_id = youtube_video_id(video_url)
+        if video_id is None:
+            raise ValueError(f"Not a YouTube video URL: {video_url}")
+        
+        settings = {"model": WHISPER_MODEL, "segmented": segmented}
+        if segmented:
+            settings["segment_seconds"] = TRANSCRIPTION_SEGMENT_SECONDS
+        name = f"transcript-{settings_key(settings)}.txt"
+        
+        cached = self.artifacts.get(video_id, name)
+        if cached is not None:
+            print(f"Using cached transcript of {video_id}")
+            self.transcription_path = cached
+            self.load_transcription(cached, video_id, playlists)
+            return cached
         
-        # Transcribe the video
-        transcription = self.transcriber.process_youtube_video(video_url, output_dir)
-        self.transcription_path = os.path.join(output_dir, "transcription.txt")
+        audio_path = self._cached_audio(video_url, video_id)
+        self.transcription_path = self.artifacts.path(video_id, name)
+        if segmented:
+            self._process_video_segmented(audio_path, video_id, playlists, on_segment)
+            return self.artifacts.put(video_id, name)
         
-        # Index the transcription
-        self.load_transcription(self.transcription_path)
+        # Transcribe the cached audio, then register the transcript in the store
+        from src.models.transcription import transcribe_audio
+        transcript = transcribe_audio(audio_path)
+        with open(self.transcription_path, "w", encoding="utf-8") as file:
+            file.write(transcript.text())
+        self.artifacts.put(video_id, name)
+        
+        # Index the transcription under the YouTube video ID
+        self.load_transcription(self.transcription_path, video_id, playlists)
         
         return self.transcription_path
     
-    def load_transcription(self, transcription_path: str) -> None:
+    def _cached_audio(self, video_url: str, video_id: str) -> str:
+        """Return the audio of a video from the artifact store, downloading it on a miss.
+        
+        Args:
+            video_url: URL of the YouTube video.
+            video_id: YouTube ID of the video.
+            
+        Returns:
+            Path to the audio file in the store.
+        """
+        from src.models.transcription import download_audio
+        
+        audio_path = self.artifacts.get(video_id, "audio.mp4")
+        if audio_path is not None:
+            print(f"Using cached audio of {video_id}")
+            return audio_path
+        directory = os.path.dirname(self.artifacts.path(video_id, "audio.mp4"))
+        return self.artifacts.put(video_id, "audio.mp4", source=download_audio(video_url, directory))
+    
+    def _process_video_segmented(
+        self,
+        audio_path: str,
+        video_id: str,
+        playlists: Optional[List[str]],
+        on_segment: Optional[Callable[[Any, IndexSummary], None]],
+    ) -> None:
+        """Transcribe a video in parallel segments, indexing the transcript as it grows.
+        
+        The transcript is written to ``self.transcription_path``; the caller
+        registers it in the artifact store once every segment is done. Each
+        segment's text is indexed on its own, with the overlap carried over
+        from the previous segment, so no segment re-reads the transcript.
+        
+        Args:
+            audio_path: Path to the audio of the video.
+            video_id: YouTube ID of the video.
+            playlists: Playlists the video belongs to.
+            on_segment: Called after each segment is indexed.
+        """
+        from src.models.transcription import SegmentedTranscriber
+        
+        appender = self.vector_store.appender(self.transcription_path, video_id, playlists)
+        self.video_id = video_id
+        self._compile_workflow()
+        
+        with open(self.transcription_path, "w", encoding="utf-8") as file:
+            for segment in SegmentedTranscriber().transcribe(audio_path):
+                text = segment.text()
+                file.write(text)
+                file.flush()
+                
+                summary = appender.append(text)
+                if on_segment is not None:
+                    on_segment(segment, summary)
+        appender.close()
+        
+        # Summarize once the whole transcript is known
+        if self.digest_enabled:
+            self.precompute_digest(video_id)
+    
+    def load_transcription(
+        self,
+        transcription_path: str,
+        video_id: Optional[str] = None,
+        playlists: Optional[List[str]] = None,
+        digest: Optional[bool] = None,
+        default: bool = True,
+    ) -> IndexSummary:
         """Load and index an existing transcription.
         
+        Every transcription is indexed in its own partition, so loading a
+        new one adds a video to the corpus. Unless ``default`` is False,
+        questions without a scope then default to this video.
+        
         Args:
             transcription_path: Path to the transcription file.
+            video_id: ID of the video, derived from the path when None.
+            playlists: Playlists the video belongs to.
+            digest: Precompute the video's summary tree and FAQ after
+                indexing; defaults to ``digest_enabled``.
+            default: Make the video the default scope of questions.
+            
+        Returns:
+            Counts of added, updated, unchanged and removed chunks.
         """
-        self.transcription_path = transcription_path
+        video_id = self.vector_store.resolve_video_id(transcription_path, video_id)
         
-        # Split and index the transcription
-        documents = self.vector_store.load_transcription(transcription_path)
-        vector_store = self.vector_store.index_documents(documents)
+        # Stream the transcription into the index
+        summary = self.vector_store.index_transcription(transcription_path, video_id, playlists)
         
-        # Create the workflow
-        self.workflow = create_workflow(vector_store)
+        if default:
+            self.transcription_path = transcription_path
+            self.video_id = video_id
+        
+        if self.digest_enabled if digest is None else digest:
+            self.precompute_digest(video_id)
+        
+        return summary
+    
+    def _indexed_sources(self) -> List[str]:
+        """Return the transcription path of every indexed video."""
+        return [entry["source"] for entry in self.vector_store.corpus.videos.values()]
     
-    def ask_question(self, question: str) -> str:
-        """Ask a question about the transcribed video.
+    def precompute_digest(self, video_id: str) -> Optional[Digest]:
+        """Build the summary tree and FAQ of an indexed video, unless they are current.
         
         Args:
-            question: The question to ask.
+            video_id: ID of the video.
             
         Returns:
-            The answer to the question.
+            The video's digest, or None if it has no indexed text.
         """
+        digests = self.vector_store.digests
+        digest = digests.get(video_id)
+        entry = self.vector_store.corpus.videos.get(video_id)
+        if digest is not None or entry is None:
+            return digest
+        if not os.path.exists(entry["source"]):
+            print(f"Transcription of {video_id} not found at {entry['source']}; load it again to build its digest")
+            return None
+        
+        texts = [doc.page_content for doc in self.vector_store.iter_transcription(entry["source"], video_id)]
+        if not texts:
+            return None
+        
+        digest = build_digest(video_id, entry["transcript_id"], texts, self.vector_store.embeddings)
+        digests.save(digest)
+        print(f"Precomputed {len(digest.levels)} summary levels and {len(digest.faq)} answers for {video_id}")
+        return digest
+    
+    def _ensure_workflow(self) -> None:
+        """Make sure a transcription is loaded and the workflow is built."""
         if not self.workflow:
-            if not self.transcription_path or not os.path.exists(self.transcription_path):
+            # Try to load the transcription if it isn't indexed yet
+            if self.video_id is None and self.transcription_path and os.path.exists(self.transcription_path):
+                self.load_transcription(self.transcription_path)
+            
+            if not len(self.vector_store.corpus):
                 raise ValueError("No transcription has been loaded. Please process a video first.")
             
-            # Try to load the transcription if workflow isn't initialized
-            self.load_transcription(self.transcription_path)
+            self._compile_workflow()
+    
+    def _compile_workflow(self) -> None:
+        """Compile the workflow over the connected vector store."""
+        if not self.workflow:
+            self.workflow = create_workflow(self.vector_store.retrieval_store(), digests=self.vector_store.digests)
+    
+    def _resolve_scope(self, scope: Optional[str]) -> Tuple[Optional[List[str]], str]:
+        """Resolve the scope of a question.
+        
+        Args:
+            scope: ``"video:<id>"``, ``"playlist:<name>"``, ``"all"``, or None
+                for the most recently loaded video (or the whole corpus if
+                none was loaded).
+            
+        Returns:
+            The video IDs to search (None for all) and the answer cache key.
+        """
+        if scope is None:
+            scope = f"{VIDEO_SCOPE}{self.video_id}" if self.video_id else ALL_SCOPE
+        corpus = self.vector_store.corpus
+        return corpus.resolve(scope), corpus.scope_key(scope)
+    
+    def _embed_questions(self, questions: List[str]) -> List[List[float]]:
+        """Embed questions in one call, keeping them out of the chunk embedding cache."""
+        embeddings = self.vector_store.embeddings
+        if hasattr(embeddings, "embed_queries"):
+            return embeddings.embed_queries(questions)
+        return embeddings.embed_documents(questions)
+    
+    def _cached_answer(
+        self,
+        question: str,
+        scope_key: str,
+        video_ids: Optional[List[str]] = None,
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """Look the question up in the answer cache, then in the video's precomputed FAQ.
+        
+        Args:
+            question: The question to ask.
+            scope_key: Identity of the videos the question is about.
+            video_ids: Videos the question is about, or None for all.
+            
+        Returns:
+            The cached answer or None, and the question embedding if one was
+            computed for the semantic lookup.
+        """
+        embedding = None
+        if self.answer_cache is not None:
+            answer = self.answer_cache.get_exact(scope_key, question)
+            if answer is not None:
+                return answer, None
+            
+            embedding = self.vector_store.embeddings.embed_query(question)
+            answer = self.answer_cache.get_similar(scope_key, embedding)
+            if answer is not None:
+                return answer, embedding
+        
+        return self._precomputed_answer(question, video_ids, embedding), embedding
+    
+    def _precomputed_answer(
+        self,
+        question: str,
+        video_ids: Optional[List[str]],
+        embedding: Optional[List[float]] = None,
+    ) -> Optional[str]:
+        """Serve a question about a single video from the FAQ precomputed at ingest time.
+        
+        Args:
+            question: The question to ask.
+            video_ids: Videos the question is about, or None for all.
+            embedding: Embedding of the question, computed if None.
+            
+        Returns:
+            The precomputed answer, or None.
+        """
+        # FAQ answers are written in English about one video
+        if not video_ids or len(video_ids) != 1 or self.vector_store.digests.get(video_ids[0]) is None:
+            return None
+        if detect_language(question) != "english":
+            return None
+        
+        if embedding is None:
+            embedding = self.vector_store.embeddings.embed_query(question)
+        answer = self.vector_store.digests.answer(video_ids[0], embedding)
+        if answer is not None:
+            print("Answered from the precomputed FAQ")
+        return answer
+    
+    def _remember_answer(self, question: str, scope_key: str, final_state: Optional[Dict[str, Any]], embedding) -> str:
+        """Extract the final answer and store it in the answer cache.
+        
+        Args:
+            question: The question that was asked.
+            scope_key: Identity of the videos the question is about.
+            final_state: Final state of the workflow.
+            embedding: Embedding of the question, if computed.
+            
+        Returns:
+            The answer to the question.
+        """
+        answer = self._final_answer(final_state)
+        if self.answer_cache is not None and final_state and "final_answer" in final_state:
+            self.answer_cache.put(scope_key, question, answer, embedding)
+        return answer
+    
+    @staticmethod
+    def _final_answer(final_state: Optional[Dict[str, Any]]) -> str:
+        """Extract the answer from the final workflow state."""
+        if final_state and "final_answer" in final_state:
+            return final_state["final_answer"]
+        else:
+            return "I couldn't generate an answer for your question."
+    
+    def ask_question(self, question: str, scope: Optional[str] = None) -> str:
+        """Ask a question about the transcribed videos.
+        
+        Args:
+            question: The question to ask.
+            scope: ``"video:<id>"``, ``"playlist:<name>"`` or ``"all"``;
+                defaults to the most recently loaded video.
+            
+        Returns:
+            The answer to the question.
+        """
+        self._ensure_workflow()
+        video_ids, scope_key = self._resolve_scope(scope)
+        
+        # Serve repeated and near-identical questions from the cache
+        answer, embedding = self._cached_answer(question, scope_key, video_ids)
+        if answer is not None:
+            return answer
+        
+        final_state = self._run_workflow(question, video_ids)
         
+        # Return the final answer
+        return self._remember_answer(question, scope_key, final_state, embedding)
+    
+    def _run_workflow(self, question: str, video_ids: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+        """Run the workflow for one question.
+        
+        Args:
+            question: The question to ask.
+            video_ids: Videos to retrieve from, or None for all.
+            
+        Returns:
+            The final workflow state.
+        """
         # Prepare the input for the workflow
-        inputs = {"initial_query": question}
+        inputs = {"initial_query": question, "scope": video_ids}
         
         # Execute the workflow
         final_state = None
-        for output in self.workflow.stream(inputs):
+        for output in self.workflow.stream(inputs, stream_mode="values"):
             final_state = output
+        return final_state
+    
+    def stream_answer(self, question: str, scope: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Ask a question and yield progress and answer tokens as they arrive.
         
-        # Return the final answer
-        if final_state and "final_answer" in final_state:
-            return final_state["final_answer"]
-        else:
-            return "I couldn't generate an answer for your question." # Model definition and training
\ No newline at end of file
+        The workflow runs in a background thread; its node updates and the
+        tokens of the answer generation node are relayed through a queue.
+        
+        Args:
+            question: The question to ask.
+            scope: Scope of the question, as for ``ask_question``.
+            
+        Yields:
+            ``("status", line)`` when a node finishes, ``("token", text)`` for
+            each chunk of the answer and finally ``("answer", answer)``.
+        """
+        self._ensure_workflow()
+        video_ids, scope_key = self._resolve_scope(scope)
+        
+        answer, embedding = self._cached_answer(question, scope_key, video_ids)
+        if answer is not None:
+            yield "token", answer
+            yield "answer", answer
+            return
+        
+        events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        
+        def run() -> None:
+            final_state: Dict[str, Any] = {}
+            try:
+                with streaming_tokens(lambda token: events.put(("token", token))):
+                    inputs = {"initial_query": question, "scope": video_ids}
+                    for mode, chunk in self.workflow.stream(inputs, stream_mode=["updates", "values"]):
+                        if mode == "values":
+                            final_state = chunk
+                            continue
+                        for node, update in chunk.items():
+                            status = node_status(node, update or {})
+                            if status:
+                                events.put(("status", status))
+                events.put(("done", final_state))
+            except Exception as e:
+                events.put(("error", e))
+        
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True)
+        worker.start()
+        
+        streamed = False
+        while True:
+            kind, payload = events.get()
+            if kind == "error":
+                raise payload
+            if kind == "done":
+                break
+            streamed = streamed or kind == "token"
+            yield kind, payload
+        
+        answer = self._remember_answer(question, scope_key, payload, embedding)
+        if not streamed:
+            # Structured (merged) answers arrive whole
+            yield "token", answer
+        yield "answer", answer
+    
+    def ask_many(
+        self,
+        questions: List[str],
+        concurrency: int = BATCH_CONCURRENCY,
+        scope: Optional[str] = None,
+        on_answer: Optional[Callable[[int, str, str], None]] = None,
+    ) -> List[str]:
+        """Answer a batch of questions, e.g. a quiz set.
+        
+        Identical questions are answered once, the remaining cache lookups
+        embed every question in a single call, and the workflow runs for
+        the rest on ``concurrency`` threads. A rate-limited run makes every
+        worker back off before retrying.
+        
+        Args:
+            questions: The questions to ask.
+            concurrency: Maximum number of workflow runs in flight at once.
+            scope: Scope of every question, as for ``ask_question``.
+            on_answer: Called with (index, question, answer) for every
+                question as soon as its answer is known.
+            
+        Returns:
+            The answers, in the order of the questions.
+        """
+        self._ensure_workflow()
+        video_ids, scope_key = self._resolve_scope(scope)
+        answers: List[Optional[str]] = [None] * len(questions)
+        
+        # Answer each distinct question once
+        positions: Dict[str, List[int]] = {}
+        for index, question in enumerate(questions):
+            positions.setdefault(normalize_question(question), []).append(index)
+        
+        def deliver(key: str, answer: str) -> None:
+            for index in positions[key]:
+                answers[index] = answer
+                if on_answer is not None:
+                    on_answer(index, questions[index], answer)
+        
+        # Serve what the answer cache already knows, embedding all misses at once
+        pending: Dict[str, Optional[List[float]]] = {}
+        for key, indexes in positions.items():
+            answer = self.answer_cache.get_exact(scope_key, questions[indexes[0]]) if self.answer_cache else None
+            if answer is not None:
+                deliver(key, answer)
+            else:
+                pending[key] = None
+        
+        if pending and self.answer_cache is not None:
+            keys = list(pending)
+            embeddings = self._embed_questions([questions[positions[key][0]] for key in keys])
+            for key, embedding in zip(keys, embeddings):
+                answer = self.answer_cache.get_similar(scope_key, embedding)
+                if answer is not None:
+                    deliver(key, answer)
+                    del pending[key]
+                else:
+                    pending[key] = embedding
+        
+        # Serve what the precomputed FAQ of the video answers
+        for key in list(pending):
+            answer = self._precomputed_answer(questions[positions[key][0]], video_ids, pending[key])
+            if answer is not None:
+                deliver(key, answer)
+                del pending[key]
+        
+        # Run the workflow for the rest, backing off together when rate limited
+        gate = RateLimitGate()
+        
+        def run(question: str) -> Optional[Dict[str, Any]]:
+            return call_with_backoff(lambda: self._run_workflow(question, video_ids), gate)
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="ask") as executor:
+            futures = {executor.submit(run, questions[positions[key][0]]): key for key in pending}
+            for future in as_completed(futures):
+                key = futures[future]
+                question = questions[positions[key][0]]
+                try:
+                    final_state = future.result()
+                except Exception as e:
+                    print(f"Failed to answer {question!r}: {e}")
+                    final_state = None
+                deliver(key, self._remember_answer(question, scope_key, final_state, pending[key]))
+        
+        return answers
+    
+    def cache_stats(self) -> Dict[str, dict]:
+        """Return hit/miss counters of the answer cache, every stage cache and the FAQ.
+        
+        Returns:
+            Statistics keyed by cache name.
+        """
+        stats = {"answer": self.answer_cache.stats()} if self.answer_cache is not None else {}
+        stats.update(stage_cache_stats())
+        stats["faq"] = self.vector_store.digests.stats()
+        return stats
+    
+    async def ask_question_async(self, question: str, scope: Optional[str] = None) -> str:
+        """Ask a question without blocking the event loop.
+        
+        Args:
+            question: The question to ask.
+            scope: Scope of the question, as for ``ask_question``.
+            
+        Returns:
+            The answer to the question.
+        """
+        if not self.workflow:
+            await asyncio.get_running_loop().run_in_executor(None, self._ensure_workflow)
+        if self.async_workflow is None:
+            self.async_workflow = create_async_workflow(
+                self.vector_store.retrieval_store(), digests=self.vector_store.digests
+            )
+        video_ids, scope_key = self._resolve_scope(scope)
+        
+        answer, embedding = await asyncio.get_running_loop().run_in_executor(
+            None, self._cached_answer, question, scope_key, video_ids
+        )
+        if answer is not None:
+            return answer
+        
+        final_state = await self.async_workflow.ainvoke({"initial_query": question, "scope": video_ids})
+        
+        return self._remember_answer(question, scope_key, final_state, embedding)
+    
+    async def ask_many_async(self, questions: List[str], concurrency: int = ASYNC_CONCURRENCY, scope: Optional[str] = None) -> List[str]:
+        """Answer several questions concurrently on the current event loop.
+        
+        LLM and web calls are native async requests, but the vector search of
+        each question runs on the loop's default thread pool executor, so
+        ``concurrency`` is also bounded by the size of that pool.
+        
+        Args:
+            questions: The questions to ask.
+            concurrency: Maximum number of questions in flight at once.
+            scope: Scope of every question, as for ``ask_question``.
+            
+        Returns:
+            The answers, in the order of the questions.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def ask(question: str) -> str:
+            async with semaphore:
+                return await self.ask_question_async(question, scope)
+        
+        return await asyncio.gather(*(ask(question) for question in questions))
@@ -0,0 +1,406 @@
+"""Long-running HTTP service that keeps the QA pipeline warm between questions.
+
+Usage:
+    python -m src.server --transcription_path transcription.txt
+    python -m src.server --stub  # offline, with the local stand-ins of src.models.fakes
+
+Endpoints:
+    GET  /health   200 once the models and workflow are warm, 503 before or if warm-up failed
+    GET  /metrics  Request counters, queue depth, latency percentiles and cache statistics
+    POST /ask      {"question": ..., "scope": ..., "stream": false}
+    POST /load     {"transcription_path": ..., "video_id": ..., "playlists": [...]}
+
+A question without a scope is asked about the video indexed at startup, or
+the whole corpus if there was none; ``/load`` adds videos without changing
+that default, and waits for questions in flight before touching the index.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.locks import ReadWriteLock
+
+
+def parse_args():
+    """Parse command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Video QA HTTP service")
+    parser.add_argument("--host", type=str, default=None, help="Interface to listen on (default: SERVER_HOST)")
+    parser.add_argument("--port", type=int, default=None, help="Port to listen on (default: SERVER_PORT)")
+    parser.add_argument("--transcription_path", type=str, default=None, help="Transcription to index at startup")
+    parser.add_argument("--video_id", type=str, default=None, help="ID to index the transcription under")
+    parser.add_argument("--playlist", type=str, action="append", default=None, help="Playlist of the transcription")
+    parser.add_argument("--max_concurrency", type=int, default=None,
+                        help="Questions answered at once (default: SERVER_MAX_CONCURRENCY)")
+    parser.add_argument("--max_queue", type=int, default=None,
+                        help="Questions waiting for a slot before new ones are rejected (default: SERVER_MAX_QUEUE)")
+    parser.add_argument("--stub", action="store_true",
+                        help="Serve with local stand-ins for the embedder, Groq, Tavily and MyMemory")
+    parser.add_argument("--workdir", type=str, default=None,
+                        help="Directory of the indexes and caches in --stub mode (default: a temporary one)")
+    parser.add_argument("--stub_latency_ms", type=float, default=0.0,
+                        help="Simulated Groq, Tavily and MyMemory latency in --stub mode")
+    return parser.parse_args()
+
+
+class AdmissionController:
+    """Bounds the questions answered at once and the questions waiting for a slot.
+
+    A question arriving when every slot is taken and the queue is full is
+    rejected right away, so overload shows up as fast 503s instead of
+    ever-growing latency.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, timeout: float):
+        """Initialize the controller.
+
+        Args:
+            max_concurrency: Questions answered at once.
+            max_queue: Questions allowed to wait for a slot.
+            timeout: Seconds a question may wait before it is rejected.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed.
+
+        Returns:
+            True if a slot was taken; the caller must ``release`` it.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    self.rejected += 1
+                    return False
+                self.waiting += 1
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._lock:
+                self.waiting -= 1
+                if not acquired:
+                    self.rejected += 1
+                    return False
+        with self._lock:
+            self.active += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a slot taken by ``acquire``."""
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current load and the rejection count."""
+        with self._lock:
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "rejected": self.rejected,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+            }
+
+
+class ServerMetrics:
+    """Request counters and recent latencies of the service."""
+
+    def __init__(self, window: int):
+        """Initialize the metrics.
+
+        Args:
+            window: Number of recent requests kept per endpoint for percentiles.
+        """
+        self.started = time.time()
+        self.requests: Dict[str, int] = {}
+        self.statuses: Dict[str, int] = {}
+        self.latencies: Dict[str, deque] = {}
+        self.window = window
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, status: int, duration_ms: float) -> None:
+        """Count a finished request and its latency."""
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+            self.latencies.setdefault(endpoint, deque(maxlen=self.window)).append(duration_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters and p50/p95/p99 latency in milliseconds per endpoint."""
+        from src.models.instrumentation import percentile
+
+        with self._lock:
+            latencies = {endpoint: list(values) for endpoint, values in self.latencies.items()}
+            return {
+                "uptime_s": time.time() - self.started,
+                "requests": dict(self.requests),
+                "statuses": dict(self.statuses),
+                "latency_ms": {
+                    endpoint: {q: percentile(values, int(q[1:])) for q in ("p50", "p95", "p99")}
+                    for endpoint, values in latencies.items()
+                },
+            }
+
+
+class QAServer(ThreadingHTTPServer):
+    """HTTP server answering questions with one shared, warm pipeline."""
+
+    daemon_threads = True
+
+    def __init__(self, address, pipeline, admission: AdmissionController, metrics: ServerMetrics):
+        """Initialize the server.
+
+        Args:
+            address: (host, port) to listen on.
+            pipeline: The ``VideoQAPipeline`` to answer with.
+            admission: Limits on concurrent and queued questions.
+            metrics: Request counters of the service.
+        """
+        super().__init__(address, QARequestHandler)
+        self.pipeline = pipeline
+        self.admission = admission
+        self.metrics = metrics
+        self.warm = threading.Event()
+        self.warm_up_error: Optional[str] = None
+        # Questions hold it shared, /load exclusively
+        self.index_lock = ReadWriteLock()
+
+    def warm_up(self) -> bool:
+        """Build the clients, models and workflow, then report healthy.
+
+        Returns:
+            True on success; on failure the error is kept and ``/health``
+            reports it until a later warm-up succeeds.
+        """
+        try:
+            self.pipeline.warm_up(background=False)
+        except Exception as e:
+            print(f"Warm-up failed: {e}")
+            self.warm_up_error = str(e)
+            self.warm.clear()
+            return False
+        self.warm_up_error = None
+        self.warm.set()
+        return True
+
+
+class QARequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the pipeline of the ``QAServer``."""
+
+    server: QAServer
+
+    def do_GET(self):
+        self._handle({"/health": self._health, "/metrics": self._metrics})
+
+    def do_POST(self):
+        self._handle({"/ask": self._ask, "/load": self._load})
+
+    def _handle(self, routes) -> None:
+        """Run the route of the request path and record its metrics."""
+        started = time.perf_counter()
+        endpoint = self.path.split("?", 1)[0]
+        route = routes.get(endpoint)
+        try:
+            status = route() if route else self._send_json(404, {"error": f"Unknown endpoint: {endpoint}"})
+        except Exception as e:
+            print(f"Error handling {endpoint}: {e}")
+            status = self._send_json(500, {"error": str(e)})
+        self.server.metrics.observe(endpoint if route else "other", status, (time.perf_counter() - started) * 1000)
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> int:
+        """Send a JSON response and return its status."""
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        return status
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Read the JSON object of the request body."""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _health(self) -> int:
+        error = self.server.warm_up_error
+        if error is not None:
+            return self._send_json(503, {"status": "failed", "error": error})
+        ready = self.server.warm.is_set()
+        return self._send_json(200 if ready else 503, {
+            "status": "ok" if ready else "warming",
+            "videos": len(self.server.pipeline.vector_store.corpus),
+        })
+
+    def _metrics(self) -> int:
+        from src.models.clients import circuit_states
+        from src.models.instrumentation import tracer
+        from src.models.workflow import route_stats
+
+        metrics = self.server.metrics.snapshot()
+        metrics["admission"] = self.server.admission.stats()
+        metrics["caches"] = self.server.pipeline.cache_stats()
+        metrics["circuits"] = circuit_states()
+        metrics["routes"] = route_stats()
+        if tracer.enabled:
+            metrics["spans"] = tracer.summary()
+        return self._send_json(200, metrics)
+
+    def _ask(self) -> int:
+        try:
+            body = self._read_json()
+            question = str(body["question"]).strip()
+            if not question:
+                raise ValueError("Question is empty")
+        except (ValueError, KeyError) as e:
+            return self._send_json(400, {"error": f"Invalid request: {e}"})
+
+        admission = self.server.admission
+        if not admission.acquire():
+            return self._send_json(503, {"error": "Server busy"}, {"Retry-After": "1"})
+        try:
+            with self.server.index_lock.read():
+                if body.get("stream"):
+                    return self._stream_answer(question, body.get("scope"))
+                try:
+                    answer = self.server.pipeline.ask_question(question, body.get("scope"))
+                except ValueError as e:
+                    return self._send_json(400, {"error": str(e)})
+                return self._send_json(200, {"question": question, "answer": answer})
+        finally:
+            admission.release()
+
+    def _stream_answer(self, question: str, scope: Optional[str]) -> int:
+        """Send the events of ``stream_answer`` as JSON lines while they are produced."""
+        events = self.server.pipeline.stream_answer(question, scope)
+        try:
+            first = next(events)
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for kind, payload in itertools.chain([first], events):
+                self.wfile.write((json.dumps({"event": kind, "data": payload}, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except Exception as e:
+            print(f"Streaming failed: {e}")
+            self.close_connection = True
+        return 200
+
+    def _load(self) -> int:
+        try:
+            body = self._read_json()
+            path = body["transcription_path"]
+        except (ValueError, KeyError) as e:
+            return self._send_json(400, {"error": f"Invalid request: {e}"})
+        if not os.path.exists(path):
+            return self._send_json(404, {"error": f"Transcription file not found: {path}"})
+
+        pipeline = self.server.pipeline
+        with self.server.index_lock.write():
+            try:
+                video_id = pipeline.vector_store.resolve_video_id(path, body.get("video_id"))
+                summary = pipeline.load_transcription(path, video_id, body.get("playlists"), default=False)
+            except ValueError as e:
+                return self._send_json(400, {"error": str(e)})
+            if not self.server.warm_up():
+                return self._send_json(500, {"error": f"Warm-up failed: {self.server.warm_up_error}"})
+        return self._send_json(200, {
+            "video_id": video_id,
+            "added": summary.added,
+            "updated": summary.updated,
+            "unchanged": summary.unchanged,
+            "removed": summary.removed,
+        })
+
+
+def create_server(pipeline, host: str, port: int, max_concurrency: int, max_queue: int) -> QAServer:
+    """Create the service around a pipeline, without starting it.
+
+    Args:
+        pipeline: The ``VideoQAPipeline`` to answer with.
+        host: Interface to listen on.
+        port: Port to listen on, or 0 for any free port.
+        max_concurrency: Questions answered at once.
+        max_queue: Questions allowed to wait for a slot.
+
+    Returns:
+        The server; call ``serve_forever`` to handle requests.
+    """
+    from src.config import SERVER_QUEUE_TIMEOUT, SERVER_LATENCY_WINDOW
+
+    admission = AdmissionController(max_concurrency, max_queue, SERVER_QUEUE_TIMEOUT)
+    return QAServer((host, port), pipeline, admission, ServerMetrics(SERVER_LATENCY_WINDOW))
+
+
+def main():
+    """Start the service and serve until interrupted."""
+    args = parse_args()
+
+    # The stand-ins must be installed before the pipeline builds any client
+    if args.stub:
+        from src.models.stub import prepare_environment, install_fakes
+        prepare_environment(args.workdir or tempfile.mkdtemp(prefix="study_helper_"))
+        install_fakes(
+            llm_latency_ms=args.stub_latency_ms,
+            web_latency_ms=args.stub_latency_ms,
+            translation_latency_ms=args.stub_latency_ms,
+        )
+
+    # Configuration is read at import time, so only after the environment is prepared
+    from src.config import SERVER_HOST, SERVER_PORT, SERVER_MAX_CONCURRENCY, SERVER_MAX_QUEUE
+    from src.pipeline import VideoQAPipeline
+
+    host = args.host or SERVER_HOST
+    port = SERVER_PORT if args.port is None else args.port
+    max_concurrency = args.max_concurrency or SERVER_MAX_CONCURRENCY
+    max_queue = SERVER_MAX_QUEUE if args.max_queue is None else args.max_queue
+
+    pipeline = VideoQAPipeline()
+    if args.transcription_path:
+        pipeline.load_transcription(args.transcription_path, args.video_id, args.playlist)
+
+    server = create_server(pipeline, host, port, max_concurrency, max_queue)
+    threading.Thread(target=server.warm_up, name="warm-up", daemon=True).start()
+
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port} ({max_concurrency} concurrent, {max_queue} queued)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
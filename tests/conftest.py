@@ -0,0 +1,6 @@
+"""Shared fixtures of the test suite."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
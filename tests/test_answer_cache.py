@@ -0,0 +1,43 @@
+"""Exact and semantic tiers of the answer cache."""
+
+from src.models.cache import AnswerCache, TTLCache
+
+
+def test_exact_tier_ignores_case_spacing_and_punctuation():
+    cache = AnswerCache()
+    cache.put("video:a", "What is dropout?", "A regularizer.")
+
+    assert cache.get_exact("video:a", "  what IS   dropout ") == "A regularizer."
+    assert cache.get_exact("video:b", "What is dropout?") is None
+    assert cache.get_exact("video:a", "What is attention?") is None
+
+
+def test_semantic_tier_returns_the_most_similar_answer_above_the_threshold():
+    cache = AnswerCache(similarity_threshold=0.9)
+    cache.put("video:a", "What is dropout?", "Dropout answer", embedding=[1.0, 0.0, 0.0])
+    cache.put("video:a", "What is attention?", "Attention answer", embedding=[0.0, 1.0, 0.0])
+
+    assert cache.get_similar("video:a", [0.95, 0.1, 0.0]) == "Dropout answer"
+    assert cache.get_similar("video:a", [0.6, 0.6, 0.5]) is None
+    assert cache.get_similar("video:b", [1.0, 0.0, 0.0]) is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_answers_expire():
+    cache = AnswerCache(ttl=0.0)
+    cache.put("video:a", "What is dropout?", "A regularizer.", embedding=[1.0, 0.0])
+
+    assert cache.get_exact("video:a", "What is dropout?") is None
+    assert cache.get_similar("video:a", [1.0, 0.0]) is None
+
+
+def test_ttl_cache_evicts_the_least_recently_used_entry():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b", None) is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["size"] == 2
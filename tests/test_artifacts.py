@@ -0,0 +1,46 @@
+"""Eviction of the artifact store."""
+
+import os
+
+from src.models.artifacts import ArtifactStore
+
+
+def write(store, video_id, name, size):
+    path = store.path(video_id, name)
+    with open(path, "wb") as file:
+        file.write(b"x" * size)
+    return store.put(video_id, name)
+
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=250)
+    old = write(store, "video_a", "audio.mp4", 100)
+    used = write(store, "video_b", "audio.mp4", 100)
+    store.get("video_a", "audio.mp4")
+    write(store, "video_c", "audio.mp4", 100)
+
+    assert os.path.exists(old)
+    assert not os.path.exists(used)
+    assert store.get("video_b", "audio.mp4") is None
+    assert store.total_bytes() == 200
+
+
+def test_pinned_artifacts_are_never_evicted(tmp_path):
+    pinned = []
+    store = ArtifactStore(str(tmp_path), max_bytes=150, pinned=lambda: pinned)
+    transcript = write(store, "video_a", "transcript.txt", 100)
+    pinned.append(transcript)
+    write(store, "video_b", "audio.mp4", 100)
+
+    assert os.path.exists(transcript)
+    assert store.get("video_a", "transcript.txt") == transcript
+    assert store.total_bytes() == 200
+
+
+def test_unregistered_files_are_not_served(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    with open(store.path("video_a", "audio.mp4"), "wb") as file:
+        file.write(b"partial")
+
+    assert store.get("video_a", "audio.mp4") is None
+    assert ArtifactStore(str(tmp_path)).get("video_a", "audio.mp4") is None
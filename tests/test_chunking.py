@@ -0,0 +1,76 @@
+"""Streaming chunking against a split of the whole text."""
+
+import random
+
+import pytest
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from benchmarks.synthetic import generate_transcript
+from src.models.chunking import StreamingSplitter, iter_chunks
+
+CHUNK_SIZE = 500
+
+
+@pytest.fixture
+def splitter():
+    return RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=100, add_start_index=True)
+
+
+def chunks(documents):
+    return [(doc.page_content, doc.metadata["start_index"]) for doc in documents]
+
+
+@pytest.mark.parametrize("text", [
+    generate_transcript(8000),
+    "\n".join(generate_transcript(30).strip() for _ in range(200)),
+    "\n\n".join(generate_transcript(200) for _ in range(30)),
+], ids=["one line", "lines", "paragraphs"])
+@pytest.mark.parametrize("window_chars", [700, 3000, 1 << 20])
+def test_iter_chunks_matches_full_split(tmp_path, splitter, text, window_chars):
+    path = tmp_path / "transcript.txt"
+    path.write_text(text, encoding="utf-8")
+
+    streamed = chunks(iter_chunks(str(path), splitter, window_chars, CHUNK_SIZE))
+
+    assert streamed == chunks(splitter.create_documents([text]))
+
+
+def test_streaming_splitter_matches_full_split(splitter):
+    text = generate_transcript(8000)
+    chunker = StreamingSplitter("transcript.txt", splitter, CHUNK_SIZE)
+    rng = random.Random(0)
+    documents, position = [], 0
+    while position < len(text):
+        size = rng.randint(1, 2000)
+        documents.extend(chunker.feed(text[position:position + size]))
+        position += size
+    documents.extend(chunker.finish())
+
+    assert chunks(documents) == chunks(splitter.create_documents([text]))
+
+
+@pytest.mark.parametrize("window_chars", [600, 700, 1000])
+def test_mixed_separators_keep_overlap_across_windows(tmp_path, splitter, window_chars):
+    # Unique words, so every chunk's start_index is unambiguous
+    rng = random.Random(1)
+    words = iter(range(1 << 20))
+    text = "".join(
+        " ".join(f"w{next(words)}" for _ in range(rng.randint(3, 120))) + rng.choice(["\n\n", "\n", " ", "\n\n\n"])
+        for _ in range(300)
+    )
+    path = tmp_path / "transcript.txt"
+    path.write_text(text, encoding="utf-8")
+
+    streamed = chunks(iter_chunks(str(path), splitter, window_chars, CHUNK_SIZE))
+
+    covered = 0
+    for (content, start), (next_content, next_start) in zip(streamed, streamed[1:]):
+        assert text[start:start + len(content)] == content
+        assert len(content) <= CHUNK_SIZE
+        assert next_start > start
+        # Neighbours overlap by at most the splitter's overlap, and any gap between them is whitespace
+        assert start + len(content) - next_start <= 100
+        assert not text[start + len(content):next_start].strip()
+    last_content, last_start = streamed[-1]
+    assert text[last_start:].strip() == last_content.strip()
+    assert not text[:streamed[0][1]].strip()
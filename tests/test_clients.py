@@ -0,0 +1,109 @@
+"""Circuit breaker transitions of the service clients."""
+
+import asyncio
+
+import pytest
+
+from src.models import clients
+from src.models.clients import CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def circuit(monkeypatch):
+    circuit = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.0)
+    monkeypatch.setitem(clients._breakers, "groq", circuit)
+    return circuit
+
+
+def fail(error):
+    def func():
+        raise error
+    return func
+
+
+def open_circuit(circuit):
+    for _ in range(circuit.failure_threshold):
+        with pytest.raises(TimeoutError):
+            clients.call("groq", fail(TimeoutError()), retries=0)
+
+
+def test_transient_failures_open_the_circuit(circuit):
+    circuit.reset_timeout = 60.0
+    open_circuit(circuit)
+
+    assert circuit.state == "open"
+    with pytest.raises(CircuitOpenError):
+        clients.call("groq", lambda: "answer")
+
+
+def test_half_open_probe_closes_on_success(circuit):
+    open_circuit(circuit)
+    assert circuit.state == "half-open"
+
+    assert clients.call("groq", lambda: "answer") == "answer"
+    assert circuit.state == "closed"
+    assert circuit.failures == 0
+
+
+def test_half_open_probe_reopens_on_failure(circuit):
+    open_circuit(circuit)
+    opened_at = circuit.opened_at
+
+    with pytest.raises(TimeoutError):
+        clients.call("groq", fail(TimeoutError()), retries=0)
+
+    assert circuit.opened_at > opened_at
+    assert not circuit._probing
+
+
+def test_only_one_probe_at_a_time(circuit):
+    open_circuit(circuit)
+
+    assert circuit.allow()
+    assert not circuit.allow()
+
+
+def test_non_transient_errors_do_not_count(circuit):
+    for _ in range(circuit.failure_threshold + 1):
+        with pytest.raises(ValueError):
+            clients.call("groq", fail(ValueError("bad request")), retries=0)
+
+    assert circuit.state == "closed"
+    assert circuit.failures == 0
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_rate_limits_are_retried_but_do_not_count(circuit):
+    attempts = []
+
+    def limited_once():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RateLimitError()
+        return "answer"
+
+    assert clients.call("groq", limited_once, retries=1) == "answer"
+    for _ in range(circuit.failure_threshold + 1):
+        with pytest.raises(RateLimitError):
+            clients.call("groq", fail(RateLimitError()), retries=0)
+
+    assert len(attempts) == 2
+    assert circuit.state == "closed"
+    assert circuit.failures == 0
+
+
+def test_cancelled_probe_releases_the_circuit(circuit):
+    open_circuit(circuit)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(clients.acall("groq", cancelled, retries=0))
+
+    assert not circuit._probing
+    assert circuit.state == "half-open"
+    assert clients.call("groq", lambda: "answer") == "answer"
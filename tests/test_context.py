@@ -0,0 +1,51 @@
+"""Token-budgeted assembly of the answer context."""
+
+from langchain.schema.document import Document
+
+from src.models.context import Passage, build_context, dedupe, estimate_tokens, pack, rerank
+
+
+def chunk(text, start, source="transcript.txt"):
+    return Document(page_content=text, metadata={"source": source, "start_index": start})
+
+
+def test_dedupe_drops_repeats_and_trims_overlaps():
+    passages = [
+        Passage("beta gamma delta", "document", 0, "transcript.txt", 6),
+        Passage("alpha beta gamma", "document", 1, "transcript.txt", 0),
+        Passage("Alpha  beta gamma", "web", 0),
+    ]
+
+    assert [passage.text for passage in dedupe(passages)] == [" delta", "alpha beta gamma"]
+
+
+def test_rerank_moves_exact_term_matches_up():
+    passages = [
+        Passage("a long passage about training loops and schedules", "document", 0),
+        Passage("dropout zeroes activations at random", "document", 1),
+    ]
+
+    assert [passage.rank for passage in rerank("what does dropout do", passages)] == [1, 0]
+
+
+def test_pack_stays_within_the_budget():
+    passages = [Passage("word " * 100, "document", rank) for rank in range(5)]
+
+    selected = pack(passages, budget=300)
+
+    assert sum(estimate_tokens(passage.text) for passage in selected) <= 300
+    assert len(selected) == 3
+    assert estimate_tokens(selected[-1].text) < 125
+
+
+def test_context_lists_transcript_passages_in_transcript_order_then_web():
+    context = build_context(
+        "dropout",
+        [chunk("Later, dropout is applied.", 100), chunk("First the model is defined.", 0)],
+        [Document(page_content="Dropout on the web.", metadata={})],
+    )
+
+    assert context == (
+        "Information from document: First the model is defined.\nLater, dropout is applied.\n\n"
+        "Information from web: Dropout on the web."
+    )
@@ -0,0 +1,84 @@
+"""Overview detection, summary selection and construction of video digests."""
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.models import clients, digest
+from src.models.digest import Digest, build_digest, is_summary_question
+from src.models.fakes import FakeEmbeddings
+
+
+@pytest.mark.parametrize("question", [
+    "What are the key points?",
+    "key points of this video",
+    "summarize the video",
+    "Summary of the video",
+    "what is this video about",
+    "tl;dr",
+    "main takeaways",
+    "Can you summarize in three sentences?",
+])
+def test_overview_questions_are_detected(question):
+    assert is_summary_question(question)
+
+
+@pytest.mark.parametrize("question", [
+    "key points about dropout",
+    "summary of backprop",
+    "summarize dropout",
+    "outline the steps of backprop",
+    "main topics in dropout",
+    "How does the summarization model work",
+])
+def test_questions_about_a_topic_are_not_overviews(question):
+    assert not is_summary_question(question)
+
+
+@pytest.mark.parametrize("count, expected", [
+    (7, ["root", "1", "2", "3", "4", "5", "6"]),
+    (6, ["root", "a", "b", "c"]),
+    (3, ["root"]),
+    (0, []),
+])
+def test_summary_documents_never_exceed_the_count(count, expected):
+    tree = Digest("video", "hash", [["1", "2", "3", "4", "5", "6"], ["a", "b", "c"], ["root"]], [])
+
+    assert [doc.page_content for doc in tree.summary_documents(count)] == expected
+
+
+def test_build_digest_retries_only_the_failed_summaries(monkeypatch):
+    calls = []
+
+    def llm(prompt):
+        text = prompt.to_string()
+        if "FAQ:" in text:
+            return "Q: What is the video about?\nA: Chunks."
+        group = text.split("Text: ")[1].split("Summary:")[0].split()
+        calls.append(group)
+        if group == ["chunk", "2"] and calls.count(group) == 1:
+            raise TimeoutError("groq timed out")
+        return f"summary {len(calls)}"
+
+    monkeypatch.setattr(digest, "get_llm", lambda: RunnableLambda(llm))
+    monkeypatch.setattr(clients, "SERVICE_BACKOFF_BASE", 0.0)
+
+    result = build_digest("video", "hash", ["chunk 0", "chunk 1", "chunk 2"], FakeEmbeddings(dimension=8), fanout=2)
+
+    assert len(result.levels[0]) == 2 and len(result.levels[-1]) == 1
+    assert calls.count(["chunk", "0", "chunk", "1"]) == 1
+    assert calls.count(["chunk", "2"]) == 2
+    assert [entry["question"] for entry in result.faq] == ["What is the video about?"]
+
+
+def test_build_digest_fails_fast_on_a_permanent_error(monkeypatch):
+    calls = []
+
+    def llm(prompt):
+        calls.append(prompt)
+        raise ValueError("bad request")
+
+    monkeypatch.setattr(digest, "get_llm", lambda: RunnableLambda(llm))
+
+    with pytest.raises(ValueError):
+        build_digest("video", "hash", ["chunk 0", "chunk 1"], FakeEmbeddings(dimension=8), fanout=1)
+    assert len(calls) == 2
@@ -0,0 +1,83 @@
+"""Hits, eviction and persistence of the embedding cache."""
+
+import os
+
+import pytest
+from langchain.schema.embeddings import Embeddings
+
+from src.models.embedding_cache import INDEX_FILE, CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def open_cache(path, model_name="model-a", max_entries=3):
+    return EmbeddingCache(str(path), model_name=model_name, dimension=2, max_entries=max_entries, dtype="float32")
+
+
+def test_cached_texts_are_not_embedded_again(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, open_cache(tmp_path))
+
+    first = embeddings.embed_documents(["a", "bb", "a"])
+    second = embeddings.embed_documents(["bb", "a"])
+
+    assert model.embedded == ["a", "bb"]
+    assert second == [first[1], first[0]]
+    assert embeddings.cache.hits == 2
+
+
+def test_least_recently_used_entry_is_evicted_at_the_size_bound(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a", "b", "c"], [[1, 0], [2, 0], [3, 0]])
+    cache.get_many(["a"])
+    cache.put_many(["d"], [[4, 0]])
+
+    assert len(cache) == 3
+    assert cache.get_many(["a", "b", "c", "d"]) == [[1, 0], None, [3, 0], [4, 0]]
+
+
+def test_entries_survive_reopening(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a", "b"], [[1, 0], [2, 0]])
+    cache.flush()
+
+    reopened = open_cache(tmp_path)
+    assert reopened.get_many(["a", "b", "c"]) == [[1, 0], [2, 0], None]
+
+
+def test_lookups_do_not_rewrite_the_index(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a", "b"], [[1, 0], [2, 0]])
+    cache.flush()
+    mtime = os.stat(tmp_path / INDEX_FILE).st_mtime_ns
+
+    cache.get_many(["a"])
+    cache.flush()
+    assert os.stat(tmp_path / INDEX_FILE).st_mtime_ns == mtime
+
+    cache.flush(recency=True)
+    reopened = open_cache(tmp_path)
+    reopened.put_many(["c", "d"], [[3, 0], [4, 0]])
+    assert reopened.get_many(["a", "b"]) == [[1, 0], None]
+
+
+def test_changing_the_model_misses_the_old_entries(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put_many(["a"], [[1, 0]])
+    cache.flush()
+
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, open_cache(tmp_path, model_name="model-b"))
+
+    assert embeddings.embed_documents(["a"]) == [pytest.approx([1.0, 1.0])]
+    assert model.embedded == ["a"]
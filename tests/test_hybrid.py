@@ -0,0 +1,66 @@
+"""BM25 and its reciprocal-rank fusion with dense retrieval."""
+
+import pytest
+from langchain.schema.document import Document
+from langchain.schema.embeddings import Embeddings
+
+from src.models.bm25 import BM25Index, PartitionedBM25Index
+from src.models.hybrid import HybridVectorStore, reciprocal_rank_fusion
+from src.models.local_index import PartitionedLocalIndex
+
+VOCABULARY = ["dropout", "attention", "gradient"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """One dimension per vocabulary word plus a constant one."""
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(word in text.split()) for word in VOCABULARY] + [1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(word in text.split()) for word in VOCABULARY] + [1.0]
+
+
+def docs(*names):
+    return [Document(page_content=name, metadata={"chunk_id": name}) for name in names]
+
+
+def test_rrf_ranks_documents_found_by_both_retrievers_first():
+    fused = reciprocal_rank_fusion([docs("a", "b", "c"), docs("c", "d")], k=4, rrf_k=60)
+
+    assert [doc.page_content for doc in fused] == ["c", "a", "b", "d"]
+
+
+def test_bm25_skips_terms_found_in_most_chunks():
+    index = BM25Index(max_df=0.5)
+    index.add(
+        ["a", "b", "c"],
+        ["the dropout layer", "the attention layer", "the gradient step"],
+        [{}, {}, {}],
+    )
+
+    assert [doc.page_content for doc, _ in index.search("the dropout", k=3)] == ["the dropout layer"]
+    assert len(index.search("the", k=3)) == 3
+
+
+def test_bm25_only_hit_outranks_a_lower_dense_hit_and_keeps_its_stored_similarity():
+    embeddings = KeywordEmbeddings()
+    store = HybridVectorStore(
+        PartitionedLocalIndex(embeddings, dimension=4), PartitionedBM25Index(), dense_k=2, lexical_k=1
+    )
+    store.add_texts(
+        ["dropout zeroes activations", "dropout masks attention units", "gradient clipping bounds updates"],
+        [{"video_id": "video_a"}] * 3,
+    )
+    embedded = len(embeddings.embedded)
+
+    results = store.similarity_search_with_score("dropout clipping", k=2, video_ids=["video_a"])
+
+    # Dense ranks "dropout zeroes" then "dropout masks"; BM25 only finds the rare "clipping"
+    assert [doc.page_content for doc, _ in results] == ["dropout zeroes activations", "gradient clipping bounds updates"]
+    assert [score for _, score in results] == [pytest.approx(1.0), pytest.approx(0.5)]
+    assert len(embeddings.embedded) == embedded
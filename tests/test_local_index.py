@@ -0,0 +1,54 @@
+"""Round trips through the local vector index."""
+
+import numpy as np
+import pytest
+
+from src.models.local_index import LocalVectorIndex, PartitionedLocalIndex
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return list(vector / np.linalg.norm(vector))
+
+
+@pytest.mark.parametrize("quantization", ["none", "int8", "binary"])
+def test_add_delete_search_round_trip(tmp_path, quantization):
+    index = LocalVectorIndex(None, str(tmp_path), dimension=3, quantization=quantization)
+    ids = index.add_embeddings(["x", "y", "z"], [unit(1, 0, 0), unit(0, 1, 0), unit(0, 0, 1)])
+
+    doc, score = index.similarity_search_by_vector_with_score(unit(1, 0.1, 0), k=1)[0]
+    assert doc.page_content == "x"
+    assert score == pytest.approx(float(np.dot(unit(1, 0, 0), unit(1, 0.1, 0))), abs=1e-5)
+
+    index.delete([ids[0]])
+    assert len(index) == 2
+    assert [doc.page_content for doc in index.similarity_search_by_vector(unit(1, 0.1, 0), k=3)] == ["y", "z"]
+
+    reopened = LocalVectorIndex(None, str(tmp_path), dimension=3, quantization=quantization)
+    assert len(reopened) == 2
+    assert reopened.similarity_search_by_vector(unit(0, 0, 1), k=1)[0].page_content == "z"
+
+
+def test_default_ids_stay_unique_after_delete():
+    index = LocalVectorIndex(None, dimension=2)
+    first = index.add_embeddings(["a", "b"], [unit(1, 0), unit(0, 1)])
+    index.delete([first[0]])
+    second = index.add_embeddings(["c"], [unit(1, 1)])
+
+    assert not set(first) & set(second)
+    assert len(index) == 2
+
+
+def test_partitions_follow_adds_and_deletes(tmp_path):
+    index = PartitionedLocalIndex(None, str(tmp_path), dimension=2)
+    ids = index.add_embeddings(["a"], [unit(1, 0)], video_id="video_a")
+    index.add_embeddings(["b"], [unit(0, 1)], video_id="video_b")
+    assert index.partition_ids() == ["video_a", "video_b"]
+    assert PartitionedLocalIndex(None, str(tmp_path), dimension=2).partition_ids() == ["video_a", "video_b"]
+
+    scoped = index.similarity_search_by_vector(unit(1, 0), k=2, video_ids=["video_b"])
+    assert [doc.page_content for doc in scoped] == ["b"]
+
+    index.delete(ids)
+    assert index.partition_ids() == ["video_b"]
+    assert [doc.page_content for doc in index.similarity_search_by_vector(unit(1, 0), k=2)] == ["b"]
@@ -0,0 +1,50 @@
+"""Plans of the chunk manifest when a transcription changes."""
+
+from langchain.schema.document import Document
+
+from src.models.manifest import ChunkManifest, assign_chunk_ids
+
+
+def documents(source, texts):
+    offsets, docs = 0, []
+    for text in texts:
+        docs.append(Document(page_content=text, metadata={"source": source, "start_index": offsets}))
+        offsets += len(text)
+    return assign_chunk_ids(docs)
+
+
+def test_unchanged_source_plans_nothing(tmp_path):
+    manifest = ChunkManifest(str(tmp_path / "manifest.json"))
+    docs = documents("t.txt", ["alpha", "beta", "gamma"])
+    manifest.record("t.txt", docs)
+
+    summary = manifest.plan("t.txt", documents("t.txt", ["alpha", "beta", "gamma"]))
+
+    assert (summary.added, summary.updated, summary.unchanged, summary.removed) == (0, 0, 3, 0)
+    assert summary.upserted_ids == [] and summary.deleted_ids == []
+
+
+def test_edit_is_an_update(tmp_path):
+    manifest = ChunkManifest(str(tmp_path / "manifest.json"))
+    old = documents("t.txt", ["alpha", "beta", "gamma"])
+    manifest.record("t.txt", old)
+
+    new = documents("t.txt", ["alpha", "BETA", "gamma"])
+    summary = manifest.plan("t.txt", new)
+
+    assert (summary.added, summary.updated, summary.unchanged, summary.removed) == (0, 1, 2, 0)
+    assert summary.upserted_ids == [new[1].metadata["chunk_id"]]
+    assert summary.deleted_ids == [old[1].metadata["chunk_id"]]
+
+
+def test_removed_chunks_are_deleted(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    manifest = ChunkManifest(path)
+    old = documents("t.txt", ["alpha", "beta", "gamma"])
+    manifest.record("t.txt", old)
+    manifest.save()
+
+    summary = ChunkManifest(path).plan("t.txt", documents("t.txt", ["alpha", "beta"]))
+
+    assert (summary.added, summary.updated, summary.unchanged, summary.removed) == (0, 0, 2, 1)
+    assert summary.deleted_ids == [old[2].metadata["chunk_id"]]
@@ -0,0 +1,68 @@
+"""Recall of quantized search after the exact re-score."""
+
+import numpy as np
+import pytest
+
+from src.models import local_index
+from src.models.local_index import LocalVectorIndex
+
+DIMENSION = 64
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, DIMENSION))
+    vectors = centers[rng.integers(0, 20, 2000)] + rng.normal(scale=0.8, size=(2000, DIMENSION))
+    queries = vectors[rng.choice(2000, 30, replace=False)] + rng.normal(scale=0.5, size=(30, DIMENSION))
+    return vectors.tolist(), queries.tolist()
+
+
+def build(vectors, quantization):
+    index = LocalVectorIndex(None, dimension=DIMENSION, quantization=quantization)
+    ids = [str(i) for i in range(len(vectors))]
+    index.add_embeddings(ids, vectors, ids=ids)
+    return index
+
+
+def recall(index, exact, queries, k=10):
+    found = [
+        len({row for row, _ in index.search_vector(query, k)} & {row for row, _ in exact.search_vector(query, k)})
+        for query in queries
+    ]
+    return sum(found) / (k * len(queries))
+
+
+def test_int8_keeps_the_exact_top_k(corpus):
+    vectors, queries = corpus
+    exact, int8 = build(vectors, "none"), build(vectors, "int8")
+
+    assert recall(int8, exact, queries) >= 0.98
+    # Scores come from the full-precision re-score, not the codes
+    (row, score), = int8.search_vector(queries[0], 1)
+    (exact_row, exact_score), = exact.search_vector(queries[0], 1)
+    assert row == exact_row and score == pytest.approx(exact_score, abs=1e-6)
+
+
+def test_binary_recall_grows_with_the_rescore_factor(corpus, monkeypatch):
+    vectors, queries = corpus
+    exact, binary = build(vectors, "none"), build(vectors, "binary")
+
+    monkeypatch.setattr(local_index, "LOCAL_INDEX_RESCORE_FACTOR", 1)
+    narrow = recall(binary, exact, queries)
+    monkeypatch.setattr(local_index, "LOCAL_INDEX_RESCORE_FACTOR", 16)
+    wide = recall(binary, exact, queries)
+
+    assert narrow < wide
+    assert wide >= 0.95
+
+
+def test_codes_are_rebuilt_when_the_mode_changes(tmp_path, corpus):
+    vectors, queries = corpus
+    LocalVectorIndex(None, str(tmp_path), dimension=DIMENSION).add_embeddings(
+        [str(i) for i in range(len(vectors))], vectors, ids=[str(i) for i in range(len(vectors))]
+    )
+
+    reopened = LocalVectorIndex(None, str(tmp_path), dimension=DIMENSION, quantization="int8")
+
+    assert recall(reopened, build(vectors, "none"), queries) >= 0.98
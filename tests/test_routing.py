@@ -0,0 +1,56 @@
+"""Parallel and adaptive routing of the web search."""
+
+import pytest
+
+from src.config import ROUTING_MIN_CONFIDENT_DOCS, ROUTING_SIMILARITY_THRESHOLD
+from src.models.workflow import _build_workflow
+
+STRONG = ROUTING_SIMILARITY_THRESHOLD
+WEAK = ROUTING_SIMILARITY_THRESHOLD - 0.1
+
+
+def graph(routing, scores, visited):
+    def node(name, update):
+        def run(state):
+            visited.append(name)
+            return update
+        return run
+
+    return _build_workflow({
+        "language_detection": node("language_detection", {"query_language": "english"}),
+        "translation": node("translation", {}),
+        "query_enhancement": node("query_enhancement", {"new_query": "dropout"}),
+        "rag_retrieval": node("rag_retrieval", {"rag_scores": scores}),
+        "web_retrieval": node("web_retrieval", {"web_research": "web"}),
+        "context_builder": node("context_builder", {"context": "context"}),
+        "answer_generation": node("answer_generation", {"final_answer": "answer"}),
+    }, routing)
+
+
+@pytest.mark.parametrize("scores, searches_web", [
+    ([STRONG] * ROUTING_MIN_CONFIDENT_DOCS + [WEAK], False),
+    ([STRONG] * (ROUTING_MIN_CONFIDENT_DOCS - 1) + [WEAK] * 3, True),
+    ([], True),
+], ids=["strong", "weak", "empty"])
+def test_adaptive_routing_searches_the_web_only_for_weak_matches(scores, searches_web):
+    visited = []
+
+    result = graph("adaptive", scores, visited).invoke({"initial_query": "What is dropout?"})
+
+    assert result["final_answer"] == "answer"
+    assert ("web_retrieval" in visited) == searches_web
+    assert visited.index("rag_retrieval") < visited.index("context_builder")
+
+
+def test_parallel_routing_always_searches_the_web():
+    visited = []
+
+    graph("parallel", [0.9, 0.9, 0.9], visited).invoke({"initial_query": "What is dropout?"})
+
+    assert {"rag_retrieval", "web_retrieval"} <= set(visited)
+    assert visited.index("context_builder") > max(visited.index("rag_retrieval"), visited.index("web_retrieval"))
+
+
+def test_unknown_routing_mode_is_rejected():
+    with pytest.raises(ValueError):
+        graph("sometimes", [], [])
@@ -0,0 +1,59 @@
+"""Admission control and health reporting of the HTTP service."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.server import AdmissionController, create_server
+
+
+def test_questions_beyond_the_queue_are_rejected():
+    admission = AdmissionController(max_concurrency=1, max_queue=1, timeout=5.0)
+    assert admission.acquire()
+
+    queued = threading.Thread(target=lambda: admission.acquire() and admission.release())
+    queued.start()
+    while admission.stats()["waiting"] < 1:
+        time.sleep(0.001)
+
+    assert not admission.acquire()
+    admission.release()
+    queued.join()
+    assert admission.stats() == {"active": 0, "waiting": 0, "rejected": 1, "max_concurrency": 1, "max_queue": 1}
+
+
+def test_queued_questions_give_up_after_the_timeout():
+    admission = AdmissionController(max_concurrency=1, max_queue=1, timeout=0.01)
+    assert admission.acquire()
+
+    assert not admission.acquire()
+    assert admission.stats()["rejected"] == 1
+
+
+class BrokenPipeline:
+    def warm_up(self, background=False):
+        raise RuntimeError("model download failed")
+
+
+@pytest.fixture
+def server():
+    server = create_server(BrokenPipeline(), "127.0.0.1", 0, max_concurrency=1, max_queue=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_health_reports_a_failed_warm_up(server):
+    assert not server.warm_up()
+
+    host, port = server.server_address[:2]
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(f"http://{host}:{port}/health", timeout=5)
+
+    assert error.value.code == 503
+    assert json.loads(error.value.read()) == {"status": "failed", "error": "model download failed"}
@@ -0,0 +1,54 @@
+"""Per-stage memoization and its SQLite backing store."""
+
+import pytest
+
+from src.models import cache as stage_caches
+from src.models.cache import MISSING, SQLiteStore, StageCache, memoized
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    monkeypatch.setattr(stage_caches, "STAGE_CACHE_ENABLED", True)
+    monkeypatch.setattr(stage_caches, "STAGE_CACHE_DB", None)
+    monkeypatch.setattr(stage_caches, "_stage_caches", {})
+    return stage_caches
+
+
+def test_memoized_computes_once(stages):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["passage"]
+
+    assert memoized("web_results", "q", compute) == ["passage"]
+    assert memoized("web_results", "q", compute) == ["passage"]
+    assert len(calls) == 1
+    assert stages.stage_cache_stats()["web_results"]["hits"] == 1
+
+
+def test_failures_are_not_cached(stages):
+    def fail():
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        memoized("web_results", "q", fail)
+
+    assert memoized("web_results", "q", lambda: ["passage"]) == ["passage"]
+
+
+def test_store_shares_entries_across_caches(tmp_path):
+    store = SQLiteStore(str(tmp_path / "stages.db"))
+    StageCache("translation", 10, ttl=60.0, store=store).put("hola", "hello")
+
+    fresh = StageCache("translation", 10, ttl=60.0, store=SQLiteStore(str(tmp_path / "stages.db")))
+    assert fresh.get("hola") == "hello"
+    assert fresh.stats()["hits"] == 1 and fresh.stats()["misses"] == 0
+    assert StageCache("query_enhancement", 10, ttl=60.0, store=store).get("hola") is MISSING
+
+
+def test_expired_store_entries_are_misses(tmp_path):
+    store = SQLiteStore(str(tmp_path / "stages.db"))
+    store.put("translation", '"hola"', "hello", ttl=0.0)
+
+    assert store.get("translation", '"hola"') is MISSING
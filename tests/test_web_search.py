@@ -0,0 +1,83 @@
+"""Tavily searches through the pooled HTTP clients."""
+
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+from src.models import clients
+from src.models.web_search import TAVILY_SEARCH_URL, TavilySearch
+
+
+class Response:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class Session:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def post(self, url, json, timeout):
+        self.requests.append((url, json, timeout))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session():
+    session = Session()
+    clients.set_http_session(session)
+    yield session
+    clients.set_http_session(clients.create_http_session())
+
+
+def test_search_posts_through_the_pooled_session(session):
+    session.responses.append(Response(200, {"results": [{"content": "Dropout", "url": "https://a", "title": "A"}]}))
+
+    docs = TavilySearch(api_key="key", k=1).invoke("what is dropout")
+
+    assert [(doc.page_content, doc.metadata["source"]) for doc in docs] == [("Dropout", "https://a")]
+    url, body, timeout = session.requests[0]
+    assert url == TAVILY_SEARCH_URL
+    assert body["query"] == "what is dropout" and body["max_results"] == 1
+    assert timeout == clients.timeout("tavily")
+
+
+def test_server_errors_are_retried(session, monkeypatch):
+    monkeypatch.setattr(clients, "SERVICE_BACKOFF_BASE", 0.0)
+    session.responses.extend([Response(503), Response(200, {"results": []})])
+
+    assert clients.call("tavily", lambda: TavilySearch(api_key="key").invoke("q"), retries=1) == []
+    assert len(session.requests) == 2
+
+
+def test_async_search_is_cancelled_by_a_timeout(monkeypatch):
+    requests_sent = []
+
+    async def handle(request):
+        requests_sent.append(request)
+        if len(requests_sent) > 1:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"results": [{"content": "Dropout", "url": "https://a"}]})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+        monkeypatch.setattr(clients, "get_http_client", lambda: client)
+        docs = await TavilySearch(api_key="key").ainvoke("q")
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(TavilySearch(api_key="key").ainvoke("q"), 0.05)
+        await client.aclose()
+        return docs
+
+    assert [doc.page_content for doc in asyncio.run(run())] == ["Dropout"]
+    assert str(requests_sent[0].url) == TAVILY_SEARCH_URL